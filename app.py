@@ -9,7 +9,29 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import random
+import functools
+import html
 import json
+import os
+import time
+
+from pricing import price_parlay, format_american
+from optimizer import GRADE_ORDER, make_leg, optimize
+from ledger import Ledger
+from bankroll import grade_mix, simulate
+from rollups import chart_period, daily_pl, downsample, rollup
+from profiles import ProfileStore
+from demo_data import DEMO_PROPS, DEMO_BET_LOG, DEMO_RESPONSES, DEMO_PARAPHRASES
+from feeds import SlateStore, start_feed, game_id
+from linemoves import LineStore, move_label
+from grading import regrade_props
+from intents import answer as demo_answer, build_index
+from propsearch import PropIndex
+from metrics import observe, start_http_server, timed
+from profiler import RerunProfiler, append_log, dumps as dump_profiles, parse_mode
+from chat import CallTimer, ResponseCache, build_context, context_tokens, make_client, new_summary, stream_chat
+
+_RERUN_T0 = time.perf_counter()
 
 # --- Page Config ---
 st.set_page_config(
@@ -19,6 +41,41 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# --- Rerun Profiler (opt-in: ?profile=1 | ?profile=cprofile | EDGE_PROFILE) ---
+def _profile_mode():
+    mode = parse_mode(st.query_params.get("profile"))
+    if mode is None:
+        try:
+            mode = parse_mode(st.secrets.get("EDGE_PROFILE", ""))
+        except Exception:
+            pass
+    return mode or parse_mode(os.getenv("EDGE_PROFILE"))
+
+
+# One profiler per run, kept in session state and looked up on use: a fragment rerunning on its
+# own still holds the previous full run's globals, so it must not write into that run's profiler.
+# A run cut short by st.rerun() or an exception never reaches finish(); close what it left behind
+# first, so its cProfile doesn't keep sampling (and, on 3.12+, hold the process's one slot).
+if "_rerun_profiler" in st.session_state:
+    st.session_state["_rerun_profiler"].close()
+st.session_state["_rerun_profiler"] = RerunProfiler(_profile_mode())
+
+
+def _prof():
+    """The profiler for what is running now: this full rerun, or a fragment rerunning alone."""
+    return st.session_state["_rerun_profiler"]
+
+
+def _record_profile(report):
+    """Keep the last 50 reports per session (and append to EDGE_PROFILE_LOG if set)."""
+    runs = st.session_state.setdefault("profile_runs", [])
+    runs.append(report)
+    del runs[:-50]
+    if os.getenv("EDGE_PROFILE_LOG"):
+        append_log(os.environ["EDGE_PROFILE_LOG"], report)
+    return runs
+
+
 # --- Profile Definitions ---
 PROFILE_CONFIG = {
     "Peter": {"label": "Peter's Edge Finder", "color": "#D4A017"},
@@ -28,24 +85,61 @@ PROFILE_CONFIG = {
 
 def _default_profile_data():
     return {
-        "bankroll": {"balance": 0.00, "starting": 0.00, "daily_risk": 0.00, "pending": 0.00},
-        "bet_log": [],
+        "bankroll": {"balance": 0.00, "starting": 0.00, "pending": 0.00},
         "parlay_legs": [],
         "chat_messages": [],
+        "chat_summary": new_summary(),
     }
 
 # --- Session State Init ---
 if "active_profile" not in st.session_state:
     st.session_state.active_profile = "Peter"
-if "profiles" not in st.session_state:
-    st.session_state.profiles = {name: _default_profile_data() for name in PROFILE_CONFIG}
 if "selected_game" not in st.session_state:
     st.session_state.selected_game = None
 
 # --- Active Profile Helpers ---
+@st.cache_resource
+def _profiles():
+    """Process-wide profile store: loaded on first access, written behind the rerun."""
+    return ProfileStore(_default_profile_data)
+
+
 def _p():
     """Return current profile data dict."""
-    return st.session_state.profiles[st.session_state.active_profile]
+    return _profiles().get(st.session_state.active_profile)
+
+
+def _save():
+    """Queue the current profile for the next write-behind batch. Call after mutating _p()."""
+    _profiles().touch(st.session_state.active_profile)
+
+
+@st.cache_resource
+def _ledger():
+    """Process-wide bet ledger. Bet history lives here, not in session_state."""
+    return Ledger()
+
+
+@st.cache_resource
+def _demo_ledger():
+    """The sample bet log in its own in-memory ledger, so the audit pages it exactly like real history."""
+    ledger = Ledger(":memory:")
+    ledger.append_many(DEMO_PROFILE, DEMO_BET_LOG)
+    return ledger
+
+
+DEMO_PROFILE = "Demo"
+
+
+def _daily_risk():
+    """Today's exposure for the active profile, from the ledger's per-day totals (resets at midnight on its own)."""
+    return _ledger().risk_on(st.session_state.active_profile, datetime.now().strftime("%Y-%m-%d"))
+
+
+LOG_PREVIEW_ROWS = 200
+AUDIT_PAGE_ROWS = 50      # bet-log rows per page
+REVIEW_PAGE_CARDS = 10    # "Was the edge real?" cards per page
+AUDIT_SORTS = {"Date": "date", "Grade": "grade", "Result": "result", "Risk": "risk"}
 
 
 # --- API Check ---
@@ -58,108 +152,31 @@ def _check_api():
         return False
 
 
-# --- Demo Data ---
-DEMO_NBA_GAMES = [
-    {"away": "Lakers", "home": "Celtics", "spread": "BOS -6.5", "total": "224", "ml_away": "+220", "ml_home": "-270",
-     "time": "7:30 PM ET", "edge": "D", "edge_reason": "No situational advantage. Two rested teams, line is fair.",
-     "why_wrong": "None identified. Both teams healthy, no schedule edge.", "why_right": "Line reflects talent gap accurately. Public money balanced.",
-     "gut_data": "neutral"},
-    {"away": "Heat", "home": "Bucks", "spread": "MIL -4", "total": "218", "ml_away": "+155", "ml_home": "-185",
-     "time": "8:00 PM ET", "edge": "B", "edge_reason": "Heat on B2B, 3rd game in 5 nights. Bucks fully rested at home.",
-     "why_wrong": "Fatigue not fully priced into -4. Heat shooting 38% on B2Bs this season. Bucks rest advantage undervalued.",
-     "why_right": "Heat have covered 3 of last 5 as road dog. Butler historically performs on short rest.",
-     "gut_data": "supports"},
-    {"away": "Mavericks", "home": "Warriors", "spread": "GSW -3", "total": "228.5", "ml_away": "+135", "ml_home": "-155",
-     "time": "10:00 PM ET", "edge": "B+", "edge_reason": "Line opened GSW -5, moved to -3. Sharp money on Dallas.",
-     "why_wrong": "Reverse line movement signals sharp action on Mavs. Luka averaging 34.2 in last 5 vs Warriors.",
-     "why_right": "Warriors 12-3 at home this month. Curry shooting 48% from 3 at Chase Center.",
-     "gut_data": "supports"},
-    {"away": "Nuggets", "home": "Suns", "spread": "DEN -2.5", "total": "231", "ml_away": "-140", "ml_home": "+120",
-     "time": "9:00 PM ET", "edge": "C", "edge_reason": "Jokic vs Booker always delivers, but line is efficient.",
-     "why_wrong": "Suns missing Beal (hamstring). Not yet reflected in total.", "why_right": "Nuggets on road B2B after playing in LA.",
-     "gut_data": "neutral"},
-    {"away": "Pacers", "home": "Knicks", "spread": "NYK -5.5", "total": "225.5", "ml_away": "+190", "ml_home": "-230",
-     "time": "7:00 PM ET", "edge": "A", "edge_reason": "Pacers missing Haliburton + Turner. Knicks revenge game after playoff loss.",
-     "why_wrong": "Two key Pacers out, line only -5.5. Market slow to adjust. Knicks 8-1 ATS at home vs injured opponents.",
-     "why_right": "Pacers have covered without Haliburton before (3-1 ATS). Siakam usage spikes.",
-     "gut_data": "strong"},
-]
-
-DEMO_NHL_GAMES = [
-    {"away": "Rangers", "home": "Bruins", "spread": "BOS -1.5", "total": "5.5", "ml_away": "+140", "ml_home": "-165",
-     "time": "7:00 PM ET", "edge": "B", "edge_reason": "Bruins backup goalie confirmed. Not yet reflected in line.",
-     "why_wrong": "Backup goalie Korpisalo starts. His .891 save % not priced into -165 ML.",
-     "why_right": "Bruins defense limits shots regardless of goalie. Rangers on B2B.",
-     "gut_data": "supports"},
-    {"away": "Avalanche", "home": "Stars", "spread": "DAL -1.5", "total": "6", "ml_away": "+125", "ml_home": "-150",
-     "time": "8:30 PM ET", "edge": "C", "edge_reason": "MacKinnon GTD. Line hasn't moved yet.",
-     "why_wrong": "If MacKinnon sits, Avs lose their engine. Line is stale.", "why_right": "Avs depth has covered before. Stars cold at home lately.",
-     "gut_data": "neutral"},
-    {"away": "Panthers", "home": "Lightning", "spread": "TBL -1.5", "total": "6.5", "ml_away": "+110", "ml_home": "-130",
-     "time": "7:30 PM ET", "edge": "B+", "edge_reason": "Panthers on 3-game win streak, Lightning missing Kucherov.",
-     "why_wrong": "Kucherov out 2-3 weeks. Lightning ML still only -130. Public hasn't adjusted.",
-     "why_right": "Lightning have Vasilevskiy. Home ice. Rivalry game.",
-     "gut_data": "supports"},
-]
-
-DEMO_NFL_GAMES = [
-    {"away": "Chiefs", "home": "Ravens", "spread": "BAL -2.5", "total": "47.5", "ml_away": "+120", "ml_home": "-140",
-     "time": "4:25 PM ET", "edge": "C", "edge_reason": "Offseason. Use for reference only.",
-     "why_wrong": "N/A (offseason)", "why_right": "N/A", "gut_data": "neutral"},
-]
-
-DEMO_CFB_GAMES = [
-    {"away": "Ohio State", "home": "Michigan", "spread": "MICH -3", "total": "44.5", "ml_away": "+130", "ml_home": "-155",
-     "time": "12:00 PM ET", "edge": "C", "edge_reason": "Offseason. Use for reference only.",
-     "why_wrong": "N/A (offseason)", "why_right": "N/A", "gut_data": "neutral"},
-]
-
-DEMO_PROPS = [
-    {"player": "Nikola Jokic", "sport": "NBA", "team": "Nuggets", "prop": "Rebounds", "line": "O/U 11.5",
-     "edge": "A", "reason": "Playing Spurs (worst rebounding team). Averages 14.2 vs bottom-10 teams. 2.7 rebounds of cushion.",
-     "recommendation": "OVER 11.5 -- This is the play.", "matchup": "vs Suns (29th in opp. rebounds allowed)"},
-    {"player": "Luka Doncic", "sport": "NBA", "team": "Mavericks", "prop": "Points", "line": "O/U 30.5",
-     "edge": "B+", "reason": "Averaging 34.2 vs Warriors in last 5. Curry draws attention, Luka exploits mismatches.",
-     "recommendation": "OVER 30.5 -- Matchup driven.", "matchup": "vs Warriors (25th in perimeter D)"},
-    {"player": "Jalen Brunson", "sport": "NBA", "team": "Knicks", "prop": "Assists", "line": "O/U 6.5",
-     "edge": "B", "reason": "Pacers missing Haliburton. Knicks will control pace. Brunson usage up 8% without pressure.",
-     "recommendation": "OVER 6.5 -- Pace control edge.", "matchup": "vs Pacers (shorthanded backcourt)"},
-    {"player": "Tyrese Haliburton", "sport": "NBA", "team": "Pacers", "prop": "PRA", "line": "O/U 32.5",
-     "edge": "D", "reason": "INJURED -- DNP expected. Do not bet.", "recommendation": "NO BET -- Player injured.",
-     "matchup": "N/A"},
-    {"player": "Anthony Edwards", "sport": "NBA", "team": "Timberwolves", "prop": "3-Pointers Made", "line": "O/U 3.5",
-     "edge": "C", "reason": "Edwards shooting 31% from 3 this month. Volume is there but accuracy is cold.",
-     "recommendation": "PASS -- Cold stretch, no edge.", "matchup": "vs Clippers (12th in 3PT D)"},
-    {"player": "Connor McDavid", "sport": "NHL", "team": "Oilers", "prop": "Points", "line": "O/U 1.5",
-     "edge": "B", "reason": "Playing Sharks (worst GAA in league). McDavid has 8 points in last 3 vs SJ.",
-     "recommendation": "OVER 1.5 -- Matchup gold.", "matchup": "vs Sharks (32nd in GAA)"},
-]
-
-DEMO_WEEKLY_PL = [
-    {"week": "Week 1", "starting": 1000, "ending": 1085, "bets": 6, "record": "4-2", "net": 85},
-    {"week": "Week 2", "starting": 1085, "ending": 1220, "bets": 5, "record": "4-1", "net": 135},
-    {"week": "Week 3", "starting": 1220, "ending": 1145, "bets": 7, "record": "3-4", "net": -75},
-    {"week": "Week 4", "starting": 1145, "ending": 1310, "bets": 5, "record": "4-1", "net": 165},
-    {"week": "Week 5", "starting": 1310, "ending": 1430, "bets": 6, "record": "4-2", "net": 120},
-    {"week": "Week 6", "starting": 1430, "ending": 1365, "bets": 4, "record": "2-2", "net": -65},
-    {"week": "Week 7", "starting": 1365, "ending": 1530, "bets": 5, "record": "4-1", "net": 165},
-    {"week": "Week 8", "starting": 1530, "ending": 1480, "bets": 6, "record": "3-3", "net": -50},
-]
-
-DEMO_BET_LOG = [
-    {"date": "2026-02-24", "game": "Bucks -4 vs Heat", "type": "Spread", "grade": "B", "risk": 100,
-     "result": "W", "payout": 195, "edge_real": True, "notes": "Fatigue edge was real. Heat shot 38%."},
-    {"date": "2026-02-24", "game": "Jokic O11.5 reb", "type": "Prop", "grade": "A", "risk": 50,
-     "result": "W", "payout": 140, "edge_real": True, "notes": "Finished with 15 rebounds. Matchup edge validated."},
-    {"date": "2026-02-24", "game": "3-Leg Parlay", "type": "Parlay", "grade": "B", "risk": 50,
-     "result": "L", "payout": 0, "edge_real": True, "notes": "Lost on Bills/Pats UNDER. Fluke TDs in garbage time."},
-    {"date": "2026-02-23", "game": "Knicks -5.5 vs Pacers", "type": "Spread", "grade": "A", "risk": 150,
-     "result": "W", "payout": 295, "edge_real": True, "notes": "Pacers missing 2 starters. Line was too low."},
-    {"date": "2026-02-23", "game": "Panthers ML vs Lightning", "type": "ML", "grade": "B+", "risk": 75,
-     "result": "W", "payout": 158, "edge_real": True, "notes": "Kucherov out. Panthers dominated."},
-    {"date": "2026-02-22", "game": "Lakers -8 vs Hornets", "type": "Spread", "grade": "C", "risk": 50,
-     "result": "L", "payout": 0, "edge_real": False, "notes": "No real edge. Should have passed. Grade C = pass."},
-]
+@st.cache_resource
+def _metrics_exporter():
+    """Prometheus /metrics for this process on EDGE_METRICS_PORT (rerun sections, OpenAI calls, odds polls)."""
+    port = os.getenv("EDGE_METRICS_PORT")
+    return start_http_server(int(port)) if port else None
+
+
+_metrics_exporter()
+
+
+@st.cache_resource
+def _chat_timer():
+    return CallTimer()
+
+
+@st.cache_resource
+def _openai_client():
+    """One Azure OpenAI client (and keep-alive connection pool) shared by every session."""
+    return make_client(
+        st.secrets["AZURE_OPENAI_ENDPOINT"],
+        st.secrets["AZURE_OPENAI_KEY"],
+        st.secrets.get("AZURE_OPENAI_API_VERSION", "2024-06-01"),
+        timer=_chat_timer(),
+    )
+
 
 EDGE_COLORS = {"A": "#22c55e", "B+": "#10B981", "B": "#10B981", "B-": "#10B981",
                "C": "#eab308", "D": "#f97316", "F": "#ef4444"}
@@ -175,20 +192,64 @@ def edge_badge(grade):
     return f'<span style="background:{bg};color:{color};padding:4px 12px;border-radius:6px;font-weight:700;font-size:14px;border:1px solid {color}40;">{grade}</span>'
 
 
+@st.cache_resource
+def _response_cache():
+    """Shared AI replies. Anything answered against an older slate is dropped when odds or grades change."""
+    cache = ResponseCache(maxsize=int(os.getenv("EDGE_CHAT_CACHE_SIZE", "512")),
+                          ttl=float(os.getenv("EDGE_CHAT_CACHE_TTL", "900")))
+    _slate_store().subscribe(lambda snap: cache.retain_slate(snap.digest))
+    return cache
+
+
+@st.cache_resource
+def _line_store():
+    """Process-wide line history, one tick buffer per market."""
+    return LineStore()
+
+
+@st.cache_resource
+def _slate_store():
+    """Process-wide slate. EDGE_ODDS_FEED ('stub' or name=url,...) starts background odds ingestion."""
+    store = SlateStore()
+    lines = _line_store()
+    lines.record(store.current())
+    store.subscribe(lines.record)
+    feed = os.getenv("EDGE_ODDS_FEED", "")
+    if feed:
+        start_feed(store, feed, interval=float(os.getenv("EDGE_ODDS_INTERVAL", "3")))
+    return store
+
+
 def get_games(sport):
-    if sport == "NBA":
-        return DEMO_NBA_GAMES
-    elif sport == "NHL":
-        return DEMO_NHL_GAMES
-    elif sport == "NFL":
-        return DEMO_NFL_GAMES
-    elif sport == "CFB":
-        return DEMO_CFB_GAMES
-    return []
+    return _slate_store().current().games(sport)
+
+
+@st.cache_resource
+def get_props():
+    """Prop board with grades derived from each prop's features."""
+    return regrade_props(DEMO_PROPS)
+
+
+@st.cache_resource
+def _prop_index():
+    """Search index over the prop board; _render_props() syncs it whenever get_props() returns a new board."""
+    return PropIndex(get_props())
+
+
+@st.cache_resource
+def _intent_index():
+    """Demo-mode chat intents: canned answers plus one per team and prop player on the slate."""
+    return build_index(DEMO_RESPONSES, DEMO_PARAPHRASES, _slate_store().current().all_games(), get_props())
+
+
+def line_move_label(game):
+    """'Suns: opened +2.5 | now +3.5 (+1.0, ...)' from recorded line history."""
+    return move_label(game, _line_store().summary(game_id(game)))
 
 
 # --- Custom CSS ---
-st.markdown("""
+with _prof().section("css"):
+    st.markdown("""
 <style>
     .stApp { background-color: #0B0F0F; }
     .main-header {
@@ -290,7 +351,7 @@ st.markdown(f"""
 # ============================================================
 # SIDEBAR -- Bankroll Tracker
 # ============================================================
-with st.sidebar:
+with st.sidebar, _prof().section("sidebar"):
     st.markdown('<p class="section-label">Profile</p>', unsafe_allow_html=True)
     _profile_names = list(PROFILE_CONFIG.keys())
     _cur_idx = _profile_names.index(st.session_state.active_profile)
@@ -315,7 +376,7 @@ with st.sidebar:
 
     bal = _p()["bankroll"]["balance"]
     starting = _p()["bankroll"]["starting"]
-    daily_risk = _p()["bankroll"]["daily_risk"]
+    daily_risk = _daily_risk()
     net = bal - starting
     net_pct = (net / starting * 100) if starting > 0 else 0
 
@@ -356,6 +417,7 @@ with st.sidebar:
     new_bal = st.number_input("Balance ($)", min_value=0.0, value=bal, step=50.0, key="bal_input")
     if new_bal != bal:
         _p()["bankroll"]["balance"] = new_bal
+        _save()
 
     st.divider()
 
@@ -394,22 +456,45 @@ No rollover. No bonus traps. Clean money.
 
 
 # ============================================================
-# TABS
+# SECTIONS
 # ============================================================
-tab_slate, tab_edge, tab_parlay, tab_props, tab_audit, tab_chat = st.tabs([
-    "Tonight's Slate",
-    "Edge Analyzer",
-    "Parlay Builder",
-    "Player Props",
-    "My Audit",
-    "AI Chat",
-])
+# Each tab body is a render function. In "lazy" mode (default) only the active
+# section runs on a rerun; "tabs" mode keeps the classic st.tabs layout where
+# every body runs every time. Pick with ?render=tabs or EDGE_RENDER_MODE=tabs.
+SECTION_NAMES = ["Tonight's Slate", "Edge Analyzer", "Parlay Builder", "Player Props", "My Audit", "AI Chat"]
+
+
+def _render_mode():
+    mode = st.query_params.get("render") or os.getenv("EDGE_RENDER_MODE", "lazy")
+    return "tabs" if mode == "tabs" else "lazy"
+
+
+# Widget clicks inside a fragment rerun only that fragment, not the whole page.
+def _fragment(fn):
+    """st.fragment, plus a profile of its own for each rerun of just the fragment."""
+    if not hasattr(st, "fragment"):
+        return fn
+
+    @functools.wraps(fn)
+    def run():
+        outer = _prof()
+        if not outer.enabled or not outer.finished:  # part of a full rerun (or profiling is off)
+            return fn()
+        name = fn.__name__.removeprefix("_render_")
+        prof = st.session_state["_rerun_profiler"] = RerunProfiler(outer.mode, label=f"{name} (fragment)")
+        try:
+            with prof.section(name):
+                return fn()
+        finally:
+            _record_profile(prof.finish())  # shown in the sidebar panel on the next full rerun
+
+    return st.fragment(run)
 
 
 # ============================================================
 # TAB 1: TONIGHT'S SLATE
 # ============================================================
-with tab_slate:
+def _render_slate():
     st.markdown("### Tonight's Slate")
     st.markdown(f'<p style="color:#6B8080;font-size:12px;">Demo data for {datetime.now().strftime("%A, %B %d, %Y")} | All times ET</p>', unsafe_allow_html=True)
 
@@ -424,95 +509,98 @@ with tab_slate:
     elif sport == "NHL":
         st.info("NHL is SECONDARY focus. ML and totals preferred. Goalie situations, B2Bs, weekend heavy.")
 
-    for i, g in enumerate(games):
-        grade_color = EDGE_COLORS.get(g["edge"], "#4A5A5A")
-        grade_bg = EDGE_BG.get(g["edge"], "rgba(107,114,128,0.15)")
+    with _prof().section("game cards"):
+        for i, g in enumerate(games):
+            grade_color = EDGE_COLORS.get(g["edge"], "#4A5A5A")
+            grade_bg = EDGE_BG.get(g["edge"], "rgba(107,114,128,0.15)")
 
-        col_main, col_edge = st.columns([4, 1])
-        with col_main:
-            st.markdown(f"""
-            <div class="game-card">
-                <div class="time">{g['time']}</div>
-                <div class="teams">{g['away']} @ {g['home']}</div>
-                <div class="odds-row">
-                    <span>Spread: <strong style="color:#e2e8f0;">{g['spread']}</strong></span>
-                    <span>Total: <strong style="color:#e2e8f0;">{g['total']}</strong></span>
-                    <span>ML: <strong style="color:#e2e8f0;">{g['ml_away']}/{g['ml_home']}</strong></span>
+            col_main, col_edge = st.columns([4, 1])
+            with col_main:
+                st.markdown(f"""
+                <div class="game-card">
+                    <div class="time">{g['time']}</div>
+                    <div class="teams">{g['away']} @ {g['home']}</div>
+                    <div class="odds-row">
+                        <span>Spread: <strong style="color:#e2e8f0;">{g['spread']}</strong></span>
+                        <span>Total: <strong style="color:#e2e8f0;">{g['total']}</strong></span>
+                        <span>ML: <strong style="color:#e2e8f0;">{g['ml_away']}/{g['ml_home']}</strong></span>
+                    </div>
                 </div>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_edge:
-            st.markdown(f"""
-            <div style="text-align:center;padding-top:20px;">
-                <div style="font-size:11px;color:#6B8080;margin-bottom:4px;">EDGE</div>
-                {edge_badge(g['edge'])}
-            </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
+            with col_edge:
+                st.markdown(f"""
+                <div style="text-align:center;padding-top:20px;">
+                    <div style="font-size:11px;color:#6B8080;margin-bottom:4px;">EDGE</div>
+                    {edge_badge(g['edge'])}
+                </div>
+                """, unsafe_allow_html=True)
 
-        if st.button(f"Analyze {g['away']} @ {g['home']}", key=f"analyze_{sport}_{i}", use_container_width=True):
-            st.session_state.selected_game = g
+            if st.button(f"Analyze {g['away']} @ {g['home']}", key=f"analyze_{sport}_{i}", use_container_width=True):
+                st.session_state.selected_game = g
 
-    if st.session_state.selected_game:
-        g = st.session_state.selected_game
-        st.divider()
-        st.markdown(f"### Quick Analysis: {g['away']} @ {g['home']}")
+        if st.session_state.selected_game:
+            g = st.session_state.selected_game
+            st.divider()
+            st.markdown(f"### Quick Analysis: {g['away']} @ {g['home']}")
 
-        col_a, col_b = st.columns(2)
-        with col_a:
-            st.markdown(f"""
-            <div class="edge-box" style="background:{EDGE_BG.get(g['edge'], 'rgba(107,114,128,0.15)')};">
-                <p class="section-label">Edge Grade</p>
-                <div style="font-size:48px;font-weight:700;color:{EDGE_COLORS.get(g['edge'], '#4A5A5A')};margin:8px 0;">{g['edge']}</div>
-                <p style="color:#e2e8f0;font-size:14px;">{g['edge_reason']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_b:
-            action = "Full unit" if g["edge"] == "A" else ("Half unit" if g["edge"] in ["B", "B+"] else ("Small or pass" if g["edge"] == "C" else "NO BET"))
-            action_color = EDGE_COLORS.get(g["edge"], "#4A5A5A")
-            st.markdown(f"""
-            <div class="edge-box" style="background:#121A1A;">
-                <p class="section-label">Recommendation</p>
-                <div style="font-size:24px;font-weight:700;color:{action_color};margin:8px 0;">{action}</div>
-                <p style="color:#6B8080;font-size:13px;">Spread: {g['spread']} | Total: {g['total']}</p>
-                <p style="color:#6B8080;font-size:13px;">ML: {g['ml_away']} / {g['ml_home']}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            col_a, col_b = st.columns(2)
+            with col_a:
+                st.markdown(f"""
+                <div class="edge-box" style="background:{EDGE_BG.get(g['edge'], 'rgba(107,114,128,0.15)')};">
+                    <p class="section-label">Edge Grade</p>
+                    <div style="font-size:48px;font-weight:700;color:{EDGE_COLORS.get(g['edge'], '#4A5A5A')};margin:8px 0;">{g['edge']}</div>
+                    <p style="color:#e2e8f0;font-size:14px;">{g['edge_reason']}</p>
+                    {"".join(f'<p style="color:#ef4444;font-size:12px;font-weight:600;">RED FLAG: {f}</p>' for f in g.get("edge_flags", []))}
+                </div>
+                """, unsafe_allow_html=True)
+            with col_b:
+                action = "Full unit" if g["edge"] == "A" else ("Half unit" if g["edge"] in ["B", "B+"] else ("Small or pass" if g["edge"] == "C" else "NO BET"))
+                action_color = EDGE_COLORS.get(g["edge"], "#4A5A5A")
+                st.markdown(f"""
+                <div class="edge-box" style="background:#121A1A;">
+                    <p class="section-label">Recommendation</p>
+                    <div style="font-size:24px;font-weight:700;color:{action_color};margin:8px 0;">{action}</div>
+                    <p style="color:#6B8080;font-size:13px;">Spread: {g['spread']} | Total: {g['total']}</p>
+                    <p style="color:#6B8080;font-size:13px;">ML: {g['ml_away']} / {g['ml_home']}</p>
+                    <p style="color:#6B8080;font-size:13px;">{line_move_label(g)}</p>
+                </div>
+                """, unsafe_allow_html=True)
 
-        col_w, col_r = st.columns(2)
-        with col_w:
-            st.markdown(f"""
-            <div class="edge-box" style="background:#121A1A;">
-                <p class="section-label">Why Market Might Be Wrong</p>
-                <p style="color:#22c55e;font-size:14px;">{g['why_wrong']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_r:
+            col_w, col_r = st.columns(2)
+            with col_w:
+                st.markdown(f"""
+                <div class="edge-box" style="background:#121A1A;">
+                    <p class="section-label">Why Market Might Be Wrong</p>
+                    <p style="color:#22c55e;font-size:14px;">{g['why_wrong']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            with col_r:
+                st.markdown(f"""
+                <div class="edge-box" style="background:#121A1A;">
+                    <p class="section-label">Why Market Might Be Right</p>
+                    <p style="color:#ef4444;font-size:14px;">{g['why_right']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            gut_icon = "STRONG ALIGNMENT" if g["gut_data"] == "strong" else ("SUPPORTS" if g["gut_data"] == "supports" else "NEUTRAL")
+            gut_color = "#22c55e" if g["gut_data"] in ["strong", "supports"] else "#eab308"
             st.markdown(f"""
             <div class="edge-box" style="background:#121A1A;">
-                <p class="section-label">Why Market Might Be Right</p>
-                <p style="color:#ef4444;font-size:14px;">{g['why_right']}</p>
+                <p class="section-label">Gut + Data Alignment</p>
+                <p style="color:{gut_color};font-size:18px;font-weight:700;">{gut_icon}</p>
             </div>
             """, unsafe_allow_html=True)
 
-        gut_icon = "STRONG ALIGNMENT" if g["gut_data"] == "strong" else ("SUPPORTS" if g["gut_data"] == "supports" else "NEUTRAL")
-        gut_color = "#22c55e" if g["gut_data"] in ["strong", "supports"] else "#eab308"
-        st.markdown(f"""
-        <div class="edge-box" style="background:#121A1A;">
-            <p class="section-label">Gut + Data Alignment</p>
-            <p style="color:{gut_color};font-size:18px;font-weight:700;">{gut_icon}</p>
-        </div>
-        """, unsafe_allow_html=True)
-
 
 # ============================================================
 # TAB 2: EDGE ANALYZER
 # ============================================================
-with tab_edge:
+def _render_edge():
     st.markdown("### Edge Analyzer")
     st.markdown('<p style="color:#6B8080;font-size:13px;">Deep dive into any matchup. Answer the core question: Why is the market wrong?</p>', unsafe_allow_html=True)
 
     # Game selector
-    all_games = DEMO_NBA_GAMES + DEMO_NHL_GAMES
+    all_games = get_games("NBA") + get_games("NHL")
     game_labels = [f"{g['away']} @ {g['home']}" for g in all_games]
     selected_idx = st.selectbox("Select a matchup", range(len(game_labels)), format_func=lambda i: game_labels[i], key="edge_game_select")
     game = all_games[selected_idx]
@@ -590,29 +678,70 @@ with tab_edge:
 # ============================================================
 # TAB 3: PARLAY BUILDER
 # ============================================================
-with tab_parlay:
+@_fragment
+def _render_parlay():
     st.markdown("### Parlay Builder")
     st.markdown('<p style="color:#6B8080;font-size:13px;">Each leg needs its own edge. Not random teams stapled together.</p>', unsafe_allow_html=True)
 
     # Add legs
-    all_options = DEMO_NBA_GAMES + DEMO_NHL_GAMES
-    option_labels = [f"{g['away']} @ {g['home']} -- {g['spread']} (Edge: {g['edge']})" for g in all_options]
-
-    bet_type = st.selectbox("Bet Type", ["Spread", "Total (Over)", "Total (Under)", "Moneyline"], key="parlay_bet_type")
-    selected_leg_idx = st.selectbox("Select a game", range(len(option_labels)), format_func=lambda i: option_labels[i], key="parlay_leg_select")
-
-    if st.button("Add Leg", key="add_leg"):
-        g = all_options[selected_leg_idx]
-        if len(_p()["parlay_legs"]) >= 4:
-            st.error("HARD STOP: Max 4 legs. More is stupid. Remove a leg first.")
-        elif len(_p()["parlay_legs"]) >= 3:
-            st.warning("3 legs is the recommended max. Adding a 4th is absolute maximum.")
-            _p()["parlay_legs"].append({"game": f"{g['away']} @ {g['home']}", "type": bet_type,
-                                                  "spread": g["spread"], "edge": g["edge"], "odds": g.get("ml_home", "-110")})
-        else:
-            _p()["parlay_legs"].append({"game": f"{g['away']} @ {g['home']}", "type": bet_type,
-                                                  "spread": g["spread"], "edge": g["edge"], "odds": g.get("ml_home", "-110")})
-            st.success(f"Added: {g['away']} @ {g['home']} ({bet_type})")
+    all_options = get_games("NBA") + get_games("NHL")
+    build_mode = st.radio("Mode", ["Manual", "Auto-build"], horizontal=True, key="parlay_mode")
+
+    if build_mode == "Manual":
+        option_labels = [f"{g['away']} @ {g['home']} -- {g['spread']} (Edge: {g['edge']})" for g in all_options]
+
+        bet_type = st.selectbox("Bet Type", ["Spread", "Total (Over)", "Total (Under)", "Moneyline"], key="parlay_bet_type")
+        selected_leg_idx = st.selectbox("Select a game", range(len(option_labels)), format_func=lambda i: option_labels[i], key="parlay_leg_select")
+
+        if st.button("Add Leg", key="add_leg"):
+            g = all_options[selected_leg_idx]
+            if len(_p()["parlay_legs"]) >= 4:
+                st.error("HARD STOP: Max 4 legs. More is stupid. Remove a leg first.")
+            elif len(_p()["parlay_legs"]) >= 3:
+                st.warning("3 legs is the recommended max. Adding a 4th is absolute maximum.")
+                _p()["parlay_legs"].append(make_leg(g, bet_type))
+                _save()
+            else:
+                _p()["parlay_legs"].append(make_leg(g, bet_type))
+                _save()
+                st.success(f"Added: {g['away']} @ {g['home']} ({bet_type})")
+    else:
+        st.markdown('<p style="color:#6B8080;font-size:13px;">Searches every 2-4 leg combo on the slate. B+ legs only, one leg per game, ranked by expected value.</p>', unsafe_allow_html=True)
+        col_k, col_n = st.columns(2)
+        with col_k:
+            auto_top_k = st.number_input("Show top", min_value=1, max_value=25, value=5, step=1, key="auto_top_k")
+        with col_n:
+            auto_max_legs = st.selectbox("Max legs", [2, 3, 4], index=1, key="auto_max_legs")
+
+        if st.button("Find Best Parlays", key="auto_build", use_container_width=True):
+            st.session_state.auto_parlays = optimize(all_options, top_k=int(auto_top_k),
+                                                     leg_counts=tuple(range(2, auto_max_legs + 1)))
+
+        auto_parlays = st.session_state.get("auto_parlays")
+        if auto_parlays is not None and not auto_parlays:
+            st.info("No qualifying parlays. Not enough B+ edges on the slate -- no edge = no parlay.")
+        for i, cand in enumerate(auto_parlays or []):
+            picks = " + ".join(leg["pick"] for leg in cand["legs"])
+            ev_color = "#22c55e" if cand["ev"] > 0 else "#ef4444"
+            col_c, col_use = st.columns([5, 1])
+            with col_c:
+                st.markdown(f"""
+                <div class="prop-card">
+                    <div style="display:flex;justify-content:space-between;align-items:center;">
+                        <span style="color:#e2e8f0;font-weight:600;">{len(cand['legs'])} legs: {picks}</span>
+                        <span style="color:#10B981;font-weight:700;">{format_american(cand['american'])}</span>
+                    </div>
+                    <p style="color:#6B8080;font-size:12px;margin:6px 0 0 0;">
+                        Win prob {cand['win_prob'] * 100:.1f}% vs break-even {cand['break_even'] * 100:.1f}% |
+                        <span style="color:{ev_color};font-weight:600;">EV {cand['ev'] * 100:+.1f}%</span>
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+            with col_use:
+                if st.button("Use", key=f"use_auto_{i}"):
+                    _p()["parlay_legs"] = [dict(leg) for leg in cand["legs"]]
+                    _save()
+                    st.rerun()
 
     # Display legs
     if _p()["parlay_legs"]:
@@ -627,7 +756,7 @@ with tab_parlay:
                     <div style="display:flex;justify-content:space-between;align-items:center;">
                         <div>
                             <span style="color:#e2e8f0;font-weight:600;">Leg {i+1}: {leg['game']}</span>
-                            <span style="color:#6B8080;font-size:12px;margin-left:12px;">{leg['type']} | {leg['spread']}</span>
+                            <span style="color:#6B8080;font-size:12px;margin-left:12px;">{leg['type']} | {leg['spread']} | {leg['odds']}</span>
                         </div>
                         <div>{edge_badge(leg['edge'])}</div>
                     </div>
@@ -636,6 +765,7 @@ with tab_parlay:
             with col_rm:
                 if st.button("Remove", key=f"rm_leg_{i}"):
                     _p()["parlay_legs"].pop(i)
+                    _save()
                     st.rerun()
 
         # Validation: Would you bet each straight?
@@ -658,35 +788,35 @@ with tab_parlay:
         if all_valid:
             st.markdown('<p style="color:#22c55e;font-size:13px;">All legs have independent edge. Parlay is valid.</p>', unsafe_allow_html=True)
 
-        # Combined odds (simplified demo calculation)
+        # Combined odds from each leg's actual price
         st.divider()
         num_legs = len(_p()["parlay_legs"])
-        # Demo combined odds based on leg count
-        combined_map = {1: 100, 2: 264, 3: 485, 4: 890}
-        combined_odds = combined_map.get(num_legs, 485)
-
         profile = "Value Builder (+400 to +1000)" if 2 <= num_legs <= 3 else ("Long Shot (+800 to +2500)" if num_legs == 4 else "Straight Bet")
         max_risk = _p()["bankroll"]["balance"] * 0.05
+        suggested_risk = max_risk * 0.5 if num_legs <= 3 else max_risk * 0.25
+        priced = price_parlay([leg["odds"] for leg in _p()["parlay_legs"]], suggested_risk)
 
-        col_o, col_p, col_r = st.columns(3)
+        col_o, col_p, col_r, col_be = st.columns(4)
         with col_o:
-            st.metric("Combined Odds", f"+{combined_odds}")
+            st.metric("Combined Odds", format_american(priced["american"]))
         with col_p:
             st.metric("Profile", profile.split(" (")[0])
         with col_r:
-            suggested_risk = max_risk * 0.5 if num_legs <= 3 else max_risk * 0.25
             st.metric("Suggested Risk", f"${suggested_risk:,.2f}")
+        with col_be:
+            st.metric("Break-Even", f"{priced['break_even'] * 100:.1f}%")
 
-        payout = suggested_risk * (combined_odds / 100)
+        payout = priced["payout"]
         st.markdown(f"""
         <div class="edge-box" style="background:rgba(16,185,129,0.08);border-color:#10B98130;">
             <p style="color:#10B981;font-size:16px;font-weight:700;">Risk ${suggested_risk:,.2f} to win ${payout:,.2f}</p>
-            <p style="color:#6B8080;font-size:12px;">Max daily risk: ${_p()['bankroll']['balance'] * 0.15:,.2f} | Currently exposed: ${_p()['bankroll']['daily_risk']:,.2f}</p>
+            <p style="color:#6B8080;font-size:12px;">Max daily risk: ${_p()['bankroll']['balance'] * 0.15:,.2f} | Currently exposed: ${_daily_risk():,.2f}</p>
         </div>
         """, unsafe_allow_html=True)
 
         if st.button("Clear All Legs", key="clear_legs"):
             _p()["parlay_legs"].clear()
+            _save()
             st.rerun()
     else:
         st.markdown('<p style="color:#4A5A5A;font-size:14px;text-align:center;padding:40px 0;">No legs added yet. Select a game above to start building.</p>', unsafe_allow_html=True)
@@ -695,22 +825,21 @@ with tab_parlay:
 # ============================================================
 # TAB 4: PLAYER PROPS
 # ============================================================
-with tab_props:
+@_fragment
+def _render_props():
     st.markdown("### Player Props")
     st.markdown('<p style="color:#6B8080;font-size:13px;">Props are about matchups, not just talent. Matchup-driven thesis required.</p>', unsafe_allow_html=True)
 
     # Search / filter
     col_search, col_sport_filter = st.columns([3, 1])
     with col_search:
-        search = st.text_input("Search player", placeholder="e.g., Jokic, Luka, McDavid...", key="prop_search")
+        search = st.text_input("Search player", placeholder="e.g., Jokic, Nuggets, rebounds...", key="prop_search")
     with col_sport_filter:
         sport_filter = st.selectbox("Sport", ["All", "NBA", "NHL"], key="prop_sport_filter")
 
-    filtered_props = DEMO_PROPS
-    if search:
-        filtered_props = [p for p in filtered_props if search.lower() in p["player"].lower()]
-    if sport_filter != "All":
-        filtered_props = [p for p in filtered_props if p["sport"] == sport_filter]
+    index = _prop_index()
+    index.sync(get_props())
+    filtered_props = index.search(search, sport=sport_filter)
 
     if not filtered_props:
         st.markdown('<p style="color:#4A5A5A;font-size:14px;text-align:center;padding:20px;">No props found matching your search.</p>', unsafe_allow_html=True)
@@ -743,124 +872,195 @@ with tab_props:
 # ============================================================
 # TAB 5: MY AUDIT
 # ============================================================
-with tab_audit:
+def _reset_audit_pages():
+    st.session_state.audit_page = 1
+    st.session_state.review_page = 1
+
+
+def _pager(key, total, per_page, noun):
+    """Page picker for a list paged in SQL. Returns the row offset of the selected page."""
+    pages = max(-(-total // per_page), 1)
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    col_p, col_c = st.columns([1, 5])
+    with col_p:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=key, label_visibility="collapsed")
+    first = (page - 1) * per_page
+    with col_c:
+        st.caption(f"Page {page:,} of {pages:,} -- {first + 1:,}-{min(first + per_page, total):,} of {total:,} {noun}")
+    return first
+
+
+def _review_card(b):
+    """One "Was the edge real?" card (a ledger row from itertuples) as HTML."""
+    pl = b.payout - b.risk
+    icon_color = "#22c55e" if b.result == "W" else "#ef4444"
+    if pd.isna(b.edge_real):
+        edge_label, edge_color = "Not reviewed", "#6B8080"
+    else:
+        edge_label = "Edge was real" if b.edge_real else "No real edge"
+        edge_color = "#22c55e" if b.edge_real else "#ef4444"
+    return f"""
+    <div class="prop-card">
+        <div style="display:flex;justify-content:space-between;align-items:center;">
+            <div>
+                <span style="color:{icon_color};font-weight:700;margin-right:8px;">{b.result}</span>
+                <span style="color:#e2e8f0;font-weight:600;">{html.escape(b.game)}</span>
+                <span style="color:#6B8080;font-size:12px;margin-left:12px;">{b.date:%Y-%m-%d}</span>
+            </div>
+            <div style="display:flex;align-items:center;gap:12px;">
+                <span style="color:{icon_color};font-weight:600;">${pl:+,.2f}</span>
+                {edge_badge(b.grade)}
+                <span style="color:{edge_color};font-size:12px;font-weight:600;">{edge_label}</span>
+            </div>
+        </div>
+        <p style="color:#6B8080;font-size:12px;margin-top:6px;">{html.escape(b.notes or b.thesis)}</p>
+    </div>
+    """
+
+
+def _render_audit():
     st.markdown("### My Audit")
     st.markdown('<p style="color:#6B8080;font-size:13px;">Grade process, not outcome. No excuses. Loss is a loss.</p>', unsafe_allow_html=True)
 
-    # Summary metrics
-    total_bets = len(DEMO_BET_LOG)
-    wins = sum(1 for b in DEMO_BET_LOG if b["result"] == "W")
-    losses = total_bets - wins
-    total_risk = sum(b["risk"] for b in DEMO_BET_LOG)
-    total_payout = sum(b["payout"] for b in DEMO_BET_LOG)
-    net_pl = total_payout - total_risk
-    edge_accuracy = sum(1 for b in DEMO_BET_LOG if b["edge_real"]) / total_bets * 100 if total_bets > 0 else 0
+    # Audit source: the active profile's ledger, or the sample log until it has bets
+    audit_ledger, audit_profile = _ledger(), st.session_state.active_profile
+    agg = audit_ledger.totals().get(audit_profile)
+    if agg is None or not agg["bets"]:
+        audit_ledger, audit_profile = _demo_ledger(), DEMO_PROFILE
+        agg = audit_ledger.totals()[DEMO_PROFILE]
+        st.caption("Sample history -- log a bet below to start auditing your own.")
+
+    # Summary metrics (materialized totals, so cost doesn't grow with history)
+    edge_accuracy = agg["edge_accuracy"]
 
     col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
     with col_m1:
-        st.metric("Record", f"{wins}-{losses}")
+        st.metric("Record", f"{agg['wins']}-{agg['losses']}")
     with col_m2:
-        st.metric("Net P/L", f"${net_pl:+,.2f}")
+        st.metric("Net P/L", f"${agg['net']:+,.2f}")
     with col_m3:
-        roi = (net_pl / total_risk * 100) if total_risk > 0 else 0
-        st.metric("ROI", f"{roi:+.1f}%")
+        st.metric("ROI", f"{agg['roi']:+.1f}%")
     with col_m4:
-        st.metric("Edge Accuracy", f"{edge_accuracy:.0f}%")
+        st.metric("Edge Accuracy", "--" if edge_accuracy is None else f"{edge_accuracy:.0f}%")
     with col_m5:
-        process_grade = "A" if edge_accuracy >= 80 else ("B+" if edge_accuracy >= 70 else ("B" if edge_accuracy >= 60 else "C"))
+        if edge_accuracy is None:
+            process_grade = "--"
+        else:
+            process_grade = "A" if edge_accuracy >= 80 else ("B+" if edge_accuracy >= 70 else ("B" if edge_accuracy >= 60 else "C"))
         st.metric("Process Grade", process_grade)
 
     st.divider()
 
-    # Bet log table
+    # Bet log table: filtered, sorted and paged in SQL
     st.markdown('<p class="section-label">Recent Bets</p>', unsafe_allow_html=True)
 
-    log_data = []
-    for b in DEMO_BET_LOG:
-        result_icon = "W" if b["result"] == "W" else "L"
-        pl = b["payout"] - b["risk"]
-        log_data.append({
-            "Date": b["date"],
-            "Game": b["game"],
-            "Type": b["type"],
-            "Grade": b["grade"],
-            "Risk": f"${b['risk']}",
-            "Result": result_icon,
-            "P/L": f"${pl:+,}",
-            "Edge Real?": "Yes" if b["edge_real"] else "No",
-        })
-
-    df_log = pd.DataFrame(log_data)
-    st.dataframe(df_log, use_container_width=True, hide_index=True)
-
-    # "Was the edge real?" section
+    col_g, col_r, col_s, col_o = st.columns(4)
+    with col_g:
+        audit_grade = st.selectbox("Grade", ["All"] + GRADE_ORDER, key="audit_grade", on_change=_reset_audit_pages)
+    with col_r:
+        audit_result = st.selectbox("Result", ["All", "W", "L", "Push", "Pending"], key="audit_result",
+                                    on_change=_reset_audit_pages)
+    with col_s:
+        audit_sort = st.selectbox("Sort by", list(AUDIT_SORTS), key="audit_sort", on_change=_reset_audit_pages)
+    with col_o:
+        audit_desc = st.selectbox("Order", ["Descending", "Ascending"], key="audit_order",
+                                  on_change=_reset_audit_pages) == "Descending"
+    grade_filter = None if audit_grade == "All" else audit_grade
+    result_filter = None if audit_result == "All" else audit_result
+    sort_args = dict(order_by=AUDIT_SORTS[audit_sort], descending=audit_desc)
+
+    with _prof().section("bet log frame"):
+        n_rows = audit_ledger.count(audit_profile, grade=grade_filter, result=result_filter)
+        offset = _pager("audit_page", n_rows, AUDIT_PAGE_ROWS, "bets")
+        page = audit_ledger.frame(audit_profile, limit=AUDIT_PAGE_ROWS, offset=offset, grade=grade_filter,
+                                  result=result_filter, **sort_args)
+        page["pl"] = (page["payout"] - page["risk"]).where(page["result"].isin(["W", "L"]))
+        st.dataframe(
+            page[["date", "game", "type", "grade", "risk", "result", "pl", "edge_real"]],
+            column_config={
+                "date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+                "game": "Game", "type": "Type", "grade": "Grade", "result": "Result",
+                "risk": st.column_config.NumberColumn("Risk", format="$%.2f"),
+                "pl": st.column_config.NumberColumn("P/L", format="$%+.2f"),
+                "edge_real": st.column_config.CheckboxColumn("Edge Real?"),
+            },
+            use_container_width=True, hide_index=True,
+        )
+
+    # "Was the edge real?" section: settled bets under the same filters, one page of cards at a time
     st.divider()
     st.markdown('<p class="section-label">Was The Edge Real? -- Honest Review</p>', unsafe_allow_html=True)
 
-    for b in DEMO_BET_LOG:
-        pl = b["payout"] - b["risk"]
-        icon_color = "#22c55e" if b["result"] == "W" else "#ef4444"
-        edge_label = "Edge was real" if b["edge_real"] else "No real edge"
-        edge_color = "#22c55e" if b["edge_real"] else "#ef4444"
-
-        st.markdown(f"""
-        <div class="prop-card">
-            <div style="display:flex;justify-content:space-between;align-items:center;">
-                <div>
-                    <span style="color:{icon_color};font-weight:700;margin-right:8px;">{'W' if b['result'] == 'W' else 'L'}</span>
-                    <span style="color:#e2e8f0;font-weight:600;">{b['game']}</span>
-                    <span style="color:#6B8080;font-size:12px;margin-left:12px;">{b['date']}</span>
-                </div>
-                <div style="display:flex;align-items:center;gap:12px;">
-                    <span style="color:{icon_color};font-weight:600;">${pl:+,}</span>
-                    {edge_badge(b['grade'])}
-                    <span style="color:{edge_color};font-size:12px;font-weight:600;">{edge_label}</span>
-                </div>
-            </div>
-            <p style="color:#6B8080;font-size:12px;margin-top:6px;">{b['notes']}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    with _prof().section("bet review cards"):
+        review_result = [r for r in ("W", "L") if result_filter in (None, r)]
+        n_reviews = audit_ledger.count(audit_profile, grade=grade_filter, result=review_result) if review_result else 0
+        if not n_reviews:
+            st.caption("No settled bets match these filters.")
+        else:
+            offset = _pager("review_page", n_reviews, REVIEW_PAGE_CARDS, "settled bets")
+            reviews = audit_ledger.frame(audit_profile, limit=REVIEW_PAGE_CARDS, offset=offset, grade=grade_filter,
+                                         result=review_result, **sort_args)
+            st.markdown("".join(_review_card(b) for b in reviews.itertuples()), unsafe_allow_html=True)
 
-    # Weekly P/L Chart
+    # Weekly P/L Chart (from the ledger's per-day totals)
     st.divider()
-    st.markdown('<p class="section-label">Weekly P/L</p>', unsafe_allow_html=True)
-
-    df_weekly = pd.DataFrame(DEMO_WEEKLY_PL)
-
-    fig = go.Figure()
-
-    # Net P/L bars
-    colors = ["#22c55e" if n >= 0 else "#ef4444" for n in df_weekly["net"]]
-    fig.add_trace(go.Bar(
-        x=df_weekly["week"], y=df_weekly["net"],
-        marker_color=colors, name="Net P/L",
-        text=[f"${n:+,}" for n in df_weekly["net"]],
-        textposition="outside", textfont=dict(color="#e2e8f0", size=11),
-    ))
-
-    # Balance line
-    fig.add_trace(go.Scatter(
-        x=df_weekly["week"], y=df_weekly["ending"],
-        mode="lines+markers", name="Balance",
-        line=dict(color="#10B981", width=2),
-        marker=dict(size=6, color="#10B981"),
-        yaxis="y2",
-    ))
-
-    fig.update_layout(
-        template="plotly_dark",
-        paper_bgcolor="#0B0F0F",
-        plot_bgcolor="#0B0F0F",
-        font=dict(color="#6B8080"),
-        height=350,
-        margin=dict(l=40, r=40, t=20, b=40),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        yaxis=dict(title="Net P/L ($)", gridcolor="#162020", zeroline=True, zerolinecolor="#1E2E2E"),
-        yaxis2=dict(title="Balance ($)", overlaying="y", side="right", gridcolor="rgba(0,0,0,0)"),
-        bargap=0.3,
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    with _prof().section("pl rollups"):
+        starting = _p()["bankroll"]["starting"] if audit_profile != DEMO_PROFILE else 0.0
+        days = daily_pl(audit_ledger.daily(audit_profile), starting)
+        period = chart_period(days)
+        periods = rollup(days, period)
+    st.markdown(f'<p class="section-label">{"Weekly" if period == "W" else "Monthly"} P/L</p>', unsafe_allow_html=True)
+
+    if not days["settled_risk"].any():
+        st.info("No settled bets yet -- log and settle bets below to build the P/L chart.")
+    else:
+        last = days.iloc[-1]
+        r1, r2, r3 = st.columns(3)
+        r1.metric("Settled Net", f"${days['net'].sum():+,.2f}")
+        r2.metric("7-Day ROI", "--" if pd.isna(last["roi_7d"]) else f"{last['roi_7d']:+.1f}%")
+        r3.metric("30-Day ROI", "--" if pd.isna(last["roi_30d"]) else f"{last['roi_30d']:+.1f}%")
+
+    with _prof().section("plotly chart"):
+        balance = downsample(days["balance"])
+        balance_name = "Balance" if starting > 0 else "Cumulative P/L"
+
+        fig = go.Figure()
+
+        # Net P/L bars, one per week (or month)
+        colors = ["#22c55e" if n >= 0 else "#ef4444" for n in periods["net"]]
+        fig.add_trace(go.Bar(
+            x=periods.index, y=periods["net"],
+            marker_color=colors, name="Net P/L",
+            text=[f"${n:+,.0f}" for n in periods["net"]] if len(periods) <= 26 else None,
+            textposition="outside", textfont=dict(color="#e2e8f0", size=11),
+            customdata=periods[["label", "record", "bets"]],
+            hovertemplate="%{customdata[0]}: %{y:$,.2f}<br>%{customdata[1]} (%{customdata[2]} bets)<extra></extra>",
+        ))
+
+        # Balance line, daily and downsampled for long histories
+        fig.add_trace(go.Scatter(
+            x=balance.index, y=balance.values,
+            mode="lines+markers" if len(balance) <= 60 else "lines", name=balance_name,
+            line=dict(color="#10B981", width=2),
+            marker=dict(size=6, color="#10B981"),
+            yaxis="y2",
+        ))
+
+        fig.update_layout(
+            template="plotly_dark",
+            paper_bgcolor="#0B0F0F",
+            plot_bgcolor="#0B0F0F",
+            font=dict(color="#6B8080"),
+            height=350,
+            margin=dict(l=40, r=40, t=20, b=40),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            yaxis=dict(title="Net P/L ($)", gridcolor="#162020", zeroline=True, zerolinecolor="#1E2E2E"),
+            yaxis2=dict(title=f"{balance_name} ($)", overlaying="y", side="right", gridcolor="rgba(0,0,0,0)"),
+            bargap=0.3,
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
 
     # Log a new bet
     st.divider()
@@ -887,50 +1087,49 @@ with tab_audit:
         submitted = st.form_submit_button("Log Bet", use_container_width=True)
 
         if submitted and log_game:
-            _p()["bet_log"].append({
+            _ledger().append(st.session_state.active_profile, {
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "game": log_game, "type": log_type, "grade": log_grade,
                 "risk": log_risk, "result": log_result, "payout": log_payout,
                 "thesis": log_thesis,
             })
-            _p()["bankroll"]["daily_risk"] += log_risk
-            st.success(f"Logged: {log_game} | Grade {log_grade} | ${log_risk} | Profile: {st.session_state.active_profile}")
-
-    # --- User-logged bets for current profile ---
-    if _p()["bet_log"]:
-        st.divider()
-        st.markdown(f'<p class="section-label">{st.session_state.active_profile} -- Logged Bets</p>', unsafe_allow_html=True)
-        user_log_data = []
-        for b in _p()["bet_log"]:
-            pl = b["payout"] - b["risk"] if b["result"] in ["W", "L"] else 0
-            user_log_data.append({
-                "Date": b["date"], "Game": b["game"], "Type": b["type"],
-                "Grade": b["grade"], "Risk": f"${b['risk']:,.2f}",
-                "Result": b["result"], "P/L": f"${pl:+,.2f}",
-            })
-        st.dataframe(pd.DataFrame(user_log_data), use_container_width=True, hide_index=True)
+            # Rerun so the log, review cards and chart above the form pick up the new bet.
+            st.session_state.log_flash = f"Logged: {log_game} | Grade {log_grade} | ${log_risk} | Profile: {st.session_state.active_profile}"
+            st.rerun()
+    if "log_flash" in st.session_state:
+        st.success(st.session_state.pop("log_flash"))
+
+    # --- Settle pending bets ---
+    _pending = _ledger().frame(st.session_state.active_profile, result="Pending", limit=LOG_PREVIEW_ROWS)
+    if len(_pending):
+        with st.expander(f"Settle Pending Bets ({_ledger().count(st.session_state.active_profile, result='Pending')})"):
+            _pending_labels = {int(r.id): f"{r.date:%Y-%m-%d} | {r.game} | ${r.risk:,.2f}" for r in _pending.itertuples()}
+            col_s1, col_s2, col_s3 = st.columns([3, 1, 1])
+            with col_s1:
+                settle_id = st.selectbox("Bet", list(_pending_labels), format_func=_pending_labels.get, key="settle_bet")
+            with col_s2:
+                settle_result = st.selectbox("Result", ["W", "L", "Push"], key="settle_result")
+            with col_s3:
+                settle_payout = st.number_input("Payout ($)", min_value=0.0, step=5.0, key="settle_payout")
+            if st.button("Settle Bet", key="settle_btn", use_container_width=True):
+                _ledger().settle(settle_id, settle_result, settle_payout)
+                st.rerun()
 
     # --- Leaderboard ---
     st.divider()
     st.markdown('<p class="section-label">Leaderboard</p>', unsafe_allow_html=True)
 
+    _totals = _ledger().totals()
     leaderboard_rows = []
     for pname, pcfg in PROFILE_CONFIG.items():
-        pdata = st.session_state.profiles[pname]
-        p_bets = pdata["bet_log"]
-        p_total = len(p_bets)
-        p_wins = sum(1 for b in p_bets if b.get("result") == "W")
-        p_losses = sum(1 for b in p_bets if b.get("result") == "L")
-        p_risk = sum(b["risk"] for b in p_bets)
-        p_payout = sum(b["payout"] for b in p_bets if b.get("result") in ["W", "L"])
-        p_net = p_payout - sum(b["risk"] for b in p_bets if b.get("result") in ["W", "L"])
-        p_roi = (p_net / p_risk * 100) if p_risk > 0 else 0.0
+        pdata = _profiles().get(pname)
+        agg = _totals.get(pname, {})
         leaderboard_rows.append({
             "Profile": pname,
-            "Bets": p_total,
-            "Record": f"{p_wins}-{p_losses}",
-            "Net P/L": p_net,
-            "ROI": p_roi,
+            "Bets": agg.get("bets", 0),
+            "Record": f"{agg.get('wins', 0)}-{agg.get('losses', 0)}",
+            "Net P/L": agg.get("net", 0.0),
+            "ROI": agg.get("roi", 0.0),
             "Balance": pdata["bankroll"]["balance"],
         })
     # Sort by Net P/L descending
@@ -963,33 +1162,63 @@ with tab_audit:
         st.markdown('<p class="section-label">Profile Comparison</p>', unsafe_allow_html=True)
         compare_rows = []
         for pname in PROFILE_CONFIG:
-            pdata = st.session_state.profiles[pname]
-            p_bets = pdata["bet_log"]
-            p_total = len(p_bets)
-            p_wins = sum(1 for b in p_bets if b.get("result") == "W")
-            p_losses = sum(1 for b in p_bets if b.get("result") == "L")
-            p_pending = sum(1 for b in p_bets if b.get("result") == "Pending")
-            p_risk = sum(b["risk"] for b in p_bets if b.get("result") in ["W", "L"])
-            p_payout = sum(b["payout"] for b in p_bets if b.get("result") in ["W", "L"])
-            p_net = p_payout - p_risk
-            p_roi = (p_net / p_risk * 100) if p_risk > 0 else 0.0
+            pdata = _profiles().get(pname)
+            agg = _totals.get(pname, {})
             compare_rows.append({
                 "Profile": pname,
                 "Balance": f"${pdata['bankroll']['balance']:,.2f}",
-                "Total Bets": p_total,
-                "Record": f"{p_wins}-{p_losses}",
-                "Pending": p_pending,
-                "Net P/L": f"${p_net:+,.2f}",
-                "ROI": f"{p_roi:+.1f}%",
-                "Total Risked": f"${p_risk:,.2f}",
+                "Total Bets": agg.get("bets", 0),
+                "Record": f"{agg.get('wins', 0)}-{agg.get('losses', 0)}",
+                "Pending": agg.get("pending", 0),
+                "Net P/L": f"${agg.get('net', 0.0):+,.2f}",
+                "ROI": f"{agg.get('roi', 0.0):+.1f}%",
+                "Total Risked": f"${agg.get('settled_risk', 0.0):,.2f}",
             })
         st.dataframe(pd.DataFrame(compare_rows), use_container_width=True, hide_index=True)
 
+    # --- Bankroll stress test ---
+    st.divider()
+    st.markdown('<p class="section-label">Bankroll Stress Test</p>', unsafe_allow_html=True)
+    st.markdown('<p style="color:#6B8080;font-size:13px;">100,000 simulated seasons from your grade mix, hit rates and prices: '
+                'flat units vs fractional Kelly vs the sidebar rules (5% single / 15% daily / -10% stop).</p>', unsafe_allow_html=True)
+    col_d, col_n, col_k, col_f = st.columns(4)
+    with col_d:
+        sim_days = st.number_input("Season days", min_value=10, max_value=365, value=160, step=10, key="sim_days")
+    with col_n:
+        sim_per_day = st.number_input("Bets per day", min_value=1, max_value=10, value=3, step=1, key="sim_per_day")
+    with col_k:
+        sim_kelly = st.selectbox("Kelly fraction", [0.1, 0.25, 0.5, 1.0], index=1, key="sim_kelly")
+    with col_f:
+        sim_flat = st.selectbox("Flat unit", [0.005, 0.01, 0.02, 0.05], index=1, format_func=lambda f: f"{f:.1%}", key="sim_flat")
+
+    sim_profile = st.session_state.active_profile
+    if st.button("Run 100k Seasons", key="sim_run", use_container_width=True):
+        st.session_state.sim_params = (grade_mix(_ledger().grade_stats(sim_profile)), int(sim_days), int(sim_per_day),
+                                       sim_kelly, sim_flat, sim_profile)
+    sim_params = st.session_state.get("sim_params")
+    if sim_params and sim_params[-1] == sim_profile:
+        mix, days, per_day, kelly_fraction, flat_pct, _ = sim_params
+        with st.spinner("Simulating..."), _prof().section("bankroll sim"):
+            sim = simulate(mix, days=days, per_day=per_day, kelly_fraction=kelly_fraction, flat_pct=flat_pct)
+        labels = {"Flat": f"Flat {flat_pct:.1%}", "Fractional Kelly": f"{kelly_fraction:g}x Kelly", "Current rules": "Current rules"}
+        st.dataframe(pd.DataFrame([{
+            "Plan": labels[name],
+            "Risk of Ruin (-50%)": f"{r['risk_of_ruin']:.1%}",
+            "Losing Season": f"{r['losing_season']:.1%}",
+            "Median Growth": f"{r['growth_p50']:+.1%}",
+            "5th-95th pct": f"{r['growth_p5']:+.0%} to {r['growth_p95']:+.0%}",
+            "Drawdown p50": f"{r['drawdown_p50']:.1%}",
+            "p90": f"{r['drawdown_p90']:.1%}",
+            "p99": f"{r['drawdown_p99']:.1%}",
+        } for name, r in sim["plans"].items()]), use_container_width=True, hide_index=True)
+        st.caption(" | ".join(f"{g}: {p:.1%} hit @ {d:.2f}, {s:.0%} of bets" for g, p, d, s in mix)
+                   + f" | {sim['bets']} bets/season, {sim['paths']:,} paths in {sim['elapsed_ms'] / 1000:.1f}s")
+
 
 # ============================================================
 # TAB 6: AI CHAT
 # ============================================================
-with tab_chat:
+def _render_chat():
     st.markdown("### Edge Finder AI")
     st.markdown('<p style="color:#6B8080;font-size:13px;">Ask me anything. "What\'s the play today?" | "I like the Bucks tonight" | "Run audit"</p>', unsafe_allow_html=True)
 
@@ -1025,85 +1254,6 @@ Parlay rules: Max 3 legs for value, max 4 EVER, each leg needs own edge.
 
 Set it and forget it. Place the bet, walk away. No live betting, no hedging, no cash-out panic."""
 
-    # Demo responses for common queries
-    DEMO_RESPONSES = {
-        "what's the play today": """**TONIGHT'S EDGE PLAYS**
-
-**STRAIGHT BETS (Heavy Hitter):**
-
-1. **Knicks -5.5 vs Pacers** -- Grade A | $50
-   Edge: Pacers missing Haliburton + Turner. Line hasn't adjusted enough.
-
-2. **Bucks -4 vs Heat** -- Grade B | $25
-   Edge: Heat on B2B, 3rd game in 5 nights. Fatigue not fully priced.
-
-**VALUE PARLAY ($25 to win $121):**
-- Bucks -4
-- Mavericks ML +135
-- Combined: +485
-
-**PLAYER PROP:**
-- Jokic OVER 11.5 reb -- Grade A | $25
-  Edge: Playing worst rebounding team. 2.7 rebounds of cushion.
-
-**PASS:**
-- Lakers/Celtics -- no edge, line is fair
-- Nuggets/Suns -- efficient line
-
-Total suggested risk: $125
-Expected edge plays: 3-4""",
-
-        "i like the bucks": """**DEEP DIVE: Heat @ Bucks**
-
-**THE LINE:** Bucks -4
-**ML:** MIL -185 / MIA +155
-
-**WHY MARKET MIGHT BE WRONG:**
-- Heat on B2B, 3rd game in 5 nights
-- Heat shooting 38% on B2Bs this season
-- Bucks fully rested at home
-- Fatigue not fully priced into -4
-
-**WHY MARKET MIGHT BE RIGHT:**
-- Heat covered 3 of last 5 as road dog
-- Butler historically performs on short rest
-
-**YOUR GUT:** You like the Bucks
-**DATA:** Supports your read
-
-**GUT + DATA: ALIGNMENT**
-
-**VERDICT: Grade B**
-Half unit. Edge is real but not overwhelming.
-Risk: $25 (half unit at current bankroll)""",
-
-        "run audit": """**WEEKLY AUDIT**
-
-**RECORD:** 4-2
-**NET P/L:** +$263
-**ROI:** +18.4%
-**EDGE ACCURACY:** 83%
-
-**BY TYPE:**
-| Type | W-L | P/L |
-|------|-----|-----|
-| Spreads | 2-0 | +$240 |
-| Props | 1-0 | +$90 |
-| Parlays | 0-1 | -$50 |
-| ML | 1-1 | -$17 |
-
-**PROCESS GRADE: A-**
-Edge identification was strong. Only miss was a C-grade bet that should have been a pass.
-
-**LESSON:** Grade C = pass. Stop betting them.
-
-**WHAT'S WORKING:**
-- Rest/fatigue edges (3-0)
-- Injury-based edges (2-0)
-
-**WHAT'S NOT:**
-- Parlays (0-1, variance but monitor)""",
-    }
 
     # Initialize chat
     if not _p()["chat_messages"]:
@@ -1112,10 +1262,20 @@ Edge identification was strong. Only miss was a C-grade bet that should have bee
             "content": "Edge Finder v4 online. What's the play today?\n\nI can analyze any matchup, build parlays, check player props, or run your audit. Give me a game, a gut feeling, or just ask what's worth betting tonight."
         })
 
+    if has_api:
+        _lat = _chat_timer().summary()
+        if _lat:
+            st.caption(f"AI latency, last {_lat['calls']} calls (p50): connect {_lat['connect_ms_p50']:.0f} ms | "
+                       f"TTFB {_lat['ttfb_ms_p50'] or 0:.0f} ms | first token {_lat['ttft_ms_p50'] or 0:.0f} ms | "
+                       f"total {_lat['total_ms_p50'] or 0:.0f} ms | prompt {_lat['input_tokens_p50'] or 0:.0f} tokens | "
+                       f"{_lat['reused_pct']:.0f}% pooled connections | "
+                       f"{_response_cache().stats()['hit_pct']:.0f}% cache hits")
+
     # Display messages
-    for msg in _p()["chat_messages"]:
-        with st.chat_message(msg["role"]):
-            st.markdown(msg["content"])
+    with _prof().section("history replay"):
+        for msg in _p()["chat_messages"]:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
 
     # Chat input
     if prompt := st.chat_input("Ask Edge Finder..."):
@@ -1127,36 +1287,30 @@ Edge identification was strong. Only miss was a C-grade bet that should have bee
         response = None
         if has_api:
             try:
-                from openai import AzureOpenAI
-                client = AzureOpenAI(
-                    azure_endpoint=st.secrets["AZURE_OPENAI_ENDPOINT"],
-                    api_key=st.secrets["AZURE_OPENAI_KEY"],
-                    api_version=st.secrets.get("AZURE_OPENAI_API_VERSION", "2024-06-01"),
-                )
                 deployment = st.secrets.get("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
-                messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-                for m in _p()["chat_messages"][-10:]:
-                    messages.append({"role": m["role"], "content": m["content"]})
+                messages = build_context(SYSTEM_PROMPT, _p()["chat_messages"], _p()["chat_summary"],
+                                         budget=int(os.getenv("EDGE_CHAT_CONTEXT_TOKENS", "1500")))
 
+                cache = _response_cache()
+                cache_key = cache.key(deployment, _slate_store().current().digest, messages[:-1], prompt)
+                response = cache.get(cache_key)
                 with st.chat_message("assistant"):
-                    with st.spinner("Finding edge..."):
-                        completion = client.chat.completions.create(
-                            model=deployment, messages=messages, temperature=0.7, max_tokens=1000,
-                        )
-                        response = completion.choices[0].message.content
+                    if response is not None:
                         st.markdown(response)
+                    else:
+                        response = st.write_stream(stream_chat(
+                            _openai_client(), deployment, messages, timings={"input_tokens": context_tokens(messages)},
+                            timer=_chat_timer(), temperature=0.7, max_tokens=1000,
+                        )) or None
+                        if response:
+                            cache.put(cache_key, response)
             except Exception as e:
                 response = None
 
         if response is None:
             # Demo mode fallback
-            prompt_lower = prompt.lower().strip()
-            demo_response = None
-
-            for key, val in DEMO_RESPONSES.items():
-                if key in prompt_lower:
-                    demo_response = val
-                    break
+            demo_response = demo_answer(_intent_index(), prompt, DEMO_RESPONSES,
+                                        _slate_store().current().all_games(), get_props())
 
             if demo_response is None:
                 # Generic demo response
@@ -1181,6 +1335,26 @@ Try:
             response = demo_response
 
         _p()["chat_messages"].append({"role": "assistant", "content": response})
+        _save()
+
+
+# ============================================================
+# RENDER
+# ============================================================
+SECTIONS = dict(zip(SECTION_NAMES, [_render_slate, _render_edge, _render_parlay,
+                                    _render_props, _render_audit, _render_chat]))
+
+if _render_mode() == "tabs":
+    for _tab, _render in zip(st.tabs(SECTION_NAMES), SECTIONS.values()):
+        _name = _render.__name__.removeprefix("_render_")
+        with _tab, timed("rerun", _name), _prof().section(_name):
+            _render()
+else:
+    _section = st.radio("Section", SECTION_NAMES, horizontal=True, key="nav_section", label_visibility="collapsed")
+    _name = SECTIONS[_section].__name__.removeprefix("_render_")
+    _prof().label = _name
+    with timed("rerun", _name), _prof().section(_name):
+        SECTIONS[_section]()
 
 
 # --- Footer ---
@@ -1190,3 +1364,21 @@ st.markdown(f"""
     Built with Sinton.ia | {datetime.now().strftime("%Y")}
 </div>
 """, unsafe_allow_html=True)
+
+observe("rerun", "total", time.perf_counter() - _RERUN_T0)
+
+# --- Rerun profile panel ---
+if _prof().enabled:
+    _report = _prof().finish()
+    _runs = _record_profile(_report)
+    with st.sidebar:
+        st.divider()
+        st.markdown('<p class="section-label">Rerun Profile</p>', unsafe_allow_html=True)
+        st.caption(f"{_report['label'] or 'tabs'} | {_report['total_ms']:.1f} ms total | run {len(_runs)}"
+                   + (f" | {_report['note']}" if "note" in _report else ""))
+        st.dataframe(pd.DataFrame(_report["sections"], columns=["name", "ms", "calls", "pct"]),
+                     use_container_width=True, hide_index=True)
+        if _report.get("functions"):
+            st.dataframe(pd.DataFrame(_report["functions"]), use_container_width=True, hide_index=True)
+        st.download_button("Download profile JSON", dump_profiles(_runs), file_name="edge-finder-profile.json",
+                           mime="application/json", key="profile_download")
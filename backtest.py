@@ -0,0 +1,235 @@
+"""
+Edge Finder v4 -- Backtester
+Replays historical slates through the grading engine and a staking plan, and sweeps grids of
+grade cutoffs, unit sizes, minimum grade and parlay leg limits. Each configuration reports ROI,
+closing line value (CLV), max drawdown and ROI by grade.
+
+History is JSONL, one slate per line:
+
+    {"date": "2025-11-04", "games": [{...slate game with "features"..., "close": {"ml_away": "+140",
+     "ml_home": "-160"}, "winner": "home"}, ...]}
+
+Bets are the moneyline on the side each analysis backs -- the only market the history prices on
+both ends. Games are scored once into flat NumPy columns; a configuration only re-cuts grades and
+stakes, so one grid point is a handful of array passes. Grid points fan out over a process pool;
+the columns go to each worker once, through the pool initializer, not with every task.
+
+    python backtest.py [--history season.jsonl] [--workers N] [--top 15] [--out sweep.json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from grading import GAME_DEFAULTS, GRADE_CUTOFFS, game_frame, game_grades, grade_games
+from optimizer import GRADE_ORDER, grade_at_least
+from pricing import american_to_decimal, implied_probability, parse_american
+
+# Units per grade. "action_map" is the Edge Analysis verdicts: full unit on A down to a small bet on C.
+STAKING_PLANS = {
+    "action_map": {"A": 1.0, "B+": 0.75, "B": 0.5, "B-": 0.25, "C": 0.25},
+    "flat": {"A": 1.0, "B+": 1.0, "B": 1.0, "B-": 1.0, "C": 1.0},
+    "top_heavy": {"A": 2.0, "B+": 1.0, "B": 0.5, "B-": 0.25, "C": 0.0},
+}
+CUTOFF_SHIFTS = (-0.5, 0.0, 0.5, 1.0)   # added to every GRADE_CUTOFFS score
+MIN_GRADES = ("B+", "B", "B-", "C")
+LEG_LIMITS = (0, 2, 3, 4)               # 0 = straights only
+PARLAY_MIN_GRADE = "B+"
+PARLAY_UNIT = 0.5
+
+
+# --- History ---
+def load_history(path):
+    with open(path) as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _american(prob):
+    return f"{-100 * prob / (1 - prob):+.0f}" if prob >= 0.5 else f"{100 * (1 - prob) / prob:+.0f}"
+
+
+def synthetic_history(days=160, games_per_day=12, seed=0):
+    """A season of random slates where the graded features carry a small, noisy real edge."""
+    rng = random.Random(seed)
+    history = []
+    for d in range(days):
+        games = []
+        for i in range(games_per_day):
+            side = rng.choice(("home", "away"))
+            feats = {"side": side, "b2b_opp": rng.random() < 0.15, "rest_adv": rng.choice((-1, 0, 0, 0, 1, 2)),
+                     "injuries_opp": rng.choice((0, 0, 0, 1, 2)), "injuries_own": rng.choice((0, 0, 0, 0, 1)),
+                     "public_pct": rng.uniform(25, 80)}
+            fair = rng.uniform(0.3, 0.75)             # market's no-vig view of the backed side
+            if rng.random() < 0.4:
+                feats["model_prob"] = min(max(fair + rng.gauss(0.01, 0.04), 0.05), 0.95)
+            true = fair + 0.012 * (1.5 * feats["b2b_opp"] + 0.5 * feats["rest_adv"] + 1.25 * feats["injuries_opp"]
+                                   - feats["injuries_own"]) + 0.5 * (feats.get("model_prob", fair) - fair)
+            true = min(max(true + rng.gauss(0, 0.01), 0.05), 0.95)
+            close = fair + 0.5 * (true - fair) + rng.gauss(0, 0.01)
+            vig = 0.024
+            open_side, open_other = _american(fair + vig), _american(1 - fair + vig)
+            close_side, close_other = _american(close + vig), _american(1 - close + vig)
+            home = side == "home"
+            games.append({
+                "sport": ("NBA", "NHL")[i % 2], "away": f"Away{d}_{i}", "home": f"Home{d}_{i}",
+                "ml_home": open_side if home else open_other, "ml_away": open_other if home else open_side,
+                "close": {"ml_home": close_side if home else close_other, "ml_away": close_other if home else close_side},
+                "winner": side if rng.random() < true else ("away" if home else "home"),
+                "features": feats,
+            })
+        history.append({"date": f"day{d:03d}", "games": games})
+    return history
+
+
+def build_table(history):
+    """Flat, read-only columns for every graded game: day, score, red flag, value, open / close price, result."""
+    games, days = [], []
+    for d, slate in enumerate(history):
+        for g in slate["games"]:
+            if "features" in g and g.get("winner") in ("home", "away"):
+                games.append(g)
+                days.append(d)
+    df = grade_games(game_frame(games))
+    sides = [(g["features"].get("side") or GAME_DEFAULTS["side"]) for g in games]
+    close = [parse_american((g.get("close") or g).get(f"ml_{s}", "")) for g, s in zip(games, sides)]
+    return {
+        "day": np.asarray(days, dtype=np.int32),
+        "score": df["score"].to_numpy(dtype=np.float64),
+        "red_flag": (df["heavy_fav"] | df["consensus"]).to_numpy(dtype=bool),
+        "value": df["value"].to_numpy(dtype=np.float64),
+        "dec_open": american_to_decimal(df["price"].to_numpy()),
+        "p_close": implied_probability(np.asarray(close)),
+        "p_open": implied_probability(df["price"].to_numpy()),
+        "won": np.array([g["winner"] == s for g, s in zip(games, sides)]),
+        "days": len(history),
+    }
+
+
+# --- One configuration ---
+def grid(cutoff_shifts=CUTOFF_SHIFTS, plans=tuple(STAKING_PLANS), min_grades=MIN_GRADES, leg_limits=LEG_LIMITS):
+    return [{"cutoff_shift": s, "plan": p, "min_grade": m, "max_legs": k}
+            for s, p, m, k in itertools.product(cutoff_shifts, plans, min_grades, leg_limits)]
+
+
+def _parlays(t, grades, max_legs):
+    """Each day: the top `max_legs` legs by score at PARLAY_MIN_GRADE or better, one parlay if >= 2 qualify.
+    Returns (day, decimal, won) arrays, one row per parlay."""
+    ok = np.isin(grades, [g for g in GRADE_ORDER if grade_at_least(g, PARLAY_MIN_GRADE)])
+    if max_legs < 2 or not ok.any():
+        return np.empty(0, np.int32), np.empty(0), np.empty(0, bool)
+    idx = np.flatnonzero(ok)
+    idx = idx[np.lexsort((-t["score"][idx], t["day"][idx]))]
+    day = t["day"][idx]
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    rank = np.arange(len(idx)) - np.repeat(starts, np.diff(np.r_[starts, len(idx)]))
+    keep = rank < max_legs
+    idx, day = idx[keep], day[keep]
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    n_legs = np.diff(np.r_[starts, len(idx)])
+    decimal = np.exp(np.add.reduceat(np.log(t["dec_open"][idx]), starts))
+    won = np.minimum.reduceat(t["won"][idx].astype(np.int8), starts).astype(bool)
+    real = n_legs >= 2
+    return day[starts][real], decimal[real], won[real]
+
+
+def evaluate(t, config):
+    """ROI, CLV, drawdown and per-grade ROI for one configuration over the table."""
+    cutoffs = [(g, cut + config["cutoff_shift"]) for g, cut in GRADE_CUTOFFS]
+    grades = game_grades(t["score"], t["red_flag"], t["value"], cutoffs)
+    units = STAKING_PLANS[config["plan"]]
+    allowed = [g for g in GRADE_ORDER if grade_at_least(g, config["min_grade"])]
+    stake = np.select([grades == g for g in allowed], [units.get(g, 0.0) for g in allowed], default=0.0)
+    pl = np.where(t["won"], stake * (t["dec_open"] - 1.0), -stake)
+
+    p_day, p_dec, p_won = _parlays(t, grades, config["max_legs"])
+    p_pl = np.where(p_won, PARLAY_UNIT * (p_dec - 1.0), -PARLAY_UNIT)
+
+    staked = stake.sum() + PARLAY_UNIT * len(p_day)
+    profit = pl.sum() + p_pl.sum()
+    daily = np.bincount(t["day"], weights=pl, minlength=t["days"]) + np.bincount(p_day, weights=p_pl, minlength=t["days"])
+    curve = np.cumsum(daily)
+    drawdown = float(np.max(np.maximum.accumulate(np.r_[0.0, curve]) - np.r_[0.0, curve]))
+    bet = stake > 0
+    by_grade = {}
+    for g in GRADE_ORDER:
+        sel = grades == g
+        if sel.any():
+            # Flat one-unit ROI for every game that earned the grade, bet or not -- what the grade is worth.
+            flat = np.where(t["won"][sel], t["dec_open"][sel] - 1.0, -1.0)
+            by_grade[g] = {"games": int(sel.sum()), "roi": float(flat.mean())}
+    return dict(config, **{
+        "bets": int(bet.sum()), "parlays": int(len(p_day)), "staked": round(float(staked), 2),
+        "profit": round(float(profit), 2), "roi": float(profit / staked) if staked else 0.0,
+        "hit_rate": float(t["won"][bet].mean()) if bet.any() else 0.0,
+        # CLV: how much the backed side's implied probability rose by the close, stake-weighted.
+        "clv": float(np.average(t["p_close"][bet] - t["p_open"][bet], weights=stake[bet])) if bet.any() else 0.0,
+        "max_drawdown": round(drawdown, 2),
+        "by_grade": by_grade,
+    })
+
+
+# --- Sweep ---
+_TABLE = None
+
+
+def _init(table):
+    global _TABLE
+    _TABLE = table
+
+
+def _evaluate_shared(config):
+    return evaluate(_TABLE, config)
+
+
+def sweep(table, configs, workers=None):
+    """evaluate() every config, best ROI first. workers: None = all cores, 1 = in-process."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(configs) < 2:
+        results = [evaluate(table, c) for c in configs]
+    else:
+        chunksize = max(1, len(configs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(table,)) as pool:
+            results = list(pool.map(_evaluate_shared, configs, chunksize=chunksize))
+    return sorted(results, key=lambda r: r["roi"], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--history", help="JSONL slates with closing prices and winners (default: a synthetic season)")
+    parser.add_argument("--days", type=int, default=160, help="synthetic season length")
+    parser.add_argument("--games", type=int, default=12, help="synthetic games per day")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--out", help="write every result as JSON here")
+    args = parser.parse_args()
+
+    history = load_history(args.history) if args.history else synthetic_history(args.days, args.games)
+    t0 = time.perf_counter()
+    table = build_table(history)
+    configs = grid()
+    t1 = time.perf_counter()
+    results = sweep(table, configs, args.workers)
+    t2 = time.perf_counter()
+    print(f"{len(table['won'])} graded games over {table['days']} slates, scored in {(t1 - t0) * 1000:.0f} ms; "
+          f"{len(configs)} configs in {t2 - t1:.2f} s ({args.workers or os.cpu_count()} workers)")
+    print(f"{'shift':>6} {'plan':<11} {'min':<4} {'legs':>4} {'bets':>6} {'parl':>5} {'ROI':>7} {'CLV':>7} {'maxDD':>7}")
+    for r in results[:args.top]:
+        print(f"{r['cutoff_shift']:>+6.1f} {r['plan']:<11} {r['min_grade']:<4} {r['max_legs']:>4} {r['bets']:>6} "
+              f"{r['parlays']:>5} {r['roi']:>+7.1%} {r['clv']:>+7.2%} {r['max_drawdown']:>7.1f}")
+    base = next(r for r in results if r["cutoff_shift"] == 0 and r["plan"] == "action_map" and r["min_grade"] == "C"
+                and r["max_legs"] == 0)
+    print("flat-unit ROI by grade (current cutoffs): "
+          + ", ".join(f"{g} {v['roi']:+.1%} ({v['games']})" for g, v in base["by_grade"].items()))
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=1)
+
+
+if __name__ == "__main__":
+    main()
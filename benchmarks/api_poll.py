@@ -0,0 +1,55 @@
+"""
+Slate API polling cost in-process (TestClient): first fetch, cached 200, and 304 revalidation,
+plus the bytes each one puts on the wire.
+
+    python benchmarks/api_poll.py [--requests 500]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # server mounts ./static
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+def timed(client, n, path, headers):
+    ms, size = [], 0
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = client.get(path, headers=headers)
+        ms.append((time.perf_counter() - t0) * 1000)
+        size = int(r.headers.get("content-length", len(r.content)))
+    return statistics.median(ms), size, r.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    client = TestClient(server.app)
+    path = "/api/v1/slate/nba"
+    t0 = time.perf_counter()
+    first = client.get(path, headers={"Accept-Encoding": "br, gzip"})
+    print(f"first fetch (encode + compress): {(time.perf_counter() - t0) * 1000:.2f} ms")
+    etag = first.headers["etag"]
+
+    rows = [("cached 200, identity", {"Accept-Encoding": "identity"}),
+            ("cached 200, gzip", {"Accept-Encoding": "gzip"}),
+            ("cached 200, br", {"Accept-Encoding": "br"}),
+            ("304 revalidation", {"Accept-Encoding": "br", "If-None-Match": etag})]
+    for label, headers in rows:
+        p50, size, status = timed(client, args.requests, path, headers)
+        print(f"{label:<22} {status}  p50 {p50:.3f} ms  body {size} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Rerun latency suite: drives app.py headlessly with Streamlit's AppTest through typical
+interactions at synthetic data sizes and reports p50 / p95 rerun time and the worker's peak RSS.
+
+Bets go into a pre-filled SQLite ledger. Each (bets, games) size runs in a fresh worker
+process with EDGE_LEDGER_PATH pointing at it, which also gives a per-size max RSS. The
+worker appends games and props to the demo slate in place before the first run (AppTest
+runs the script in-process, so the app sees them).
+
+    python benchmarks/app_suite.py [--bets 10,1000,100000,1000000] [--games 10,100,1000] [--runs 15]
+                                   [--save benchmarks/baseline.json] [--compare benchmarks/baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import demo_data  # noqa: E402
+from feeds import synthetic_matchups  # noqa: E402
+from ledger import Ledger  # noqa: E402
+from teams import TEAM_CODES  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+SLATE_LISTS = {"NBA": demo_data.DEMO_NBA_GAMES, "NHL": demo_data.DEMO_NHL_GAMES}
+PROFILES = ["Peter", "Chinny"]
+GRADES = ["A", "B+", "B", "C", "D"]
+BATCH = 50_000
+RESULT = "RESULT "  # marks the worker's JSON line on stdout
+
+
+# --- Synthetic data ---
+def fill_ledger(path, n):
+    ledger = Ledger(path)
+    for start in range(0, n, BATCH):
+        rows = [{"date": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}", "game": f"Team{i % 97} -{i % 9}.5",
+                 "type": "Spread", "grade": GRADES[i % 5], "risk": 25.0,
+                 "result": ("W", "L", "Pending")[i % 3], "payout": 47.5 if i % 3 == 0 else 0.0}
+                for i in range(start, min(start + BATCH, n))]
+        ledger.append_many(PROFILES[start // BATCH % 2], rows)
+    ledger.close()
+
+
+def synthetic_games(n, sport):
+    # Real teams and codes, favourites on both sides, so line history reads every spread as a home line.
+    return [{"away": away, "home": home, "spread": f"{TEAM_CODES[sport][(away, home)[i % 2]][0]} -{i % 9}.5",
+             "total": "220", "ml_away": "+150", "ml_home": "-170", "time": "7:30 PM ET", "edge": "C",
+             "edge_reason": "Synthetic.", "why_wrong": "Synthetic.", "why_right": "Synthetic.", "gut_data": "neutral",
+             "features": {"side": "home", "rest_adv": i % 3, "public_pct": 40 + i % 30}}
+            for i, (_, away, home) in enumerate(synthetic_matchups(n, (sport,)))]
+
+
+def synthetic_props(n):
+    return [{"player": f"Player {i}", "sport": "NBA", "team": f"Team{i % 30}", "prop": "Points", "line": "O/U 20.5",
+             "edge": "C", "reason": "Synthetic.", "recommendation": "Pass.", "matchup": "vs Team",
+             "features": {"avg": 18 + i % 8, "line": 20.5, "opp_rank": 1 + i % 30}} for i in range(n)]
+
+
+def grow_slate(n):
+    """Pad the demo games (per sport) and props to `n` each."""
+    for sport, games in SLATE_LISTS.items():
+        games.extend(synthetic_games(max(n - len(games), 0), sport))
+    demo_data.DEMO_PROPS.extend(synthetic_props(max(n - len(demo_data.DEMO_PROPS), 0)))
+
+
+# --- Interactions ---
+def _nav(at, name):
+    at.radio(key="nav_section").set_value(name).run()
+
+
+def switch_profile(at, i):
+    at.sidebar.radio(key="profile_selector").set_value(PROFILES[(i + 1) % 2])
+
+
+def slate_sport(at, i):
+    at.selectbox(key="slate_sport").set_value(("NHL", "NBA")[i % 2])
+
+
+def add_leg(at, i):
+    if i % 4 == 3:
+        at.button(key="clear_legs").click()
+    else:
+        at.button(key="add_leg").click()
+
+
+def log_bet(at, i):
+    [t for t in at.text_input if t.label == "Game / Bet"][0].input(f"Bench bet {i}")
+    [n for n in at.number_input if n.label == "Risk ($)"][0].set_value(25.0)
+    [b for b in at.button if b.label == "Log Bet"][0].click()
+
+
+def prop_search(at, i):
+    at.text_input(key="prop_search").input(("player 1", "jok", "")[i % 3])
+
+
+def chat_demo(at, i):
+    at.chat_input[0].set_value(("what's the play today", "I like the Bucks", "run audit")[i % 3])
+
+
+# name -> (section to open first, action that stages one widget change)
+SCENARIOS = {
+    "switch_profile": ("Tonight's Slate", switch_profile),
+    "slate_sport": ("Tonight's Slate", slate_sport),
+    "add_parlay_leg": ("Parlay Builder", add_leg),
+    "prop_search": ("Player Props", prop_search),
+    "log_bet": ("My Audit", log_bet),
+    "chat_demo": ("AI Chat", chat_demo),
+}
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def run_scenario(name, runs):
+    section, action = SCENARIOS[name]
+    at = AppTest.from_file(APP, default_timeout=600)
+    t0 = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - t0) * 1000
+    _nav(at, section)
+    times = []
+    for i in range(runs):
+        action(at, i)
+        t0 = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception}")
+    return {"first_run_ms": round(first_ms, 1), "p50_ms": round(statistics.median(times), 1),
+            "p95_ms": round(_pct(times, 0.95), 1)}
+
+
+def worker(bets, games, runs, scenarios):
+    """One size, in this process: results as one JSON line on stdout."""
+    grow_slate(games)
+    results = []
+    for name in scenarios:
+        res = run_scenario(name, runs)
+        rss = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # worker high-water mark so far
+        results.append(dict(scenario=name, bets=bets, games=games, max_rss_mb=rss, **res))
+    print(RESULT + json.dumps(results))
+
+
+def run_size(bets, games, runs, scenarios, ledger_path):
+    env = dict(os.environ, EDGE_LEDGER_PATH=ledger_path,
+               EDGE_PROFILES_PATH=os.path.join(os.path.dirname(ledger_path), f"profiles_{bets}_{games}.db"))
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", "--bets", str(bets), "--games", str(games),
+           "--runs", str(runs), "--scenarios", ",".join(scenarios)]
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    line = next((ln for ln in proc.stdout.splitlines() if ln.startswith(RESULT)), None)
+    if proc.returncode or line is None:
+        raise RuntimeError(f"worker bets={bets} games={games} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(line[len(RESULT):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bets", default="10,1000,100000,1000000", help="comma-separated ledger sizes")
+    parser.add_argument("--games", default="10,100,1000", help="comma-separated games (per sport) / props sizes")
+    parser.add_argument("--runs", type=int, default=15, help="measured reruns per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--save", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline JSON to diff p50 / p95 against")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    bet_sizes = [int(x) for x in args.bets.split(",")]
+    game_sizes = [int(x) for x in args.games.split(",")]
+    scenarios = args.scenarios.split(",")
+    if args.worker:
+        return worker(bet_sizes[0], game_sizes[0], args.runs, scenarios)
+    tmp = tempfile.mkdtemp()
+    results = []
+
+    # Bets vary with the smallest slate; slate sizes vary with the smallest ledger.
+    combos = [(b, game_sizes[0]) for b in bet_sizes] + [(bet_sizes[0], g) for g in game_sizes[1:]]
+    ledgers = {}
+    for bets, games in combos:
+        if bets not in ledgers:
+            t0 = time.perf_counter()
+            ledgers[bets] = os.path.join(tmp, f"ledger_{bets}.db")
+            fill_ledger(ledgers[bets], bets)
+            print(f"ledger with {bets:,} bets filled in {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+        for r in run_size(bets, games, args.runs, scenarios, ledgers[bets]):
+            results.append(r)
+            print(f"{r['scenario']:<15} bets={bets:>9,} games={games:>5}  p50 {r['p50_ms']:>8.1f} ms  "
+                  f"p95 {r['p95_ms']:>8.1f} ms  first {r['first_run_ms']:>8.1f} ms  rss {r['max_rss_mb']:>7.1f} MB")
+
+    out = {"python": platform.python_version(), "streamlit": st.__version__, "runs": args.runs, "results": results}
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(out, fh, indent=1)
+        print(f"saved {args.save}")
+    if args.compare:
+        with open(args.compare) as fh:
+            base = {(r["scenario"], r["bets"], r["games"]): r for r in json.load(fh)["results"]}
+        print(f"\nvs {args.compare}")
+        for r in results:
+            b = base.get((r["scenario"], r["bets"], r["games"]))
+            if b:
+                print(f"{r['scenario']:<15} bets={r['bets']:>9,} games={r['games']:>5}  "
+                      f"p50 {r['p50_ms'] / b['p50_ms'] - 1:+7.1%}  p95 {r['p95_ms'] / b['p95_ms'] - 1:+7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Backtest sweep: one process vs a process pool over a fine parameter grid on a synthetic season.
+Results must match exactly; only the wall time should change.
+
+    python benchmarks/backtest_sweep.py [--days 160] [--games 24] [--shifts 41] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from backtest import build_table, grid, sweep, synthetic_history  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=160)
+    parser.add_argument("--games", type=int, default=24)
+    parser.add_argument("--shifts", type=int, default=41, help="cutoff shifts from -1 to +1")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    table = build_table(synthetic_history(args.days, args.games))
+    configs = grid(cutoff_shifts=tuple(np.round(np.linspace(-1, 1, args.shifts), 3)))
+    print(f"{len(table['won'])} graded games, {len(configs)} configs")
+
+    timings = {}
+    for workers in sorted({1, args.workers}):
+        t0 = time.perf_counter()
+        results = sweep(table, configs, workers)
+        timings[workers] = (time.perf_counter() - t0, results)
+        print(f"workers={workers:<3} {timings[workers][0]:>7.2f} s  ({len(configs) / timings[workers][0]:,.0f} configs/s)")
+    if len(timings) > 1:
+        same = timings[1][1] == timings[args.workers][1]
+        print(f"speedup x{timings[1][0] / timings[args.workers][0]:.1f}, results identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
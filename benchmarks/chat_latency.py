@@ -0,0 +1,85 @@
+"""
+Chat latency against the local OpenAI stub.
+1. Blocking vs streamed completion: what the user waits for before anything renders
+   (blocking: the whole reply, streaming: the first token) and total time.
+2. A new AzureOpenAI client per message vs the shared pooled client, under concurrent users.
+
+    python benchmarks/chat_latency.py [--runs 10] [--users 8] [--ttft-ms 400] [--token-ms 15]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from openai import AzureOpenAI  # noqa: E402
+
+from chat import CallTimer, make_client, stream_chat  # noqa: E402
+from stubs.openai_server import StubConfig, serve  # noqa: E402
+
+MESSAGES = [{"role": "system", "content": "You are Edge Finder v4."},
+            {"role": "user", "content": "What's the play today?"}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--users", type=int, default=8, help="concurrent sessions for the pooling comparison")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--ttft-ms", type=float, default=400.0)
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, StubConfig(args.ttft_ms, args.token_ms))
+    client = AzureOpenAI(azure_endpoint=f"http://127.0.0.1:{args.port}", api_key="stub", api_version="2024-06-01")
+
+    blocking, first, total = [], [], []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        client.chat.completions.create(model="gpt-4o", messages=MESSAGES, max_tokens=1000)
+        blocking.append((time.perf_counter() - t0) * 1000)
+
+        timings = {}
+        "".join(stream_chat(client, "gpt-4o", MESSAGES, timings=timings, max_tokens=1000))
+        first.append(timings["ttft_ms"])
+        total.append(timings["total_ms"])
+
+    print(f"{'':<22} {'p50 ms':>8} {'max ms':>8}")
+    print(f"{'blocking, first paint':<22} {statistics.median(blocking):>8.0f} {max(blocking):>8.0f}")
+    print(f"{'streaming, first token':<22} {statistics.median(first):>8.0f} {max(first):>8.0f}")
+    print(f"{'streaming, total':<22} {statistics.median(total):>8.0f} {max(total):>8.0f}")
+
+    endpoint = f"http://127.0.0.1:{args.port}"
+    timer = CallTimer()
+    pooled = make_client(endpoint, "stub", "2024-06-01", timer=timer)
+
+    def per_message():
+        # What the chat tab used to do on every submit.
+        t0 = time.perf_counter()
+        c = AzureOpenAI(azure_endpoint=endpoint, api_key="stub", api_version="2024-06-01")
+        timings = {}
+        "".join(stream_chat(c, "gpt-4o", MESSAGES, timings=timings, max_tokens=1000))
+        c.close()
+        return (time.perf_counter() - t0) * 1000 - (timings["total_ms"] - timings["ttft_ms"])
+
+    def shared():
+        timings = {}
+        "".join(stream_chat(pooled, "gpt-4o", MESSAGES, timings=timings, timer=timer, max_tokens=1000))
+        return timings["ttft_ms"]
+
+    print(f"\n{args.users} concurrent users x {args.runs} messages, time to first token")
+    for label, fn in (("client per message", per_message), ("pooled client", shared)):
+        with ThreadPoolExecutor(args.users) as pool:
+            ttft = list(pool.map(lambda _: fn(), range(args.users * args.runs)))
+        print(f"{label:<22} p50 {statistics.median(ttft):>6.0f} ms  max {max(ttft):>6.0f} ms")
+    s = timer.summary()
+    print(f"pooled: {s['reused_pct']:.0f}% of calls reused a keep-alive connection, "
+          f"TTFB p50 {s['ttfb_ms_p50']:.0f} ms")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
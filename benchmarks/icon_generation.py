@@ -0,0 +1,67 @@
+"""
+Icon generation against the local image stub: the old one-at-a-time loop with a fixed 12 s
+sleep (estimated, not slept) vs the async generator under the stub's rate limit, then a rerun
+that the manifest turns into a no-op and a resume after some outputs were lost.
+
+    python benchmarks/icon_generation.py [--images 40] [--rpm 120] [--gen-ms 800] [--fail-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from generate_icons import generate_all  # noqa: E402
+from stubs.image_server import StubConfig, serve  # noqa: E402
+
+OLD_SLEEP = 12.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=40)
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--rpm", type=float, default=120.0, help="stub rate limit; the client bucket runs 10%% under")
+    parser.add_argument("--gen-ms", type=float, default=800.0)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server, cfg = serve(args.port, StubConfig(args.gen_ms, args.rpm, args.fail_rate))
+    endpoint = f"http://127.0.0.1:{args.port}"
+    images = [{"filename": f"asset-{i:03d}.png", "size": "1024x1024", "prompt": f"Edge Finder asset {i}"}
+              for i in range(args.images)]
+    out = tempfile.mkdtemp(prefix="icons-")
+
+    def run():
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = asyncio.run(generate_all(images, out, endpoint, rpm=args.rpm * 0.9, burst=2,
+                                              concurrency=args.concurrency))
+        return time.perf_counter() - t0, result
+
+    first, result = run()
+    print(f"{args.images} images, stub at {args.rpm:.0f} rpm, {args.gen_ms:.0f} ms/image, {args.fail_rate:.0%} 500s")
+    print(f"old loop {args.images * (args.gen_ms / 1000 + OLD_SLEEP) - OLD_SLEEP:>8.1f} s  (estimated: "
+          f"{args.gen_ms:.0f} ms + {OLD_SLEEP:.0f} s sleep per image, first error aborts)")
+    print(f"async    {first:>8.1f} s  (rate-limit floor {(args.images - 1) * 60.0 / args.rpm:.1f} s; "
+          f"{result['generated']} generated, {len(result['failed'])} failed; stub saw {cfg.requests} requests, "
+          f"{cfg.throttled} throttled, {cfg.failed} 500s)")
+    again, result = run()
+    print(f"rerun    {again:>8.2f} s  ({result['skipped']} skipped by the manifest)")
+    lost = sorted(name for name in os.listdir(out) if name.endswith(".png"))[: max(args.images // 10, 1)]
+    for name in lost:
+        os.remove(os.path.join(out, name))
+    resume, result = run()
+    print(f"resume   {resume:>8.1f} s  ({result['generated']} lost outputs regenerated, {result['skipped']} skipped)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
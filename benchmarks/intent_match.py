@@ -0,0 +1,79 @@
+"""
+Demo-mode intent lookup: linear `key in prompt` scan vs the Aho-Corasick / trigram index.
+The library is the canned answers plus a synthetic slate of templated team and player intents.
+
+    python benchmarks/intent_match.py [--games 1000] [--players 1000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from chat import normalize_prompt  # noqa: E402
+from demo_data import DEMO_PARAPHRASES, DEMO_RESPONSES  # noqa: E402
+from intents import build_index  # noqa: E402
+
+SYLLABLES = ["ka", "ro", "mi", "ten", "vas", "lor", "qui", "den", "sha", "bel", "tor", "nix", "pa", "zu"]
+
+
+def name(rng, parts=3):
+    return "".join(rng.choice(SYLLABLES) for _ in range(parts)).capitalize()
+
+
+def library(n_games, n_players, rng):
+    games = [{"sport": "NBA", "away": name(rng), "home": name(rng)} for _ in range(n_games)]
+    props = [{"player": f"{name(rng, 2)} {name(rng)}", "prop": rng.choice(["Points", "Rebounds", "Assists"])}
+             for _ in range(n_players)]
+    return games, props
+
+
+def linear_table(games, props):
+    """What the old fallback would need: every phrase -> intent, scanned in order."""
+    table = [(normalize_prompt(p), ("canned", k)) for k in DEMO_RESPONSES for p in [k, *DEMO_PARAPHRASES.get(k, ())]]
+    table += [(normalize_prompt(t), ("game", g["away"])) for g in games for t in (g["away"], g["home"])]
+    table += [(normalize_prompt(p["player"]), ("prop", p["player"])) for p in props]
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    games, props = library(args.games, args.players, rng)
+
+    t0 = time.perf_counter()
+    idx = build_index(DEMO_RESPONSES, DEMO_PARAPHRASES, games, props)
+    build_ms = (time.perf_counter() - t0) * 1000
+    table = linear_table(games, props)
+
+    templates = ["I like the {} tonight", "what about {}?", "{} points?", "run audit", "what's the play today",
+                 "anything on the {} game", "no idea what to bet"]
+    entities = [g["home"] for g in games] + [p["player"] for p in props]
+    queries = [rng.choice(templates).format(rng.choice(entities)) for _ in range(args.queries)]
+
+    lin, ac = [], []
+    for q in queries:
+        t = time.perf_counter()
+        text = normalize_prompt(q)
+        next((intent for phrase, intent in table if phrase in text), None)
+        lin.append((time.perf_counter() - t) * 1e6)
+        t = time.perf_counter()
+        idx.match(q)
+        ac.append((time.perf_counter() - t) * 1e6)
+
+    print(f"library: {idx.phrases} phrases ({args.games} games, {args.players} players), index built in {build_ms:.0f} ms")
+    print(f"linear scan:  p50 {statistics.median(lin):>8.1f} us  max {max(lin):>8.1f} us")
+    print(f"intent index: p50 {statistics.median(ac):>8.1f} us  max {max(ac):>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
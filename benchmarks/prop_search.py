@@ -0,0 +1,98 @@
+"""
+Player prop search: the old substring scan + sport pass vs the trigram / facet-bitmap index.
+The board is synthetic players with ~11 props each; queries are prefixes, misspellings, team
+and prop-type words, with and without a sport filter. Also times an incremental sync().
+
+    python benchmarks/prop_search.py [--players 1000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from propsearch import PropIndex  # noqa: E402
+
+SYLLABLES = ["ka", "ro", "mi", "ten", "vas", "lor", "qui", "den", "sha", "bel", "tor", "nix", "pa", "zu", "gra", "fen",
+             "mo", "rick", "son", "ley", "dra", "vic", "bru", "hal", "ton", "jo", "kic", "mur", "ray", "gil", "ber", "wes"]
+PROP_TYPES = ["Points", "Rebounds", "Assists", "PRA", "Threes", "Steals", "Blocks", "Shots on Goal", "Saves",
+              "Goals", "Hits", "Turnovers"]
+
+
+def name(rng, parts=3):
+    return "".join(rng.choice(SYLLABLES) for _ in range(parts)).capitalize()
+
+
+def board(n_players, rng):
+    teams = [name(rng) + "s" for _ in range(60)]
+    props = []
+    for _ in range(n_players):
+        player, sport, team = f"{name(rng, 2)} {name(rng)}", rng.choice(["NBA", "NHL"]), rng.choice(teams)
+        for prop in rng.sample(PROP_TYPES, 11):
+            props.append({"player": player, "sport": sport, "team": team, "prop": prop, "line": "O/U 1.5",
+                          "edge": rng.choice("ABCD")})
+    return props
+
+
+def typo(word, rng):
+    i = rng.randrange(1, len(word))
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+
+def linear(props, search, sport_filter):
+    """The Player Props tab before the index."""
+    if search:
+        props = [p for p in props if search.lower() in p["player"].lower()]
+    if sport_filter != "All":
+        props = [p for p in props if p["sport"] == sport_filter]
+    return props
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    props = board(args.players, rng)
+    t0 = time.perf_counter()
+    index = PropIndex(props)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    queries = []
+    for _ in range(args.queries):
+        p = rng.choice(props)
+        last = p["player"].split()[-1]
+        q = rng.choice([last[:3], last, typo(last, rng), p["team"], f"{last} {p['prop']}"])
+        queries.append((q, rng.choice(["All", "All", "NBA", "NHL"])))
+
+    lin, idx, found = [], [], 0
+    for q, sport in queries:
+        t = time.perf_counter()
+        linear(props, q, sport)
+        lin.append((time.perf_counter() - t) * 1e6)
+        t = time.perf_counter()
+        found += bool(index.search(q, limit=50, sport=sport))
+        idx.append((time.perf_counter() - t) * 1e6)
+
+    # A board refresh: 2% of grades move, 1% of props come and go.
+    fresh = [dict(p, edge=rng.choice("ABCD")) if rng.random() < 0.02 else p for p in props if rng.random() > 0.01]
+    fresh += board(args.players // 100 or 1, rng)
+    t0 = time.perf_counter()
+    changes = index.sync(fresh)
+    sync_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"board: {len(props)} props ({args.players} players), index built in {build_ms:.0f} ms")
+    print(f"substring scan: p50 {statistics.median(lin):>8.1f} us  max {max(lin):>8.1f} us  (exact substrings only)")
+    print(f"prop index:     p50 {statistics.median(idx):>8.1f} us  max {max(idx):>8.1f} us  "
+          f"({found}/{len(queries)} queries with hits, typos included)")
+    print(f"sync: {changes} in {sync_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Rerun latency: classic st.tabs (every tab body runs) vs lazy sections (active one only).
+Drives app.py headlessly with Streamlit's AppTest and times a Parlay Builder widget change.
+
+    python benchmarks/rerun_tabs.py [--runs 30]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app.py")
+BET_TYPES = ["Spread", "Total (Over)", "Total (Under)", "Moneyline"]
+
+
+def measure(mode, runs):
+    os.environ["EDGE_RENDER_MODE"] = mode
+    os.environ["EDGE_LEDGER_PATH"] = os.path.join(tempfile.mkdtemp(), "ledger.db")
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    if mode == "lazy":
+        at.radio(key="nav_section").set_value("Parlay Builder").run()
+    times = []
+    for i in range(runs):
+        at.selectbox(key="parlay_bet_type").set_value(BET_TYPES[i % len(BET_TYPES)])
+        t0 = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            sys.exit(f"{mode}: {at.exception}")
+    times.sort()
+    return {"p50": statistics.median(times), "p95": times[int(len(times) * 0.95) - 1], "mean": statistics.fmean(times)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    results = {mode: measure(mode, args.runs) for mode in ("tabs", "lazy")}
+    print(f"{'mode':<6} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['mean']:>8.1f}")
+    print(f"lazy speedup (p50): {results['tabs']['p50'] / results['lazy']['p50']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Wizard page delivery before / after the static build: the old StaticFiles + FileResponse
+setup vs precompressed in-memory assets. Reports bytes per request and requests per second
+(in-process TestClient, so rps is an upper bound that excludes the network).
+
+    python benchmarks/static_assets.py [--requests 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # both apps read ./static
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import FileResponse  # noqa: E402
+from fastapi.staticfiles import StaticFiles  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+def old_app():
+    app = FastAPI()
+    app.mount("/static", StaticFiles(directory="static"), name="static")
+
+    @app.get("/")
+    async def root():
+        return FileResponse("static/index.html")
+
+    return app
+
+
+def run(client, n, headers):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        r = client.get("/", headers=headers)
+    elapsed = time.perf_counter() - t0
+    return r.status_code, int(r.headers.get("content-length", 0)), r.headers.get("cache-control", "-"), n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    before, after = TestClient(old_app()), TestClient(server.app)
+    browser = {"Accept-Encoding": "gzip, deflate, br"}
+    etag = after.get("/", headers=browser).headers["etag"]
+    rows = [("before, first load", before, browser),
+            ("after, first load", after, browser),
+            ("after, gzip-only client", after, {"Accept-Encoding": "gzip"}),
+            ("after, revalidation", after, dict(browser, **{"If-None-Match": etag}))]
+    print(f"{'':<26} {'status':>6} {'bytes':>8} {'req/s':>8}  cache-control")
+    for label, client, headers in rows:
+        status, size, cache, rps = run(client, args.requests, headers)
+        print(f"{label:<26} {status:>6} {size:>8} {rps:>8.0f}  {cache}")
+
+
+if __name__ == "__main__":
+    main()
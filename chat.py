@@ -0,0 +1,306 @@
+"""
+Edge Finder v4 -- AI chat plumbing
+One pooled Azure OpenAI client per process, per-call connect / TTFB / total timing,
+streaming completions so the first tokens render as soon as they arrive, a shared
+response cache so the same question against the same slate is only paid for once, and a
+token-budgeted context window that folds older turns into a running summary.
+"""
+
+import hashlib
+import json
+import re
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+
+import httpx
+
+from metrics import observe
+
+try:
+    import tiktoken
+except ImportError:  # optional -- fall back to a chars-per-token estimate
+    tiktoken = None
+
+
+class CallTimer:
+    """
+    Per-call timing for the shared client, kept for the last `maxlen` calls.
+    httpx hooks capture connect and TTFB; stream_chat() adds TTFT and total when the stream ends.
+    """
+
+    def __init__(self, maxlen=500):
+        self.calls = deque(maxlen=maxlen)
+        self._local = threading.local()
+
+    def hooks(self):
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    def _on_request(self, request):
+        rec = {"t0": time.perf_counter(), "connect_ms": 0.0, "reused": True}
+        self._local.current = rec
+
+        def trace(event, info):
+            if event == "connection.connect_tcp.started":
+                rec["reused"] = False
+                rec["_connect_t0"] = time.perf_counter()
+            elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete") and "_connect_t0" in rec:
+                rec["connect_ms"] = (time.perf_counter() - rec["_connect_t0"]) * 1000
+
+        request.extensions["trace"] = trace
+
+    def _on_response(self, response):
+        rec = getattr(self._local, "current", None)
+        if rec is not None:
+            rec["ttfb_ms"] = (time.perf_counter() - rec["t0"]) * 1000
+
+    def finish(self, timings):
+        """Close out the calling thread's current request with stream timings (ttft_ms, total_ms)."""
+        rec = getattr(self._local, "current", None) or {}
+        self._local.current = None
+        rec = {k: v for k, v in rec.items() if not k.startswith("_") and k != "t0"}
+        rec.update(timings)
+        self.calls.append(rec)
+        for key in ("ttfb_ms", "ttft_ms", "total_ms"):
+            if key in rec:
+                observe("openai", key.removesuffix("_ms"), rec[key] / 1000)
+        return rec
+
+    def summary(self):
+        calls = list(self.calls)
+        if not calls:
+            return None
+        out = {"calls": len(calls), "reused_pct": 100.0 * sum(c.get("reused", False) for c in calls) / len(calls)}
+        for key in ("connect_ms", "ttfb_ms", "ttft_ms", "total_ms", "input_tokens"):
+            vals = [c[key] for c in calls if key in c]
+            out[f"{key}_p50"] = statistics.median(vals) if vals else None
+        return out
+
+
+def make_client(endpoint, api_key, api_version, timer=None, max_connections=32, keepalive=16):
+    """AzureOpenAI over a tuned, keep-alive httpx pool. Build once and share across sessions."""
+    from openai import AzureOpenAI
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=keepalive,
+                            keepalive_expiry=120),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        event_hooks=timer.hooks() if timer is not None else None,
+    )
+    return AzureOpenAI(azure_endpoint=endpoint, api_key=api_key, api_version=api_version, http_client=http_client)
+
+
+def stream_chat(client, model, messages, timings=None, timer=None, **params):
+    """
+    Yield content deltas from a streamed chat completion.
+    timings (optional dict) gets ttft_ms and total_ms filled in as the stream progresses;
+    timer (optional CallTimer) records the finished call.
+
+    Reads the SSE body to the end itself instead of using the SDK's Stream, which stops at
+    [DONE] and closes the response early -- that throws away the pooled keep-alive connection.
+    """
+    timings = {} if timings is None else timings
+    t0 = time.perf_counter()
+    first = True
+    with client.chat.completions.with_streaming_response.create(
+            model=model, messages=messages, stream=True, **params) as resp:
+        for line in resp.iter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                continue
+            chunk = json.loads(data)
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"].get("message", "Error during streaming"))
+            # Azure sends a leading chunk with no choices (content filter results) -- skip it.
+            choices = chunk.get("choices") or []
+            content = (choices[0].get("delta") or {}).get("content") if choices else None
+            if not content:
+                continue
+            if first:
+                timings["ttft_ms"] = (time.perf_counter() - t0) * 1000
+            first = False
+            yield content
+    timings["total_ms"] = (time.perf_counter() - t0) * 1000
+    if timer is not None:
+        timer.finish(timings)
+
+
+# --- Response cache ---
+_PUNCT = re.compile(r"[^\w\s+.-]")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """"  What's the PLAY today?? " -> "whats the play today"."""
+    return _SPACE.sub(" ", _PUNCT.sub("", prompt.lower())).strip(" .")
+
+
+def history_digest(messages):
+    """Stable hash of the conversation so far (role + content of each message)."""
+    h = hashlib.sha1()
+    for m in messages:
+        h.update(m["role"].encode())
+        h.update(b"\0")
+        h.update(m["content"].encode())
+        h.update(b"\1")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """
+    Completed AI replies shared across sessions, keyed on (model, slate digest, history digest,
+    normalized prompt). Entries expire after `ttl` seconds and the least recently used go first
+    once `maxsize` is reached. retain_slate() drops everything priced off an older slate.
+    """
+
+    def __init__(self, maxsize=512, ttl=900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, slate_digest, reply)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(model, slate_digest, history, prompt):
+        return (model, slate_digest, history_digest(history), normalize_prompt(prompt))
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, reply, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entries[key] = (now + self.ttl, key[1], reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def retain_slate(self, digest):
+        """Drop replies computed against any slate other than `digest`. Returns how many were dropped."""
+        with self._lock:
+            stale = [k for k, (_, d, _) in self._entries.items() if d != digest]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hit_pct": 100.0 * self.hits / total if total else 0.0}
+
+
+# --- Context window ---
+CONTEXT_BUDGET = 1500   # input tokens per request: system prompt + summary + recent turns
+SUMMARY_BUDGET = 250    # share of the budget the running summary may use
+TURN_SUMMARY_CHARS = 160
+_MSG_OVERHEAD = 4       # role / separator tokens the chat format adds per message
+
+# Lines worth keeping when an analyst reply is folded into the summary.
+_KEY_LINE = re.compile(r"^\W*(edge|grade|pick|play|why|bet|lean|record|net|roi)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.get_encoding("o200k_base") if tiktoken is not None else None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text):
+    """Tokens in text -- exact with tiktoken installed, otherwise ~4 characters per token."""
+    enc = _encoding()
+    if enc is not None:
+        return len(enc.encode(text))
+    return (len(text) + 3) // 4
+
+
+def message_tokens(msg):
+    return count_tokens(msg["content"]) + _MSG_OVERHEAD
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+@lru_cache(maxsize=1024)
+def condense_turn(role, content):
+    """One summary line for a turn: the user's ask, or the verdict lines of an analyst reply."""
+    lines = [ln.strip().strip("*#- ").strip() for ln in content.splitlines()]
+    lines = [ln for ln in lines if ln and not ln.startswith("|")]
+    if role == "user":
+        return "User: " + _clip(" ".join(lines), TURN_SUMMARY_CHARS)
+    key = [ln for ln in lines if _KEY_LINE.match(ln)]
+    return "Analyst: " + _clip("; ".join(key or lines[:1]), TURN_SUMMARY_CHARS)
+
+
+def new_summary():
+    """Running summary state kept per conversation: how many turns are folded in and their lines."""
+    return {"folded": 0, "lines": []}
+
+
+def build_context(system_prompt, history, summary, budget=CONTEXT_BUDGET, summary_budget=SUMMARY_BUDGET):
+    """
+    Messages for one request, bounded by `budget` tokens.
+
+    Fills what's left after the system prompt and summary reserve with the most recent turns
+    (newest first). The newest message is always sent in full, even past the budget; if it
+    eats into the summary reserve, the summary sent with this request is shortened or left out.
+    Turns that no longer fit are folded into `summary` (mutated in place, so each turn is
+    condensed once), which is trimmed oldest-first to `summary_budget` and sent as a second
+    system message.
+    """
+    base = budget - count_tokens(system_prompt) - _MSG_OVERHEAD
+    room = base - summary_budget
+    start, used = len(history), 0
+    while start > 0:
+        cost = message_tokens(history[start - 1])
+        if used + cost > room and start < len(history):
+            break
+        used += cost
+        start -= 1
+    start = max(start, min(summary["folded"], len(history) - 1))
+
+    for m in history[summary["folded"]:start]:
+        summary["lines"].append(condense_turn(m["role"], m["content"]))
+    summary["folded"] = max(summary["folded"], start)
+    while summary["lines"] and count_tokens(_summary_text(summary)) > summary_budget:
+        summary["lines"].pop(0)
+
+    messages = [{"role": "system", "content": system_prompt}]
+    # Whatever the recent turns left of the reserve; the stored summary itself stays intact.
+    sent = {"lines": list(summary["lines"])}
+    summary_room = min(summary_budget, base - used - _MSG_OVERHEAD)
+    while sent["lines"] and count_tokens(_summary_text(sent)) > summary_room:
+        sent["lines"].pop(0)
+    if sent["lines"]:
+        messages.append({"role": "system", "content": _summary_text(sent)})
+    return messages + [{"role": m["role"], "content": m["content"]} for m in history[start:]]
+
+
+def _summary_text(summary):
+    return "\n".join(["Earlier in this conversation:"] + ["- " + ln for ln in summary["lines"]])
+
+
+def context_tokens(messages):
+    return sum(message_tokens(m) for m in messages)
@@ -0,0 +1,204 @@
+"""
+Edge Finder v4 -- Demo slate, props, audit history and canned chat answers
+Shared by the Streamlit app and the odds feed.
+"""
+
+DEMO_NBA_GAMES = [
+    {"away": "Lakers", "home": "Celtics", "spread": "BOS -6.5", "total": "224", "ml_away": "+220", "ml_home": "-270",
+     "time": "7:30 PM ET", "edge": "D", "edge_reason": "No situational advantage. Two rested teams, line is fair.",
+     "why_wrong": "None identified. Both teams healthy, no schedule edge.", "why_right": "Line reflects talent gap accurately. Public money balanced.",
+     "gut_data": "neutral",
+     "features": {"side": "home"}},
+    {"away": "Heat", "home": "Bucks", "spread": "MIL -4", "total": "218", "ml_away": "+155", "ml_home": "-185",
+     "time": "8:00 PM ET", "edge": "B", "edge_reason": "Heat on B2B, 3rd game in 5 nights. Bucks fully rested at home.",
+     "why_wrong": "Fatigue not fully priced into -4. Heat shooting 38% on B2Bs this season. Bucks rest advantage undervalued.",
+     "why_right": "Heat have covered 3 of last 5 as road dog. Butler historically performs on short rest.",
+     "gut_data": "supports",
+     "features": {"side": "home", "b2b_opp": True, "rest_adv": 2}},
+    {"away": "Mavericks", "home": "Warriors", "spread": "GSW -3", "total": "228.5", "ml_away": "+135", "ml_home": "-155",
+     "time": "10:00 PM ET", "edge": "B+", "edge_reason": "Line opened GSW -5, moved to -3. Sharp money on Dallas.",
+     "why_wrong": "Reverse line movement signals sharp action on Mavs. Luka averaging 34.2 in last 5 vs Warriors.",
+     "why_right": "Warriors 12-3 at home this month. Curry shooting 48% from 3 at Chase Center.",
+     "gut_data": "supports",
+     "features": {"side": "away", "rlm": 2.0, "public_pct": 35, "model_prob": 0.465}},
+    {"away": "Nuggets", "home": "Suns", "spread": "DEN -2.5", "total": "231", "ml_away": "-140", "ml_home": "+120",
+     "time": "9:00 PM ET", "edge": "C", "edge_reason": "Jokic vs Booker always delivers, but line is efficient.",
+     "why_wrong": "Suns missing Beal (hamstring). Not yet reflected in total.", "why_right": "Nuggets on road B2B after playing in LA.",
+     "gut_data": "neutral",
+     "features": {"side": "away", "injuries_opp": 1, "model_prob": 0.57}},
+    {"away": "Pacers", "home": "Knicks", "spread": "NYK -5.5", "total": "225.5", "ml_away": "+190", "ml_home": "-230",
+     "time": "7:00 PM ET", "edge": "A", "edge_reason": "Pacers missing Haliburton + Turner. Knicks revenge game after playoff loss.",
+     "why_wrong": "Two key Pacers out, line only -5.5. Market slow to adjust. Knicks 8-1 ATS at home vs injured opponents.",
+     "why_right": "Pacers have covered without Haliburton before (3-1 ATS). Siakam usage spikes.",
+     "gut_data": "strong",
+     "features": {"side": "home", "injuries_opp": 2, "model_prob": 0.72}},
+]
+
+DEMO_NHL_GAMES = [
+    {"away": "Rangers", "home": "Bruins", "spread": "BOS -1.5", "total": "5.5", "ml_away": "+140", "ml_home": "-165",
+     "time": "7:00 PM ET", "edge": "B", "edge_reason": "Bruins backup goalie confirmed. Not yet reflected in line.",
+     "why_wrong": "Backup goalie Korpisalo starts. His .891 save % not priced into -165 ML.",
+     "why_right": "Bruins defense limits shots regardless of goalie. Rangers on B2B.",
+     "gut_data": "supports",
+     "features": {"side": "away", "injuries_opp": 1, "rest_adv": -1, "model_prob": 0.445}},
+    {"away": "Avalanche", "home": "Stars", "spread": "DAL -1.5", "total": "6", "ml_away": "+125", "ml_home": "-150",
+     "time": "8:30 PM ET", "edge": "C", "edge_reason": "MacKinnon GTD. Line hasn't moved yet.",
+     "why_wrong": "If MacKinnon sits, Avs lose their engine. Line is stale.", "why_right": "Avs depth has covered before. Stars cold at home lately.",
+     "gut_data": "neutral",
+     "features": {"side": "home", "injuries_opp": 1}},
+    {"away": "Panthers", "home": "Lightning", "spread": "TBL -1.5", "total": "6.5", "ml_away": "+110", "ml_home": "-130",
+     "time": "7:30 PM ET", "edge": "B+", "edge_reason": "Panthers on 3-game win streak, Lightning missing Kucherov.",
+     "why_wrong": "Kucherov out 2-3 weeks. Lightning ML still only -130. Public hasn't adjusted.",
+     "why_right": "Lightning have Vasilevskiy. Home ice. Rivalry game.",
+     "gut_data": "supports",
+     "features": {"side": "away", "injuries_opp": 1, "model_prob": 0.515}},
+]
+
+DEMO_NFL_GAMES = [
+    {"away": "Chiefs", "home": "Ravens", "spread": "BAL -2.5", "total": "47.5", "ml_away": "+120", "ml_home": "-140",
+     "time": "4:25 PM ET", "edge": "C", "edge_reason": "Offseason. Use for reference only.",
+     "why_wrong": "N/A (offseason)", "why_right": "N/A", "gut_data": "neutral"},
+]
+
+DEMO_CFB_GAMES = [
+    {"away": "Ohio State", "home": "Michigan", "spread": "MICH -3", "total": "44.5", "ml_away": "+130", "ml_home": "-155",
+     "time": "12:00 PM ET", "edge": "C", "edge_reason": "Offseason. Use for reference only.",
+     "why_wrong": "N/A (offseason)", "why_right": "N/A", "gut_data": "neutral"},
+]
+
+DEMO_PROPS = [
+    {"player": "Nikola Jokic", "sport": "NBA", "team": "Nuggets", "prop": "Rebounds", "line": "O/U 11.5",
+     "edge": "A", "reason": "Playing Spurs (worst rebounding team). Averages 14.2 vs bottom-10 teams. 2.7 rebounds of cushion.",
+     "recommendation": "OVER 11.5 -- This is the play.", "matchup": "vs Suns (29th in opp. rebounds allowed)",
+     "features": {"avg": 14.2, "line": 11.5, "opp_rank": 29}},
+    {"player": "Luka Doncic", "sport": "NBA", "team": "Mavericks", "prop": "Points", "line": "O/U 30.5",
+     "edge": "B+", "reason": "Averaging 34.2 vs Warriors in last 5. Curry draws attention, Luka exploits mismatches.",
+     "recommendation": "OVER 30.5 -- Matchup driven.", "matchup": "vs Warriors (25th in perimeter D)",
+     "features": {"avg": 34.2, "line": 30.5, "opp_rank": 25}},
+    {"player": "Jalen Brunson", "sport": "NBA", "team": "Knicks", "prop": "Assists", "line": "O/U 6.5",
+     "edge": "B", "reason": "Pacers missing Haliburton. Knicks will control pace. Brunson usage up 8% without pressure.",
+     "recommendation": "OVER 6.5 -- Pace control edge.", "matchup": "vs Pacers (shorthanded backcourt)",
+     "features": {"avg": 7.3, "line": 6.5, "opp_rank": 18}},
+    {"player": "Tyrese Haliburton", "sport": "NBA", "team": "Pacers", "prop": "PRA", "line": "O/U 32.5",
+     "edge": "D", "reason": "INJURED -- DNP expected. Do not bet.", "recommendation": "NO BET -- Player injured.",
+     "matchup": "N/A",
+     "features": {"avg": 31.0, "line": 32.5, "opp_rank": 15, "injured": True}},
+    {"player": "Anthony Edwards", "sport": "NBA", "team": "Timberwolves", "prop": "3-Pointers Made", "line": "O/U 3.5",
+     "edge": "C", "reason": "Edwards shooting 31% from 3 this month. Volume is there but accuracy is cold.",
+     "recommendation": "PASS -- Cold stretch, no edge.", "matchup": "vs Clippers (12th in 3PT D)",
+     "features": {"avg": 3.6, "line": 3.5, "opp_rank": 12}},
+    {"player": "Connor McDavid", "sport": "NHL", "team": "Oilers", "prop": "Points", "line": "O/U 1.5",
+     "edge": "B", "reason": "Playing Sharks (worst GAA in league). McDavid has 8 points in last 3 vs SJ.",
+     "recommendation": "OVER 1.5 -- Matchup gold.", "matchup": "vs Sharks (32nd in GAA)",
+     "features": {"avg": 1.6, "line": 1.5, "opp_rank": 32}},
+]
+
+DEMO_BET_LOG = [
+    {"date": "2026-02-24", "game": "Bucks -4 vs Heat", "type": "Spread", "grade": "B", "risk": 100,
+     "result": "W", "payout": 195, "edge_real": True, "notes": "Fatigue edge was real. Heat shot 38%."},
+    {"date": "2026-02-24", "game": "Jokic O11.5 reb", "type": "Prop", "grade": "A", "risk": 50,
+     "result": "W", "payout": 140, "edge_real": True, "notes": "Finished with 15 rebounds. Matchup edge validated."},
+    {"date": "2026-02-24", "game": "3-Leg Parlay", "type": "Parlay", "grade": "B", "risk": 50,
+     "result": "L", "payout": 0, "edge_real": True, "notes": "Lost on Bills/Pats UNDER. Fluke TDs in garbage time."},
+    {"date": "2026-02-23", "game": "Knicks -5.5 vs Pacers", "type": "Spread", "grade": "A", "risk": 150,
+     "result": "W", "payout": 295, "edge_real": True, "notes": "Pacers missing 2 starters. Line was too low."},
+    {"date": "2026-02-23", "game": "Panthers ML vs Lightning", "type": "ML", "grade": "B+", "risk": 75,
+     "result": "W", "payout": 158, "edge_real": True, "notes": "Kucherov out. Panthers dominated."},
+    {"date": "2026-02-22", "game": "Lakers -8 vs Hornets", "type": "Spread", "grade": "C", "risk": 50,
+     "result": "L", "payout": 0, "edge_real": False, "notes": "No real edge. Should have passed. Grade C = pass."},
+]
+
+# Canned demo-mode chat answers, keyed by their main phrasing.
+DEMO_RESPONSES = {
+    "what's the play today": """**TONIGHT'S EDGE PLAYS**
+
+**STRAIGHT BETS (Heavy Hitter):**
+
+1. **Knicks -5.5 vs Pacers** -- Grade A | $50
+   Edge: Pacers missing Haliburton + Turner. Line hasn't adjusted enough.
+
+2. **Bucks -4 vs Heat** -- Grade B | $25
+   Edge: Heat on B2B, 3rd game in 5 nights. Fatigue not fully priced.
+
+**VALUE PARLAY ($25 to win $121):**
+- Bucks -4
+- Mavericks ML +135
+- Combined: +485
+
+**PLAYER PROP:**
+- Jokic OVER 11.5 reb -- Grade A | $25
+  Edge: Playing worst rebounding team. 2.7 rebounds of cushion.
+
+**PASS:**
+- Lakers/Celtics -- no edge, line is fair
+- Nuggets/Suns -- efficient line
+
+Total suggested risk: $125
+Expected edge plays: 3-4""",
+
+    "i like the bucks": """**DEEP DIVE: Heat @ Bucks**
+
+**THE LINE:** Bucks -4
+**ML:** MIL -185 / MIA +155
+
+**WHY MARKET MIGHT BE WRONG:**
+- Heat on B2B, 3rd game in 5 nights
+- Heat shooting 38% on B2Bs this season
+- Bucks fully rested at home
+- Fatigue not fully priced into -4
+
+**WHY MARKET MIGHT BE RIGHT:**
+- Heat covered 3 of last 5 as road dog
+- Butler historically performs on short rest
+
+**YOUR GUT:** You like the Bucks
+**DATA:** Supports your read
+
+**GUT + DATA: ALIGNMENT**
+
+**VERDICT: Grade B**
+Half unit. Edge is real but not overwhelming.
+Risk: $25 (half unit at current bankroll)""",
+
+    "run audit": """**WEEKLY AUDIT**
+
+**RECORD:** 4-2
+**NET P/L:** +$263
+**ROI:** +18.4%
+**EDGE ACCURACY:** 83%
+
+**BY TYPE:**
+| Type | W-L | P/L |
+|------|-----|-----|
+| Spreads | 2-0 | +$240 |
+| Props | 1-0 | +$90 |
+| Parlays | 0-1 | -$50 |
+| ML | 1-1 | -$17 |
+
+**PROCESS GRADE: A-**
+Edge identification was strong. Only miss was a C-grade bet that should have been a pass.
+
+**LESSON:** Grade C = pass. Stop betting them.
+
+**WHAT'S WORKING:**
+- Rest/fatigue edges (3-0)
+- Injury-based edges (2-0)
+
+**WHAT'S NOT:**
+- Parlays (0-1, variance but monitor)""",
+}
+
+# Other ways of asking for the same canned answer (team / player questions are templated from the slate).
+DEMO_PARAPHRASES = {
+    "what's the play today": [
+        "what's the play", "what's the play tonight", "plays today", "plays tonight", "play tonight",
+        "best bet", "best bets", "what should i bet", "who should i bet", "what do you like", "any edges",
+        "any edge tonight", "give me a pick", "picks today", "picks tonight", "tonight's card", "full slate",
+        "slate analysis", "what's worth betting",
+    ],
+    "i like the bucks": ["i love the bucks", "bucks tonight", "i like milwaukee", "hammer the bucks"],
+    "run audit": [
+        "audit", "weekly audit", "how am i doing", "how did i do", "my record", "my results", "weekly review",
+        "performance review", "p&l", "profit and loss", "am i up", "am i down",
+    ],
+}
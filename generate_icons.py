@@ -1,14 +1,43 @@
 """
 Generate Edge Finder app icons via Azure DALL-E 3.
+
+Images are generated concurrently (bounded by --concurrency) under a client-side token bucket
+(--rpm). A 429's Retry-After pauses every request, not just the one that got it; 429s, 5xx and
+connection errors are retried with exponential backoff. Images stream to a temp file and are
+renamed into place, and each finished image is recorded in a manifest by the hash of its
+prompt, size and quality -- a rerun skips everything already generated, so an interrupted run
+picks up where it stopped. One failed image doesn't stop the others.
+
+    python generate_icons.py [--spec images.json] [--rpm 5] [--concurrency 4] [--force]
+    # against the local stub: python stubs/image_server.py, then DALLE_ENDPOINT=http://127.0.0.1:8012
 """
-import os, time, httpx
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
 
 AZURE_KEY = os.getenv("DALLE_API_KEY", "")
-AZURE_ENDPOINT = "https://swedencentral.api.cognitive.microsoft.com"
+AZURE_ENDPOINT = os.getenv("DALLE_ENDPOINT", "https://swedencentral.api.cognitive.microsoft.com")
 DEPLOYMENT = "dall-e-3"
 API_VERSION = "2024-02-01"
+QUALITY = "hd"
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "assets")
+MANIFEST = "icons-manifest.json"  # in the output dir: filename -> hash of what produced it
+
+RPM = 5.0             # generations per minute (the old fixed 12 s gap)
+BURST = 1             # requests the bucket may send back to back
+CONCURRENCY = 4
+RETRIES = 5
+BACKOFF_MAX = 60.0    # seconds
+CHUNK = 64 * 1024
 
 IMAGES = [
     {
@@ -36,31 +65,231 @@ IMAGES = [
     },
 ]
 
-URL = f"{AZURE_ENDPOINT}/openai/deployments/{DEPLOYMENT}/images/generations?api-version={API_VERSION}"
-HEADERS = {"api-key": AZURE_KEY, "Content-Type": "application/json"}
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+def generation_url(endpoint=AZURE_ENDPOINT):
+    return f"{endpoint.rstrip('/')}/openai/deployments/{DEPLOYMENT}/images/generations?api-version={API_VERSION}"
+
+
+def image_hash(img, quality=QUALITY):
+    """What the output depends on: prompt, size and quality."""
+    key = json.dumps({"prompt": img["prompt"], "size": img["size"], "quality": quality}, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+# --- Rate limiting ---
+class TokenBucket:
+    """`rpm` requests per minute with bursts of up to `burst`; pause() holds everyone (Retry-After)."""
+
+    def __init__(self, rpm=RPM, burst=BURST):
+        self.rate = rpm / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if not self.rate:
+                    return
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """The server asked us to back off: no request goes out for `seconds`, then refill from empty."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.blocked_until
+
+
+def retry_after(resp):
+    """Seconds from retry-after-ms / Retry-After (delta-seconds or HTTP date), or None."""
+    ms = resp.headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(float(ms) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt):
+    """Full-jitter exponential backoff: up to 1, 2, 4, ... seconds, capped at BACKOFF_MAX."""
+    return random.uniform(0, min(BACKOFF_MAX, 2.0 ** attempt))
+
+
+class RetryableError(Exception):
+    def __init__(self, message, delay=None):
+        super().__init__(message)
+        self.delay = delay
+
+
+# --- Manifest ---
+class Manifest:
+    """filename -> {hash, bytes, generated_at}, rewritten atomically after every image."""
 
-for i, img in enumerate(IMAGES):
-    print(f"\n[{i+1}/{len(IMAGES)}] Generating: {img['filename']}")
-    body = {"prompt": img["prompt"], "size": img["size"], "quality": "hd", "n": 1}
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.path = os.path.join(out_dir, MANIFEST)
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
 
-    resp = httpx.post(URL, json=body, headers=HEADERS, timeout=120)
+    def fresh(self, img, quality=QUALITY):
+        """True when the file on disk came from this exact prompt + size + quality."""
+        entry = self.entries.get(img["filename"])
+        out_path = os.path.join(self.out_dir, img["filename"])
+        return (entry is not None and entry["hash"] == image_hash(img, quality)
+                and os.path.exists(out_path) and os.path.getsize(out_path) == entry["bytes"])
+
+    def record(self, img, nbytes, quality=QUALITY):
+        self.entries[img["filename"]] = {"hash": image_hash(img, quality), "bytes": nbytes,
+                                         "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+# --- Requests ---
+async def _retrying(call, retries, bucket=None):
+    """Run `call` until it succeeds, backing off on RetryableError / transport errors."""
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            await bucket.acquire()
+        try:
+            return await call()
+        except (RetryableError, httpx.TransportError) as e:
+            if attempt == retries:
+                raise
+            delay = getattr(e, "delay", None)
+            await asyncio.sleep(delay if delay is not None else backoff(attempt))
+
+
+def _check(resp, bucket=None):
+    """Raise RetryableError for 429 / 5xx (pausing the bucket on a 429), HTTPStatusError for other errors."""
+    if resp.status_code == 429 or resp.status_code >= 500:
+        wait = retry_after(resp)
+        if resp.status_code == 429 and bucket is not None:
+            bucket.pause(wait if wait is not None else 1.0)
+            wait = 0.0  # the bucket holds the retry
+        raise RetryableError(f"HTTP {resp.status_code}", wait)
     resp.raise_for_status()
-    data = resp.json()
-    image_url = data["data"][0]["url"]
-    print(f"  URL received. Downloading...")
 
-    img_resp = httpx.get(image_url, timeout=60)
-    img_resp.raise_for_status()
 
-    out_path = os.path.join(OUTPUT_DIR, img["filename"])
-    with open(out_path, "wb") as f:
-        f.write(img_resp.content)
-    print(f"  Saved: {out_path} ({len(img_resp.content) // 1024} KB)")
+async def request_image(client, img, bucket, url, retries=RETRIES, quality=QUALITY):
+    """POST one generation (rate limited, retried) and return the image URL."""
+    body = {"prompt": img["prompt"], "size": img["size"], "quality": quality, "n": 1}
+
+    async def call():
+        resp = await client.post(url, json=body, headers={"api-key": AZURE_KEY}, timeout=120)
+        _check(resp, bucket)
+        return resp.json()["data"][0]["url"]
+
+    return await _retrying(call, retries, bucket)
+
+
+async def download(client, image_url, out_path, retries=RETRIES):
+    """Stream the image to out_path via a temp file, so a partial download never looks finished."""
+    tmp = out_path + ".part"
+
+    async def call():
+        nbytes = 0
+        async with client.stream("GET", image_url, timeout=60) as resp:
+            _check(resp)
+            with open(tmp, "wb") as f:
+                async for chunk in resp.aiter_bytes(CHUNK):
+                    f.write(chunk)
+                    nbytes += len(chunk)
+        os.replace(tmp, out_path)
+        return nbytes
+
+    try:
+        return await _retrying(call, retries)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+async def generate_all(images, out_dir=OUTPUT_DIR, endpoint=AZURE_ENDPOINT, rpm=RPM, burst=BURST,
+                       concurrency=CONCURRENCY, retries=RETRIES, force=False, quality=QUALITY):
+    """Generate every image not already in the manifest. Returns {"generated", "skipped", "failed": {filename: error}}."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = Manifest(out_dir)
+    todo = [img for img in images if force or not manifest.fresh(img, quality)]
+    skipped = len(images) - len(todo)
+    if skipped:
+        print(f"Skipping {skipped} image(s) already in {MANIFEST}")
+    bucket = TokenBucket(rpm, burst)
+    slots = asyncio.Semaphore(concurrency)
+    url = generation_url(endpoint)
+    failed = {}
+
+    async def one(i, img):
+        async with slots:
+            label = f"[{i + 1}/{len(todo)}] {img['filename']}"
+            t0 = time.perf_counter()
+            try:
+                image_url = await request_image(client, img, bucket, url, retries, quality)
+                nbytes = await download(client, image_url, os.path.join(out_dir, img["filename"]), retries)
+            except Exception as e:  # one bad image doesn't sink the batch
+                failed[img["filename"]] = f"{type(e).__name__}: {e}"
+                print(f"  {label} FAILED: {failed[img['filename']]}")
+                return
+            manifest.record(img, nbytes, quality)
+            print(f"  {label} saved ({nbytes // 1024} KB, {time.perf_counter() - t0:.1f}s)")
+
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(limits=limits) as client:
+        await asyncio.gather(*(one(i, img) for i, img in enumerate(todo)))
+    return {"generated": len(todo) - len(failed), "skipped": skipped, "failed": failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Edge Finder app icons via Azure DALL-E 3")
+    parser.add_argument("--spec", help="JSON list of {filename, size, prompt} (default: the built-in icons)")
+    parser.add_argument("--out", default=OUTPUT_DIR)
+    parser.add_argument("--endpoint", default=AZURE_ENDPOINT)
+    parser.add_argument("--rpm", type=float, default=RPM, help="generations per minute (0 = no client limit)")
+    parser.add_argument("--burst", type=int, default=BURST)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    parser.add_argument("--force", action="store_true", help="regenerate even if the manifest has it")
+    args = parser.parse_args()
+
+    images = IMAGES
+    if args.spec:
+        with open(args.spec) as f:
+            images = json.load(f)
+
+    t0 = time.perf_counter()
+    result = asyncio.run(generate_all(images, args.out, args.endpoint, args.rpm, args.burst,
+                                      args.concurrency, args.retries, args.force))
+    print(f"\nDone in {time.perf_counter() - t0:.1f}s: {result['generated']} generated, "
+          f"{result['skipped']} skipped, {len(result['failed'])} failed.")
+    sys.exit(1 if result["failed"] else 0)
 
-    if i < len(IMAGES) - 1:
-        print("  Waiting 12s for rate limit...")
-        time.sleep(12)
 
-print("\nDone! All icons generated.")
+if __name__ == "__main__":
+    main()
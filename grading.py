@@ -0,0 +1,134 @@
+"""
+Edge Finder v4 -- Edge grading engine
+Derives the A-F grade from structured features instead of a hand-typed string.
+The whole slate is scored as one DataFrame: every rule is a column expression,
+so re-grading thousands of markets after an odds refresh is a few NumPy passes.
+
+Games: features are relative to the side the analysis backs ("side": "home" | "away").
+Props: season average vs line, opponent rank against the stat, injury status.
+Games / props without a "features" dict keep their analyst grade.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pricing import parse_american, implied_probability
+
+# Score needed for each grade, best first. Default is D -- bets earn their way up.
+GRADE_CUTOFFS = [("A", 4.5), ("B+", 3.5), ("B", 2.5), ("B-", 1.75), ("C", 1.0)]
+
+GAME_DEFAULTS = {"side": "home", "b2b_opp": False, "rest_adv": 0, "injuries_opp": 0, "injuries_own": 0,
+                 "rlm": np.nan, "model_prob": np.nan, "public_pct": 50.0, "contrarian": False}
+PROP_DEFAULTS = {"avg": np.nan, "line": np.nan, "opp_rank": np.nan, "injured": False}
+TEAMS_PER_LEAGUE = {"NBA": 30, "NHL": 32, "NFL": 32, "CFB": 130}
+
+HEAVY_FAVORITE = -300    # red flag: laying this or more
+CONSENSUS_PCT = 70.0     # red flag: this much public on our side with no contrarian angle
+TRAP_VALUE = -0.03       # model below the no-vig price by this much -> market is right
+
+
+def scores_to_grades(scores, cutoffs=GRADE_CUTOFFS):
+    conds = [scores >= cut for _, cut in cutoffs]
+    return np.select(conds, [g for g, _ in cutoffs], default="D")
+
+
+def game_grades(score, red_flag, value, cutoffs=GRADE_CUTOFFS):
+    """Scores -> grades, then red flags knock a passing grade to D and a model below market is F."""
+    grade = scores_to_grades(score, cutoffs)
+    grade = np.where(red_flag & np.isin(grade, [g for g, _ in cutoffs]), "D", grade)  # auto-pass
+    return np.where(value <= TRAP_VALUE, "F", grade)
+
+
+# --- Games ---
+def game_frame(games, moves=None):
+    """
+    Feature DataFrame for a list of game dicts. moves: optional move since open of the home team's
+    spread per game (same order, see teams.home_line) -- negative means the market moved toward the
+    home team. Used for reverse line movement when a game doesn't carry "rlm".
+    """
+    feats = [g.get("features") or {} for g in games]
+    cols = {k: [f.get(k, default) for f in feats] for k, default in GAME_DEFAULTS.items()}
+    home = [side == "home" for side in cols["side"]]
+    cols["price"] = [parse_american(g.get("ml_home" if h else "ml_away", "")) for g, h in zip(games, home)]
+    cols["other_price"] = [parse_american(g.get("ml_away" if h else "ml_home", "")) for g, h in zip(games, home)]
+    cols["spread_move"] = list(moves) if moves is not None else [0.0] * len(games)
+    cols["has_features"] = ["features" in g for g in games]
+    return pd.DataFrame(cols)
+
+
+def grade_games(df):
+    """Add novig, value, score, red flags and grade columns to a game_frame."""
+    p_side = implied_probability(df["price"].to_numpy())
+    p_other = implied_probability(df["other_price"].to_numpy())
+    novig = p_side / (p_side + p_other)
+    value = np.nan_to_num(df["model_prob"].to_numpy(dtype=float) - novig, nan=0.0)
+
+    # Reverse line movement: the spread moved toward our side while the public is on the other one.
+    away = (df["side"] == "away").to_numpy()
+    move_to_side = np.where(away, df["spread_move"], -df["spread_move"])
+    derived_rlm = np.where(df["public_pct"].to_numpy() < 50, np.clip(move_to_side, 0, None), 0.0)
+    rlm = np.where(np.isnan(df["rlm"].to_numpy(dtype=float)), derived_rlm, df["rlm"].to_numpy(dtype=float))
+
+    score = (1.5 * df["b2b_opp"].to_numpy(dtype=float)
+             + 0.5 * np.clip(df["rest_adv"].to_numpy(dtype=float), -2, 2)
+             + 1.25 * np.minimum(df["injuries_opp"].to_numpy(dtype=float), 2)
+             - 1.0 * np.minimum(df["injuries_own"].to_numpy(dtype=float), 2)
+             + 0.75 * np.clip(rlm, 0, 3)
+             + 40.0 * value)
+
+    heavy_fav = df["price"].to_numpy() <= HEAVY_FAVORITE
+    consensus = (df["public_pct"].to_numpy() >= CONSENSUS_PCT) & ~df["contrarian"].to_numpy(dtype=bool)
+    red_flag = heavy_fav | consensus
+
+    return df.assign(novig=novig, value=value, rlm=rlm, score=score, heavy_fav=heavy_fav,
+                     consensus=consensus, grade=game_grades(score, red_flag, value))
+
+
+def _flags(price, heavy_fav, consensus, value):
+    flags = []
+    if heavy_fav:
+        flags.append(f"Heavy favorite ({int(price)}) -- auto-pass")
+    if consensus:
+        flags.append("Consensus side, no contrarian angle -- auto-pass")
+    if value <= TRAP_VALUE:
+        flags.append("Model below market price -- market is right")
+    return flags
+
+
+def regrade_games(games, moves=None):
+    """New game dicts with derived 'edge', 'edge_score' and 'edge_flags'. Inputs are not mutated."""
+    if not games:
+        return []
+    df = grade_games(game_frame(games, moves))
+    cols = zip(games, df["has_features"].tolist(), df["grade"].tolist(), df["score"].round(2).tolist(),
+               df["price"].tolist(), df["heavy_fav"].tolist(), df["consensus"].tolist(), df["value"].tolist())
+    return [dict(g, edge=grade, edge_score=score, edge_flags=_flags(price, hf, cons, value)) if has else g
+            for g, has, grade, score, price, hf, cons, value in cols]
+
+
+# --- Props ---
+def prop_frame(props):
+    feats = [p.get("features") or {} for p in props]
+    cols = {k: [f.get(k, default) for f in feats] for k, default in PROP_DEFAULTS.items()}
+    cols["teams"] = [TEAMS_PER_LEAGUE.get(p.get("sport"), 30) for p in props]
+    cols["has_features"] = ["features" in p for p in props]
+    return pd.DataFrame(cols)
+
+
+def grade_props(df):
+    """Cushion of average over line, plus how bad the opponent is against the stat. Injured = no bet."""
+    line = df["line"].to_numpy(dtype=float)
+    cushion = np.nan_to_num((df["avg"].to_numpy(dtype=float) - line) / line, nan=0.0)
+    matchup = np.nan_to_num((df["opp_rank"].to_numpy(dtype=float) - 1) / (df["teams"].to_numpy(dtype=float) - 1), nan=0.0)
+    score = 12.0 * cushion + 2.5 * matchup
+    grade = scores_to_grades(score)
+    grade = np.where(df["injured"].to_numpy(dtype=bool), "D", grade)
+    return df.assign(cushion=cushion, matchup=matchup, score=score, grade=grade)
+
+
+def regrade_props(props):
+    if not props:
+        return []
+    df = grade_props(prop_frame(props))
+    cols = zip(props, df["has_features"].tolist(), df["grade"].tolist(), df["score"].round(2).tolist())
+    return [dict(p, edge=grade, edge_score=score) if has else p for p, has, grade, score in cols]
@@ -0,0 +1,251 @@
+"""
+Edge Finder v4 -- Demo-mode intent matcher
+Resolves a chat prompt to a canned or templated answer without an LLM call.
+Exact phrases go through one Aho-Corasick automaton (a single pass over the prompt no matter
+how many phrases are loaded); misspellings fall back to a trigram inverted index.
+Team and player intents render from the live slate, so odds and grades are always current.
+"""
+
+from collections import Counter, defaultdict, deque
+from itertools import chain
+
+from chat import normalize_prompt
+from feeds import game_id
+
+FUZZY_MIN = 0.55       # share of a phrase's trigrams that must appear in the prompt
+GUT_WORDS = ("i like", "i love", "feeling", "gut", "im on", "hammer")
+
+
+# --- Aho-Corasick ---
+class Automaton:
+    """Multi-pattern matcher. add() phrases, build() once, then match() in O(len(text) + hits)."""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._own = [[]]  # state -> [(phrase_len, value)] for phrases ending exactly here
+        self._out = [[]]  # _own plus the outputs of the fail chain, filled in by build()
+        self._built = False
+
+    def __len__(self):
+        return sum(len(o) for o in self._own)
+
+    def add(self, phrase, value):
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = self._goto[state][ch] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            state = nxt
+        self._own[state].append((len(phrase), value))
+        self._built = False
+
+    def build(self):
+        """Breadth-first fail links; each state's outputs include its fail chain's; rerun after add()."""
+        self._out = [list(own) for own in self._own]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if state else 0
+                self._out[nxt] = self._own[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def match(self, text):
+        """[(end_index, phrase_len, value)] for every phrase occurrence in text."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        hits, state = [], 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                hits.append((i, length, value))
+        return hits
+
+
+# --- Trigram index ---
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index trigram -> phrase ids, scored by how much of each phrase the query covers."""
+
+    def __init__(self):
+        self._postings = defaultdict(list)
+        self._sizes = []
+        self._values = []
+
+    def add(self, phrase, value):
+        pid = len(self._values)
+        grams = trigrams(phrase)
+        for g in grams:
+            self._postings[g].append(pid)
+        self._sizes.append(len(grams))
+        self._values.append(value)
+
+    def search(self, text, min_score=FUZZY_MIN):
+        """Best (score, value) over the prompt's words, or None."""
+        best = None
+        for word in text.split():
+            if len(word) < 4:
+                continue
+            counts = Counter(chain.from_iterable(self._postings.get(g, ()) for g in trigrams(word)))
+            for pid, n in counts.items():
+                score = n / self._sizes[pid]
+                if score >= min_score and (best is None or score > best[0]):
+                    best = (score, self._values[pid])
+        return best
+
+
+# --- Intent index ---
+class IntentIndex:
+    """
+    phrase -> intent. An intent is ("canned", key), ("game", game_id) or ("prop", player).
+    match() prefers the longest exact phrase; fuzzy matching only runs when nothing matched exactly.
+    """
+
+    def __init__(self):
+        self.automaton = Automaton()
+        self.fuzzy = TrigramIndex()
+        self.phrases = 0
+
+    def add(self, phrase, intent, fuzzy=False):
+        norm = normalize_prompt(phrase)
+        if not norm:
+            return
+        self.automaton.add(f" {norm} ", intent)  # padded so phrases only match whole words
+        if fuzzy and " " not in norm:
+            self.fuzzy.add(norm, intent)
+        self.phrases += 1
+
+    def build(self):
+        self.automaton.build()
+        return self
+
+    def match(self, prompt):
+        """(intent, exact) for a prompt, or (None, False)."""
+        text = normalize_prompt(prompt)
+        hits = self.automaton.match(f" {text} ")
+        if hits:
+            return max(hits, key=lambda h: (h[1], -h[0]))[2], True
+        found = self.fuzzy.search(text)
+        return (found[1], False) if found else (None, False)
+
+
+def build_index(canned, paraphrases, games, props):
+    """
+    canned: {key phrase: response}; paraphrases: {key phrase: [other phrasings]}.
+    Games and props are indexed by team / player name -- full, first or last -- (and name + stat) for templated answers.
+    """
+    idx = IntentIndex()
+    for key in canned:
+        for phrase in [key, *paraphrases.get(key, ())]:
+            idx.add(phrase, ("canned", key))
+    for g in games:
+        gid = game_id(g)
+        for team in (g["away"], g["home"]):
+            idx.add(team, ("game", gid), fuzzy=True)
+        idx.add(f"{g['away']} {g['home']}", ("game", gid))
+        idx.add(f"{g['home']} {g['away']}", ("game", gid))
+    for p in props:
+        key = ("prop", p["player"])
+        idx.add(p["player"], key)
+        for name in name_keys(p["player"]):
+            idx.add(name, key, fuzzy=True)
+        for stat in {p["prop"], p["prop"].rstrip("s")}:
+            idx.add(f"{p['player']} {stat}", key)
+            for name in name_keys(p["player"]):
+                idx.add(f"{name} {stat}", key)
+    return idx.build()
+
+
+NAME_SUFFIXES = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv"}
+
+
+def name_keys(player):
+    """The parts of a player's name a prompt might use on its own: first name and surname ("Luka", "Doncic")."""
+    parts = [w for w in player.split() if w.lower() not in NAME_SUFFIXES]
+    return list(dict.fromkeys(parts[:1] + parts[-1:]))
+
+
+# --- Templated answers ---
+def _gut_line(prompt, game):
+    text = normalize_prompt(prompt)
+    if not any(w in text for w in GUT_WORDS):
+        return ""
+    team = next((t for t in (game["away"], game["home"]) if normalize_prompt(t) in text), None)
+    if team is None:
+        return ""
+    backed = game["home"] if (game.get("features") or {}).get("side", "home") == "home" else game["away"]
+    grade = game.get("edge", "D")
+    if grade in ("D", "F"):
+        verdict = "No edge on either side -- the line is fair"
+    elif team == backed and grade in ("A", "B+", "B"):
+        verdict = "Supports your read\n\n**GUT + DATA: ALIGNMENT**"
+    elif team == backed:
+        verdict = "Leans your way, but the edge is thin"
+    else:
+        verdict = f"Contradicts it -- the edge (if any) is on the {backed}\n\n**GUT + DATA: CONFLICT**"
+    return f"\n\n**YOUR GUT:** You like the {team}\n**DATA:** {verdict}"
+
+
+def render_game(game, prompt=""):
+    flags = "".join(f"\n- {f}" for f in game.get("edge_flags", ()))
+    flags = f"\n\n**RED FLAGS:**{flags}" if flags else ""
+    grade = game.get("edge", "D")
+    call = "NO BET." if grade in ("D", "F") else "Size it to the grade."
+    return f"""**DEEP DIVE: {game['away']} @ {game['home']}**
+
+**THE LINE:** {game['spread']} | Total {game['total']}
+**ML:** {game['away']} {game['ml_away']} / {game['home']} {game['ml_home']}
+
+**WHY MARKET MIGHT BE WRONG:**
+- {game.get('why_wrong', 'None identified.')}
+
+**WHY MARKET MIGHT BE RIGHT:**
+- {game.get('why_right', 'None identified.')}{_gut_line(prompt, game)}
+
+**VERDICT: Grade {grade}**
+{game.get('edge_reason', '')} {call}{flags}
+
+*Demo mode active. Connect Azure OpenAI for live analysis.*"""
+
+
+def render_prop(prop):
+    return f"""**PROP: {prop['player']} {prop['prop']} {prop['line']}**
+
+**MATCHUP:** {prop.get('matchup', '')}
+**WHY:** {prop.get('reason', '')}
+
+**VERDICT: Grade {prop.get('edge', 'D')}**
+{prop.get('recommendation', '')}
+
+*Demo mode active. Connect Azure OpenAI for live analysis.*"""
+
+
+def answer(index, prompt, canned, games, props):
+    """Demo reply for a prompt from the index, rendered against the current games / props. None if no intent."""
+    intent, _ = index.match(prompt)
+    if intent is None:
+        return None
+    kind, key = intent
+    if kind == "canned":
+        return canned[key]
+    if kind == "game":
+        game = next((g for g in games if game_id(g) == key), None)
+        return render_game(game, prompt) if game else None
+    prop = next((p for p in props if p["player"] == key), None)
+    return render_prop(prop) if prop else None
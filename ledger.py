@@ -0,0 +1,305 @@
+"""
+Edge Finder v4 -- Bet ledger
+Persistent, typed bet history per profile in SQLite (WAL mode).
+Appends are single-row inserts; reads come back as typed DataFrames or SQL aggregates,
+so a multi-year history never has to be rebuilt as a list of dicts on a rerun.
+
+Per-profile totals are materialized in profile_totals and kept current by triggers,
+so logging or settling a bet is an O(1) update and the leaderboard reads one row per profile.
+daily_totals does the same per (profile, date), so P/L rollups read one row per betting day.
+Both also count reviewed bets (edge_real set) and real edges, for the audit's edge accuracy.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from optimizer import GRADE_ORDER
+
+DEFAULT_PATH = os.getenv("EDGE_LEDGER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ledger.db"))
+
+COLUMNS = ["id", "profile", "date", "game", "type", "grade", "risk", "result", "payout", "edge_real", "thesis", "notes"]
+SORTABLE = {"id", "date", "grade", "result", "risk", "payout", "type"}
+_ORDER_EXPR = {"grade": "CASE grade " + " ".join(f"WHEN '{g}' THEN {i}" for i, g in enumerate(GRADE_ORDER))
+                        + f" ELSE {len(GRADE_ORDER)} END"}   # best grade first, not alphabetical
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS bets (
+    id        INTEGER PRIMARY KEY,
+    profile   TEXT    NOT NULL,
+    date      TEXT    NOT NULL,
+    game      TEXT    NOT NULL,
+    type      TEXT    NOT NULL,
+    grade     TEXT    NOT NULL,
+    risk      REAL    NOT NULL DEFAULT 0,
+    result    TEXT    NOT NULL DEFAULT 'Pending',
+    payout    REAL    NOT NULL DEFAULT 0,
+    edge_real INTEGER,
+    thesis    TEXT    NOT NULL DEFAULT '',
+    notes     TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS ix_bets_profile_date ON bets(profile, date);
+CREATE INDEX IF NOT EXISTS ix_bets_profile_grade ON bets(profile, grade);
+CREATE INDEX IF NOT EXISTS ix_bets_profile_result ON bets(profile, result);
+CREATE INDEX IF NOT EXISTS ix_bets_profile_grade_rank ON bets(profile, ({_ORDER_EXPR["grade"]}), id);
+
+CREATE TABLE IF NOT EXISTS profile_totals (
+    profile        TEXT    PRIMARY KEY,
+    bets           INTEGER NOT NULL DEFAULT 0,
+    wins           INTEGER NOT NULL DEFAULT 0,
+    losses         INTEGER NOT NULL DEFAULT 0,
+    pending        INTEGER NOT NULL DEFAULT 0,
+    risk           REAL    NOT NULL DEFAULT 0,
+    settled_risk   REAL    NOT NULL DEFAULT 0,
+    settled_payout REAL    NOT NULL DEFAULT 0,
+    reviewed       INTEGER NOT NULL DEFAULT 0,
+    edge_real      INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS daily_totals (
+    profile        TEXT    NOT NULL,
+    date           TEXT    NOT NULL,
+    bets           INTEGER NOT NULL DEFAULT 0,
+    wins           INTEGER NOT NULL DEFAULT 0,
+    losses         INTEGER NOT NULL DEFAULT 0,
+    pending        INTEGER NOT NULL DEFAULT 0,
+    risk           REAL    NOT NULL DEFAULT 0,
+    settled_risk   REAL    NOT NULL DEFAULT 0,
+    settled_payout REAL    NOT NULL DEFAULT 0,
+    reviewed       INTEGER NOT NULL DEFAULT 0,
+    edge_real      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (profile, date)
+) WITHOUT ROWID;
+"""
+
+# Columns added to the totals tables after the first release, with their SQL type.
+_TOTALS_ADDED = {"reviewed": "INTEGER NOT NULL DEFAULT 0", "edge_real": "INTEGER NOT NULL DEFAULT 0"}
+
+# Each trigger adds (+1) or removes (-1) one bet's contribution to its profile's row
+# (and, in daily_totals, to its profile's row for the bet's date).
+_APPLY = """
+    INSERT OR IGNORE INTO {table} ({keys}) VALUES ({values});
+    UPDATE {table} SET
+        bets           = bets + {s},
+        wins           = wins + {s} * ({r}.result = 'W'),
+        losses         = losses + {s} * ({r}.result = 'L'),
+        pending        = pending + {s} * ({r}.result = 'Pending'),
+        risk           = risk + {s} * {r}.risk,
+        settled_risk   = settled_risk + {s} * (CASE WHEN {r}.result IN ('W', 'L') THEN {r}.risk ELSE 0 END),
+        settled_payout = settled_payout + {s} * (CASE WHEN {r}.result IN ('W', 'L') THEN {r}.payout ELSE 0 END),
+        reviewed       = reviewed + {s} * ({r}.edge_real IS NOT NULL),
+        edge_real      = edge_real + {s} * COALESCE({r}.edge_real = 1, 0)
+    WHERE {where};
+"""
+
+
+def _apply(table, keys, r, s):
+    return _APPLY.format(table=table, keys=", ".join(keys), values=", ".join(f"{r}.{k}" for k in keys),
+                         where=" AND ".join(f"{k} = {r}.{k}" for k in keys), r=r, s=s)
+
+
+def _triggers(suffix, table, keys, columns):
+    return f"""
+CREATE TRIGGER IF NOT EXISTS trg_bets_insert{suffix} AFTER INSERT ON bets BEGIN
+{_apply(table, keys, "NEW", "1")}
+END;
+CREATE TRIGGER IF NOT EXISTS trg_bets_update{suffix} AFTER UPDATE OF {columns} ON bets BEGIN
+{_apply(table, keys, "OLD", "-1")}
+{_apply(table, keys, "NEW", "1")}
+END;
+CREATE TRIGGER IF NOT EXISTS trg_bets_delete{suffix} AFTER DELETE ON bets BEGIN
+{_apply(table, keys, "OLD", "-1")}
+END;
+"""
+
+
+TRIGGERS = (_triggers("", "profile_totals", ["profile"], "profile, risk, result, payout, edge_real")
+            + _triggers("_daily", "daily_totals", ["profile", "date"], "profile, date, risk, result, payout, edge_real"))
+TRIGGER_NAMES = [f"trg_bets_{op}{suffix}" for suffix in ("", "_daily") for op in ("insert", "update", "delete")]
+
+_TOTALS_FROM_BETS = """
+    SELECT {keys},
+           COUNT(*)                                                  AS bets,
+           SUM(result = 'W')                                         AS wins,
+           SUM(result = 'L')                                         AS losses,
+           SUM(result = 'Pending')                                   AS pending,
+           SUM(risk)                                                 AS risk,
+           SUM(CASE WHEN result IN ('W', 'L') THEN risk ELSE 0 END)   AS settled_risk,
+           SUM(CASE WHEN result IN ('W', 'L') THEN payout ELSE 0 END) AS settled_payout,
+           COUNT(edge_real)                                          AS reviewed,
+           COALESCE(SUM(edge_real = 1), 0)                           AS edge_real
+    FROM bets GROUP BY {keys}
+"""
+
+
+class Ledger:
+    """One SQLite file shared by every session in the process. Writes are serialized by a lock."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        migrated = self._migrate()
+        self._conn.executescript(TRIGGERS)
+        has_bets = self._conn.execute("SELECT 1 FROM bets LIMIT 1").fetchone()
+        has_totals = self._conn.execute("SELECT 1 FROM profile_totals LIMIT 1").fetchone()
+        has_daily = self._conn.execute("SELECT 1 FROM daily_totals LIMIT 1").fetchone()
+        if has_bets and (migrated or not (has_totals and has_daily)):
+            self.rebuild_totals()
+
+    def _migrate(self):
+        """Add totals columns missing from an older ledger file; its triggers are dropped so they get recreated."""
+        changed = False
+        for table in ("profile_totals", "daily_totals"):
+            have = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for col, decl in _TOTALS_ADDED.items():
+                if col not in have:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
+                    changed = True
+        if changed:
+            for name in TRIGGER_NAMES:
+                self._conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        return changed
+
+    # --- Writes ---
+    def append(self, profile, bet):
+        """Insert one bet dict (keys as in COLUMNS, id optional). Returns the new row id."""
+        return self.append_many(profile, [bet])[0]
+
+    def append_many(self, profile, bets):
+        """Bulk insert in one transaction. Returns new row ids in order."""
+        rows = [_row(profile, b) for b in bets]
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            ids = []
+            for r in rows:
+                cur.execute(
+                    "INSERT INTO bets (profile, date, game, type, grade, risk, result, payout, edge_real, thesis, notes) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", r)
+                ids.append(cur.lastrowid)
+            cur.execute("COMMIT")
+        return ids
+
+    def settle(self, bet_id, result, payout):
+        """Set the result/payout on an existing bet. Returns the bet as it was before the update."""
+        with self._lock:
+            before = self._one(bet_id)
+            if before is None:
+                raise KeyError(f"No bet with id {bet_id}")
+            self._conn.execute("UPDATE bets SET result = ?, payout = ? WHERE id = ?", (result, float(payout), bet_id))
+        return before
+
+    # --- Reads ---
+    def get(self, bet_id):
+        with self._lock:
+            return self._one(bet_id)
+
+    def count(self, profile, grade=None, result=None):
+        where, params = _where(profile, grade, result)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM bets WHERE {where}", params).fetchone()[0]
+
+    def frame(self, profile, limit=None, offset=0, order_by="date", descending=True, grade=None, result=None):
+        """Typed DataFrame of one profile's bets, filtered and sorted in SQL. limit=None loads everything."""
+        if order_by not in SORTABLE:
+            raise ValueError(f"Can't sort ledger by {order_by!r}")
+        where, params = _where(profile, grade, result)
+        direction = "DESC" if descending else "ASC"
+        order = _ORDER_EXPR.get(order_by, order_by)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM bets WHERE {where} ORDER BY {order} {direction}, id {direction}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [int(limit), int(offset)]
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        return _typed(df)
+
+    def grade_stats(self, profile):
+        """{grade: {bets, settled, wins, win_decimal}} -- win_decimal is the mean payout / risk on winners."""
+        sql = ("SELECT grade, COUNT(*), SUM(result IN ('W', 'L')), SUM(result = 'W'), "
+               "AVG(CASE WHEN result = 'W' AND risk > 0 THEN payout / risk END) "
+               "FROM bets WHERE profile = ? GROUP BY grade")
+        with self._lock:
+            rows = self._conn.execute(sql, (profile,)).fetchall()
+        return {g: {"bets": n, "settled": settled, "wins": wins, "win_decimal": dec} for g, n, settled, wins, dec in rows}
+
+    def totals(self):
+        """Materialized per-profile rows, plus derived net, ROI on settled bets and edge accuracy on reviewed bets."""
+        with self._lock:
+            df = pd.read_sql_query("SELECT * FROM profile_totals", self._conn)
+        out = {}
+        for row in df.to_dict("records"):
+            row["net"] = row["settled_payout"] - row["settled_risk"]
+            row["roi"] = (row["net"] / row["settled_risk"] * 100) if row["settled_risk"] > 0 else 0.0
+            row["edge_accuracy"] = (row["edge_real"] / row["reviewed"] * 100) if row["reviewed"] else None
+            out[row["profile"]] = row
+        return out
+
+    def daily(self, profile):
+        """One row per betting day (date, bets, wins, losses, pending, risk, settled_risk, settled_payout), oldest first."""
+        with self._lock:
+            df = pd.read_sql_query("SELECT * FROM daily_totals WHERE profile = ? AND bets > 0 ORDER BY date",
+                                   self._conn, params=[profile])
+        df["date"] = pd.to_datetime(df["date"])
+        return df.drop(columns="profile")
+
+    def risk_on(self, profile, date):
+        """Total risked by a profile on one date (a YYYY-MM-DD string) -- one daily_totals row."""
+        with self._lock:
+            row = self._conn.execute("SELECT risk FROM daily_totals WHERE profile = ? AND date = ?",
+                                     (profile, str(date))).fetchone()
+        return row[0] if row else 0.0
+
+    def rebuild_totals(self):
+        """Recompute profile_totals and daily_totals from scratch. Only needed for ledgers written before the triggers existed."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM profile_totals")
+            self._conn.execute(f"INSERT INTO profile_totals {_TOTALS_FROM_BETS.format(keys='profile')}")
+            self._conn.execute("DELETE FROM daily_totals")
+            self._conn.execute(f"INSERT INTO daily_totals {_TOTALS_FROM_BETS.format(keys='profile, date')}")
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _one(self, bet_id):
+        cur = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM bets WHERE id = ?", (bet_id,))
+        row = cur.fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+
+def _row(profile, b):
+    edge_real = b.get("edge_real")
+    return (profile, str(b["date"]), b["game"], b["type"], b["grade"], float(b.get("risk", 0)),
+            b.get("result", "Pending"), float(b.get("payout", 0)),
+            None if edge_real is None else int(bool(edge_real)), b.get("thesis", ""), b.get("notes", ""))
+
+
+def _where(profile, grade=None, result=None):
+    """grade / result: one value or a list of values (None = any)."""
+    clauses, params = ["profile = ?"], [profile]
+    for col, value in (("grade", grade), ("result", result)):
+        if not value:
+            continue
+        values = [value] if isinstance(value, str) else list(value)
+        clauses.append(f"{col} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    return " AND ".join(clauses), params
+
+
+def _typed(df):
+    df["date"] = pd.to_datetime(df["date"])
+    for col in ("type", "grade", "result"):
+        df[col] = df[col].astype("category")
+    df["edge_real"] = df["edge_real"].astype("boolean")
+    return df
@@ -0,0 +1,206 @@
+"""
+Edge Finder v4 -- Line movement history
+One packed ring buffer per market: (ts, spread, total, ml_away, ml_home) at 24 bytes a tick,
+O(1) append, binary-searched window queries, and the opening line kept separately so
+"move since open" survives the buffer wrapping. Whole store saves to a single .npz.
+
+The spread is stored as the home team's line (teams.home_line), the same convention grading
+and feeds use, so a move stays signed correctly when the away side is favoured or the
+favourite flips.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from feeds import game_id
+from pricing import parse_american, parse_line
+from teams import home_line
+
+TICK_DTYPE = np.dtype([("ts", "f8"), ("spread", "f4"), ("total", "f4"), ("ml_away", "f4"), ("ml_home", "f4")])
+VALUE_FIELDS = TICK_DTYPE.names[1:]
+
+DEFAULT_CAPACITY = 65_536  # ~1.5 MB per market when full -- a season of ticks at one every few minutes
+_INITIAL = 64
+
+
+def tick_values(game):
+    """Game dict (display strings) -> numeric tick values; spread is the home team's line."""
+    spread = home_line(game.get("spread"), game.get("sport"), game["away"], game["home"])
+    return (spread, parse_line(game.get("total")),
+            parse_american(game.get("ml_away", "")), parse_american(game.get("ml_home", "")))
+
+
+def _num(x):
+    x = float(x)
+    return None if x != x else x
+
+
+def _fmt_spread(x):
+    return "PK" if x == 0 else f"{x:+g}"
+
+
+def move_label(game, mv):
+    """LineStore.summary() -> 'Suns: opened +2.5 | now +3.5 (+1.0, +0.5 last hour)', the home side's line."""
+    if mv is None:
+        return "Line history: none yet"
+    if mv["open"] is None or mv["now"] is None:
+        return f"Line history: can't read {game.get('spread')!r} as a {game['home']} line"
+    label = f"{game['home']}: opened {_fmt_spread(mv['open'])} | now {_fmt_spread(mv['now'])}"
+    if mv["since_open"]:
+        label += f" ({mv['since_open']:+.1f}, {mv['last_n'] or 0:+.1f} last hour)"
+    return label
+
+
+class LineHistory:
+    """Ticks for one market. Grows by doubling up to capacity, then overwrites the oldest."""
+
+    __slots__ = ("capacity", "_buf", "_head", "_size", "open")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._buf = np.zeros(min(_INITIAL, capacity), dtype=TICK_DTYPE)
+        self._head = 0  # physical index of the oldest tick
+        self._size = 0
+        self.open = None  # first tick ever recorded
+
+    def __len__(self):
+        return self._size
+
+    def append(self, ts, spread, total, ml_away, ml_home):
+        tick = (ts, spread, total, ml_away, ml_home)
+        if self.open is None:
+            self.open = np.array(tick, dtype=TICK_DTYPE)
+        if self._size == len(self._buf) and self._size < self.capacity:
+            self._grow()
+        if self._size < len(self._buf):
+            self._buf[(self._head + self._size) % len(self._buf)] = tick
+            self._size += 1
+        else:
+            self._buf[self._head] = tick
+            self._head = (self._head + 1) % len(self._buf)
+
+    def _grow(self):
+        new = np.zeros(min(len(self._buf) * 2, self.capacity), dtype=TICK_DTYPE)
+        new[:self._size] = self.ordered()
+        self._buf, self._head = new, 0
+
+    def _at(self, i):
+        return self._buf[(self._head + i) % len(self._buf)]
+
+    def last(self):
+        return self._at(self._size - 1) if self._size else None
+
+    def ordered(self):
+        """Oldest-first copy of the buffered ticks."""
+        idx = (self._head + np.arange(self._size)) % len(self._buf)
+        return self._buf[idx]
+
+    def _first_at_or_after(self, ts, strict=False):
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = self._at(mid)["ts"]
+            if t < ts or (strict and t == ts):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def window(self, since, until=None):
+        """Ticks with since <= ts (< until), oldest first."""
+        start = self._first_at_or_after(since)
+        stop = self._size if until is None else self._first_at_or_after(until)
+        idx = (self._head + np.arange(start, stop)) % len(self._buf)
+        return self._buf[idx]
+
+    def move_since_open(self, field="spread"):
+        if self.open is None:
+            return 0.0
+        return float(self.last()[field] - self.open[field])
+
+    def move_in_last(self, seconds, field="spread", now=None):
+        """Last value minus the value in effect `seconds` ago (or the oldest buffered tick)."""
+        if not self._size:
+            return 0.0
+        now = time.time() if now is None else now
+        i = self._first_at_or_after(now - seconds, strict=True)
+        ref = self._at(max(i - 1, 0))  # last tick at or before the window start
+        return float(self.last()[field] - ref[field])
+
+
+class LineStore:
+    """market id -> LineHistory. Appends come from the ingestion thread; reads from reruns."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._markets = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._markets)
+
+    def get(self, market):
+        return self._markets.get(market)
+
+    def append(self, market, ts, spread, total, ml_away, ml_home):
+        with self._lock:
+            hist = self._markets.get(market)
+            if hist is None:
+                hist = self._markets[market] = LineHistory(self.capacity)
+            hist.append(ts, spread, total, ml_away, ml_home)
+
+    def record(self, snapshot, ts=None):
+        """Append a tick for every game in the snapshot whose numbers differ from its last tick."""
+        ts = snapshot.fetched_at if ts is None else ts
+        for g in snapshot.all_games():
+            key = game_id(g)
+            vals = tick_values(g)
+            hist = self._markets.get(key)
+            last = hist.last() if hist is not None else None
+            if last is not None and np.allclose([last[f] for f in VALUE_FIELDS], vals, equal_nan=True):
+                continue
+            self.append(key, ts, *vals)
+
+    def summary(self, market, field="spread", minutes=60):
+        """
+        {'open', 'now', 'since_open', 'last_n', 'ticks'} for a market, or None if never seen.
+        Spreads are the home team's line; values that couldn't be read are None.
+        """
+        hist = self._markets.get(market)
+        if hist is None or not len(hist):
+            return None
+        with self._lock:
+            return {"open": _num(hist.open[field]), "now": _num(hist.last()[field]),
+                    "since_open": _num(hist.move_since_open(field)),
+                    "last_n": _num(hist.move_in_last(minutes * 60, field)), "ticks": len(hist)}
+
+    # --- Disk snapshot ---
+    def save(self, path):
+        """One compressed .npz: market ids, per-market offsets, opening ticks and all ticks packed end to end."""
+        with self._lock:
+            keys = list(self._markets)
+            chunks = [self._markets[k].ordered() for k in keys]
+            opens = np.array([self._markets[k].open for k in keys], dtype=TICK_DTYPE)
+        lengths = np.array([len(c) for c in chunks], dtype=np.int64)
+        ticks = np.concatenate(chunks) if chunks else np.zeros(0, dtype=TICK_DTYPE)
+        np.savez_compressed(path, keys=np.array(keys, dtype=str), lengths=lengths, opens=opens, ticks=ticks,
+                            capacity=np.int64(self.capacity))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        store = cls(int(data["capacity"]))
+        offsets = np.concatenate(([0], np.cumsum(data["lengths"])))
+        ticks = data["ticks"]
+        for i, key in enumerate(data["keys"]):
+            chunk = ticks[offsets[i]:offsets[i + 1]]
+            hist = LineHistory(store.capacity)
+            size = len(chunk)
+            hist._buf = np.zeros(max(min(size, store.capacity), 1), dtype=TICK_DTYPE)
+            hist._buf[:size] = chunk
+            hist._size = size
+            hist.open = data["opens"][i].copy()
+            store._markets[str(key)] = hist
+        return store
@@ -0,0 +1,263 @@
+"""
+Edge Finder v4 -- Metrics
+Counters, gauges and fixed-bucket histograms in one process-wide registry, rendered in
+Prometheus text format. Recording is a bisect and a few additions under a lock, cheap
+enough for every request and rerun section.
+
+    with timed("rerun", section="slate"): ...      # edge_section_seconds{kind="rerun",section="slate"}
+
+server.py exposes the registry at /metrics; the Streamlit process can serve its own with
+start_http_server() (EDGE_METRICS_PORT).
+"""
+
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _num(v):
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {labels!r}")
+        return labels
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1.0):
+        labels = self._key(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Set / inc / dec, or set_function() for a value read at scrape time (e.g. slate age)."""
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._fn = None
+
+    def set(self, value, *labels):
+        labels = self._key(labels)
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def inc(self, *labels, amount=1.0):
+        labels = self._key(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount=1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, fn):
+        self._fn = fn
+
+    def render(self):
+        if self._fn is not None:
+            return self.header() + [f"{self.name} {_num(float(self._fn()))}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        labels = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((k, ([*counts], total, n)) for k, (counts, total, n) in self._values.items())
+        out = self.header()
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, n) in items:
+            running = 0
+            for bound, c in zip(self.buckets + (math.inf,), counts):
+                running += c
+                out.append(f"{self.name}_bucket{_labels(names, labels + (_num(bound),))} {running}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(total)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, labels)} {n}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name!r} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._get(Counter, name, help, labelnames=labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._get(Gauge, name, help, labelnames=labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help, labelnames=labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+SECTION_SECONDS = REGISTRY.histogram("edge_section_seconds", "Time spent in instrumented hot paths.",
+                                     ("kind", "section"))
+
+
+# --- Timer API ---
+@contextmanager
+def timed(kind, section=""):
+    """Record the block's wall time in edge_section_seconds{kind, section}, even if it raises."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        SECTION_SECONDS.observe(time.perf_counter() - t0, kind, section)
+
+
+def observe(kind, section, seconds):
+    """Record a duration measured elsewhere (e.g. a streamed call's time to first token)."""
+    SECTION_SECONDS.observe(seconds, kind, section)
+
+
+# --- ASGI middleware ---
+_PARAM = re.compile(r"{(\w+)(?::\w+)?}")
+
+
+def route_label(scope):
+    """Route template ('/api/v1/slate/{sport}'), not the raw path, so label cardinality stays bounded.
+    Included routers may report their template without the prefix; recover it from the request path."""
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return "unmatched"
+    params = scope.get("path_params", {})
+    filled = _PARAM.sub(lambda m: str(params.get(m.group(1), "")), template)
+    path = scope.get("path", "")
+    prefix = path[:-len(filled)] if filled and path.endswith(filled) else ""
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """Per-route request latency and response size histograms, plus an in-flight gauge."""
+
+    def __init__(self, app, registry=REGISTRY):
+        self.app = app
+        self.latency = registry.histogram("edge_http_request_seconds", "HTTP request latency.",
+                                          ("method", "route", "status"))
+        self.size = registry.histogram("edge_http_response_bytes", "HTTP response body size (as sent).",
+                                       ("method", "route"), buckets=SIZE_BUCKETS)
+        self.in_flight = registry.gauge("edge_http_requests_in_flight", "HTTP requests being served.")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        t0 = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route = route_label(scope)
+            self.latency.observe(time.perf_counter() - t0, scope["method"], route, str(state["status"]))
+            self.size.observe(state["bytes"], scope["method"], route)
+
+
+# --- Standalone exporter (Streamlit process) ---
+def start_http_server(port, registry=REGISTRY, addr="0.0.0.0"):
+    """Serve registry.render() at /metrics on a daemon thread. Returns the server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -0,0 +1,180 @@
+"""
+Edge Finder v4 -- Slate-wide parlay optimizer
+Enumerates every 2-4 leg parlay across spread / total / ML markets on the slate,
+prunes weak legs and same-game conflicts before anything is built, and keeps the
+top-K by expected value in a bounded heap.
+
+Search is array-backed: games are laid out as a padded (games x markets) leg table,
+so each chunk of game combinations expands to all market choices with one fancy index.
+One leg per game is enforced by construction -- no over+under or spread+ML on the same game.
+"""
+
+import heapq
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from pricing import parse_american, implied_probability, price_parlays
+
+MARKETS = ("Spread", "Total (Over)", "Total (Under)", "Moneyline")
+GRADE_ORDER = ["A", "B+", "B", "B-", "C", "D", "F"]
+
+# Model edge over the no-vig price, by grade. Default is D -- no edge.
+GRADE_EDGE = {"A": 0.06, "B+": 0.045, "B": 0.03, "B-": 0.02, "C": 0.01, "D": 0.0, "F": -0.02}
+
+MAX_LEGS = 4
+CHUNK_ROWS = 250_000  # expanded parlay rows per chunk, keeps peak memory flat
+
+
+def grade_at_least(grade, floor):
+    """True if grade is floor or better. Unknown grades rank as F."""
+    rank = GRADE_ORDER.index(grade) if grade in GRADE_ORDER else len(GRADE_ORDER)
+    return rank <= GRADE_ORDER.index(floor)
+
+
+def make_leg(game, bet_type):
+    """Parlay leg dict in the shape the builder stores in parlay_legs."""
+    if bet_type == "Moneyline":
+        odds = game.get("ml_home", "-110")
+        pick = f"{game['home']} ML {odds}"
+    elif bet_type == "Total (Over)":
+        odds = "-110"
+        pick = f"O {game['total']}"
+    elif bet_type == "Total (Under)":
+        odds = "-110"
+        pick = f"U {game['total']}"
+    else:
+        odds = "-110"
+        pick = game["spread"]
+    return {"game": f"{game['away']} @ {game['home']}", "type": bet_type, "spread": game["spread"],
+            "edge": game["edge"], "odds": odds, "pick": pick}
+
+
+def _fair_probability(game, bet_type):
+    """No-vig win probability for a market. Only ML carries two-sided prices in the demo feed."""
+    if bet_type == "Moneyline":
+        p_home = float(implied_probability(parse_american(game.get("ml_home", "-110"))))
+        p_away = float(implied_probability(parse_american(game.get("ml_away", "-110"))))
+        return p_home / (p_home + p_away)
+    return 0.5
+
+
+def slate_legs(games, min_grade="B+", markets=MARKETS):
+    """Expand games into candidate legs, dropping anything below min_grade up front."""
+    legs = []
+    for gi, g in enumerate(games):
+        if not grade_at_least(g.get("edge", "D"), min_grade):
+            continue
+        for m in markets:
+            leg = make_leg(g, m)
+            leg["_game"] = gi
+            leg["_prob"] = min(max(_fair_probability(g, m) + GRADE_EDGE.get(g["edge"], 0.0), 0.01), 0.99)
+            legs.append(leg)
+    return legs
+
+
+def _leg_table(legs):
+    """(n_games, max_markets) table of leg indices, -1 padded, plus flat odds/prob arrays."""
+    game_ids = sorted({leg["_game"] for leg in legs})
+    pos = {gid: i for i, gid in enumerate(game_ids)}
+    width = max((sum(1 for leg in legs if leg["_game"] == gid) for gid in game_ids), default=0)
+    table = np.full((len(game_ids), width), -1, dtype=np.int64)
+    fill = np.zeros(len(game_ids), dtype=np.int64)
+    for li, leg in enumerate(legs):
+        r = pos[leg["_game"]]
+        table[r, fill[r]] = li
+        fill[r] += 1
+    odds = np.array([parse_american(leg["odds"]) for leg in legs], dtype=np.float64)
+    prob = np.array([leg["_prob"] for leg in legs], dtype=np.float64)
+    return table, odds, prob
+
+
+def _search_chunk(table, odds, prob, game_combos, top_k):
+    """Score every market choice for a block of game combinations -> [(ev, leg_idx_tuple)]."""
+    k = game_combos.shape[1]
+    choices = np.array(list(itertools.product(range(table.shape[1]), repeat=k)), dtype=np.int64)
+    idx = table[game_combos[:, None, :], choices[None, :, :]].reshape(-1, k)
+    idx = idx[(idx >= 0).all(axis=1)]
+    if not len(idx):
+        return []
+    decimal = price_parlays(odds[idx])["decimal"]
+    ev = prob[idx].prod(axis=1) * decimal - 1.0
+    if len(ev) > top_k:
+        top = np.argpartition(-ev, top_k - 1)[:top_k]
+    else:
+        top = np.arange(len(ev))
+    return [(float(ev[i]), tuple(int(x) for x in idx[i])) for i in top]
+
+
+def _chunks(n_games, width, leg_counts):
+    """Yield (k, game_combos) blocks sized so each expands to about CHUNK_ROWS parlays."""
+    for k in leg_counts:
+        if k > n_games:
+            continue
+        per_combo = max(width ** k, 1)
+        step = max(CHUNK_ROWS // per_combo, 1)
+        combos = itertools.combinations(range(n_games), k)
+        while True:
+            block = np.fromiter(itertools.chain.from_iterable(itertools.islice(combos, step)), dtype=np.int64)
+            if not len(block):
+                break
+            yield block.reshape(-1, k)
+
+
+def count_candidates(games, min_grade="B+", leg_counts=(2, 3, 4)):
+    """Upper bound on parlays the search will score (before padding is dropped)."""
+    legs = slate_legs(games, min_grade)
+    if not legs:
+        return 0
+    table, _, _ = _leg_table(legs)
+    return sum(comb(table.shape[0], k) * table.shape[1] ** k for k in leg_counts)
+
+
+def optimize(games, top_k=10, min_grade="B+", leg_counts=(2, 3, 4), workers=None):
+    """
+    Top-K parlays on the slate by expected value per unit staked.
+
+    workers: None/1 runs in-process; >1 fans chunks out to a process pool.
+    Returns list of dicts (best first): legs, american, decimal, win_prob, break_even, ev.
+    """
+    leg_counts = tuple(k for k in leg_counts if 2 <= k <= MAX_LEGS)
+    legs = slate_legs(games, min_grade)
+    if not legs or not leg_counts:
+        return []
+    table, odds, prob = _leg_table(legs)
+    chunks = _chunks(table.shape[0], table.shape[1], leg_counts)
+
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_search_chunk, table, odds, prob, c, top_k) for c in chunks]
+            results = (f.result() for f in futures)
+            heap = _merge_top(results, top_k)
+    else:
+        heap = _merge_top((_search_chunk(table, odds, prob, c, top_k) for c in chunks), top_k)
+
+    out = []
+    for ev, idx in sorted(heap, reverse=True):
+        priced = price_parlays([odds[list(idx)]])
+        out.append({
+            "legs": [{k: v for k, v in legs[i].items() if not k.startswith("_")} for i in idx],
+            "american": float(priced["american"][0]),
+            "decimal": float(priced["decimal"][0]),
+            "win_prob": float(prob[list(idx)].prod()),
+            "break_even": float(priced["break_even"][0]),
+            "ev": ev,
+        })
+    return out
+
+
+def _merge_top(results, top_k):
+    """Bounded min-heap over per-chunk winners."""
+    heap = []
+    for chunk in results:
+        for item in chunk:
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+    return heap
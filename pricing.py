@@ -0,0 +1,86 @@
+"""
+Edge Finder v4 -- Parlay pricing
+American odds -> decimal / implied probability, combined parlay odds, payout and break-even.
+Everything is vectorized so a whole batch of candidate parlays prices in one NumPy call.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+STANDARD_ODDS = -110.0
+
+
+@lru_cache(maxsize=4096)
+def parse_american(odds):
+    """'+135', '-110', 135 -> float. Blank, 'EVEN' or junk falls back to standard -110."""
+    if isinstance(odds, (int, float)) and not isinstance(odds, bool):
+        return float(odds) if abs(odds) >= 100 else STANDARD_ODDS
+    s = str(odds).strip().upper()
+    if s in ("EV", "EVEN", "EVS"):
+        return 100.0
+    try:
+        val = float(s.replace("+", ""))
+    except ValueError:
+        return STANDARD_ODDS
+    return val if abs(val) >= 100 else STANDARD_ODDS
+
+
+def parse_line(line):
+    """'BOS -6.5' -> -6.5, '228.5' -> 228.5. Missing or junk -> NaN."""
+    try:
+        return float(str(line).split()[-1])
+    except (ValueError, IndexError):
+        return float("nan")
+
+
+def american_to_decimal(american):
+    """American odds (array-like) -> decimal odds. NaN passes through as NaN."""
+    a = np.asarray(american, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(a > 0, 1.0 + a / 100.0, 1.0 + 100.0 / np.abs(a))
+
+
+def decimal_to_american(decimal):
+    """Decimal odds (array-like) -> American odds. +100 and up for >= 2.0, negative below."""
+    d = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(d >= 2.0, (d - 1.0) * 100.0, -100.0 / (d - 1.0))
+
+
+def implied_probability(american):
+    """American odds (array-like) -> implied win probability (vig included)."""
+    return 1.0 / american_to_decimal(american)
+
+
+def price_parlays(odds, stake=1.0):
+    """
+    Price a batch of parlays in one pass.
+
+    odds: 2D array (n_parlays, max_legs) of American odds. Pad shorter parlays with NaN.
+    stake: scalar or per-parlay array.
+    Returns dict of arrays: decimal, american, payout (profit on stake), break_even.
+    """
+    a = np.atleast_2d(np.asarray(odds, dtype=np.float64))
+    dec = np.nan_to_num(american_to_decimal(a), nan=1.0)
+    combined = dec.prod(axis=1)
+    return {
+        "decimal": combined,
+        "american": decimal_to_american(combined),
+        "payout": np.asarray(stake, dtype=np.float64) * (combined - 1.0),
+        "break_even": 1.0 / combined,
+    }
+
+
+def price_parlay(leg_odds, stake=1.0):
+    """Single parlay from a list of leg odds (strings or numbers) -> dict of floats."""
+    if not leg_odds:
+        return {"decimal": 1.0, "american": 0.0, "payout": 0.0, "break_even": 1.0}
+    priced = price_parlays([[parse_american(o) for o in leg_odds]], stake)
+    return {k: float(v[0]) for k, v in priced.items()}
+
+
+def format_american(american):
+    """-104.7 -> '-105', 484.6 -> '+485'."""
+    val = int(round(float(american)))
+    return f"+{val}" if val > 0 else str(val)
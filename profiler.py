@@ -0,0 +1,115 @@
+"""
+Edge Finder v4 -- Rerun profiler
+Opt-in per-session timing of named sections of one Streamlit rerun (perf_counter), with an
+optional cProfile sample of the whole run. Off by default: section() is a shared no-op context.
+
+    ?profile=1          section timings in the sidebar
+    ?profile=cprofile   plus the top functions by cumulative time
+    EDGE_PROFILE secret / env var sets the same modes for every session.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+
+MODES = {"1": "sections", "true": "sections", "sections": "sections", "cprofile": "cprofile"}
+TOP_FUNCTIONS = 15
+
+_NOOP = nullcontext()
+
+
+def parse_mode(value):
+    """'1' / 'sections' / 'cprofile' -> mode, anything else -> None."""
+    return MODES.get(str(value or "").strip().lower())
+
+
+class RerunProfiler:
+    """Collects one rerun. Nested sections are recorded as 'outer/inner'."""
+
+    def __init__(self, mode=None, label=""):
+        self.mode = mode
+        self.label = label
+        self.sections = {}  # name -> [total_s, calls]
+        self._stack = []
+        self._t0 = time.perf_counter()
+        self._cprofile = None
+        self.note = ""
+        self.finished = False
+        if mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError:  # another session's profile is active (3.12+ allows one per process)
+                self._cprofile = None
+                self.note = "cProfile busy in another session -- sections only"
+
+    @property
+    def enabled(self):
+        return self.mode is not None
+
+    def section(self, name):
+        return self._section(name) if self.mode else _NOOP
+
+    @contextmanager
+    def _section(self, name):
+        self._stack.append(name)
+        key = "/".join(self._stack)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._stack.pop()
+            entry = self.sections.setdefault(key, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+    def close(self):
+        """Stop cProfile if it is still sampling. Safe to call more than once."""
+        if self._cprofile is not None and not self.finished:
+            self._cprofile.disable()
+        self.finished = True
+
+    def finish(self):
+        """Stop sampling and return the report dict (JSON-serializable)."""
+        total = time.perf_counter() - self._t0
+        self.close()
+        report = {
+            "ts": time.time(),
+            "label": self.label,
+            "mode": self.mode,
+            "total_ms": round(total * 1000, 3),
+            "sections": sorted(
+                ({"name": k, "ms": round(s * 1000, 3), "calls": n, "pct": round(100 * s / total, 1) if total else 0.0}
+                 for k, (s, n) in self.sections.items()),
+                key=lambda r: r["ms"], reverse=True),
+        }
+        if self._cprofile is not None:
+            report["functions"] = top_functions(self._cprofile)
+        if self.note:
+            report["note"] = self.note
+        return report
+
+
+def top_functions(prof, limit=TOP_FUNCTIONS):
+    """[{'function', 'calls', 'tottime_ms', 'cumtime_ms'}] sorted by cumulative time."""
+    stats = pstats.Stats(prof, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{func} ({filename.rsplit('/', 1)[-1]}:{line})", "calls": ncalls,
+                     "tottime_ms": round(tottime * 1000, 3), "cumtime_ms": round(cumtime * 1000, 3)})
+    rows.sort(key=lambda r: r["cumtime_ms"], reverse=True)
+    return rows[:limit]
+
+
+def dumps(reports):
+    return json.dumps(reports, indent=1)
+
+
+def append_log(path, report):
+    """One JSON line per rerun, so regressions can be diffed across deploys."""
+    with open(path, "a") as fh:
+        fh.write(json.dumps(report) + "\n")
@@ -0,0 +1,151 @@
+"""
+Edge Finder v4 -- Profile store
+Bankroll, parlay legs and chat history per profile, persisted across reloads and shared by
+every session in the process (two tabs on one profile see the same bankroll).
+
+Reads come from an in-process cache; a profile is loaded from SQLite the first time it is
+asked for. Writes are write-behind: the app mutates the cached dict and calls touch(), a
+background thread wakes after FLUSH_INTERVAL, serializes every touched profile and commits
+them in one transaction. A rerun never waits on the disk. Pending writes are flushed on
+close() and at interpreter exit.
+
+Bet history is not here -- it lives in the ledger (ledger.py).
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from metrics import timed
+
+DEFAULT_PATH = os.getenv("EDGE_PROFILES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles.db"))
+FLUSH_INTERVAL = float(os.getenv("EDGE_PROFILES_FLUSH_INTERVAL", "0.5"))  # seconds a touch may wait before commit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name       TEXT PRIMARY KEY,
+    data       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class ProfileStore:
+    """Lazily loaded, write-behind profile cache over one SQLite table.
+
+    `default` builds a new profile dict; stored profiles are merged over it, so keys added
+    to the default later show up in old rows.
+    """
+
+    def __init__(self, default, path=DEFAULT_PATH, interval=FLUSH_INTERVAL):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.interval = interval
+        self._default = default
+        self._cache = {}
+        self._dirty = set()
+        self._lock = threading.Lock()        # cache + dirty set
+        self._db_lock = threading.Lock()     # the connection
+        self._wake = threading.Event()
+        self._closed = False
+        self.stats = {"flushes": 0, "written": 0, "errors": 0, "last_error": None, "last_flush_ms": None}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._thread = threading.Thread(target=self._run, name="profile-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- Reads ---
+    def get(self, name):
+        """The live profile dict. Mutate it in place, then touch(name)."""
+        data = self._cache.get(name)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self._cache.get(name)
+            if data is None:
+                data = self._cache[name] = self._load(name)
+        return data
+
+    def _load(self, name):
+        data = self._default()
+        with self._db_lock:
+            row = self._conn.execute("SELECT data FROM profiles WHERE name = ?", (name,)).fetchone()
+        if row:
+            data.update(json.loads(row[0]))
+        return data
+
+    # --- Writes ---
+    def touch(self, name):
+        """Queue `name` for the next batch. O(1); never touches the disk."""
+        with self._lock:
+            self._dirty.add(name)
+        self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._dirty)
+
+    def flush(self):
+        """Commit every touched profile in one transaction. Returns how many were written."""
+        with self._lock:
+            names, self._dirty = self._dirty, set()
+        if not names:
+            return 0
+        rows = []
+        for name in names:
+            try:
+                # A session may be mutating the dict right now; if it changes size mid-dump, retry next batch.
+                rows.append((name, json.dumps(self._cache[name]), time.time()))
+            except RuntimeError:
+                self.touch(name)
+        if not rows:
+            return 0
+        try:
+            with timed("profiles", "flush"), self._db_lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO profiles (name, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at", rows)
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            with self._db_lock:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+            with self._lock:
+                self._dirty.update(n for n, _, _ in rows)
+            self.stats["errors"] += 1
+            self.stats["last_error"] = str(e)
+            return 0
+        self.stats["flushes"] += 1
+        self.stats["written"] += len(rows)
+        return len(rows)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            time.sleep(self.interval)  # let a burst of touches land in one batch
+            self._wake.clear()
+            t0 = time.perf_counter()
+            if self.flush():
+                self.stats["last_flush_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+
+    def close(self):
+        """Stop the writer and flush whatever is still queued."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=self.interval + 5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+        atexit.unregister(self.close)
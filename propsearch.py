@@ -0,0 +1,246 @@
+"""
+Edge Finder v4 -- Player prop search
+Indexes the prop board once so each keystroke is a lookup, not a scan.
+Every word in a prop's player, team, prop type and sport lands in a vocabulary. The vocabulary
+has a trigram inverted index, so a query word resolves to exact, prefix ("jok") and misspelled
+("jokich") tokens. Each token and each facet value (sport, team, prop, grade) maps to a bitmap
+of prop ids (a Python int), so combining words and filters is a few ANDs / ORs; only the final
+hits are scored and ranked.
+
+sync() diffs a new board against the indexed one and touches only the props that changed.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from itertools import chain, islice
+
+from chat import normalize_prompt
+from intents import trigrams
+
+FIELDS = {"player": 1.0, "team": 0.8, "prop": 0.7, "sport": 0.5}  # text field -> rank weight
+FACETS = {"sport": "sport", "team": "team", "prop": "prop", "grade": "edge"}  # facet -> prop key
+FUZZY_MIN = 0.5      # Dice similarity between a query word's trigrams and a token's
+PREFIX_SCORE = 0.9   # "jok" -> "jokic"; an exact token scores 1.0
+
+
+def prop_key(prop):
+    """Identity of a prop across board updates: the line and grade may move, this does not."""
+    return (prop.get("sport"), prop.get("team"), prop["player"], prop["prop"])
+
+
+def _tokens(text):
+    return normalize_prompt(str(text or "")).split()
+
+
+def _indexed(prop):
+    """Everything that decides where a prop sits in the index."""
+    return tuple(prop.get(k) for k in ("player", "team", "prop", "sport", "edge"))
+
+
+def _fingerprint(props):
+    """Which prop dicts, in which order. Indexed dicts stay referenced, so their ids can't be reused."""
+    return len(props), hash(tuple(map(id, props)))
+
+
+def _bits(mask):
+    """Set bit positions of an int, lowest first."""
+    s = bin(mask)[:1:-1]
+    i = s.find("1")
+    while i >= 0:
+        yield i
+        i = s.find("1", i + 1)
+
+
+class PropIndex:
+    """Trigram-fuzzy text search plus facet bitmaps over a prop board. Safe to share across sessions."""
+
+    def __init__(self, props=()):
+        self._docs = {}                       # doc id -> prop
+        self._pos = {}                        # doc id -> position on the board (tie-break order)
+        self._ids = {}                        # prop_key -> doc id
+        self._free = []                       # recycled doc ids
+        self._postings = {f: {} for f in FIELDS}   # field -> token -> bitmap
+        self._facets = {f: {} for f in FACETS}     # facet -> value -> bitmap
+        self._refs = Counter()                # token -> (doc, field) occurrences
+        self._vocab = []                      # sorted tokens, for prefix lookups
+        self._grams = defaultdict(set)        # trigram -> tokens
+        self._sizes = {}                      # token -> trigram count
+        self._all = 0
+        self._ordered = True                  # doc ids already follow board order
+        self._fingerprint = None
+        self._lock = threading.Lock()
+        self.sync(props)
+
+    def __len__(self):
+        return len(self._docs)
+
+    # --- Maintenance ---
+    def sync(self, props):
+        """Bring the index in line with `props`. Returns {'added', 'removed', 'updated'} counts.
+
+        Only changed props are reindexed, and a board holding the same prop dicts in the same
+        order as last time (the same list, even if it was edited in place and edited back) is
+        skipped after an O(n) fingerprint. Props are read as values: to change one, put a new
+        dict in the list (as regrade_props does) rather than editing it in place.
+        """
+        fingerprint = _fingerprint(props)
+        if fingerprint == self._fingerprint:
+            return {"added": 0, "removed": 0, "updated": 0}
+        counts = {"added": 0, "removed": 0, "updated": 0}
+        with self._lock:
+            seen = set()
+            for pos, prop in enumerate(props):
+                key = prop_key(prop)
+                seen.add(key)
+                doc = self._ids.get(key)
+                if doc is None:
+                    self._add(key, prop, pos)
+                    counts["added"] += 1
+                    continue
+                if _indexed(self._docs[doc]) != _indexed(prop):
+                    self._remove(key)
+                    self._add(key, prop, pos)
+                    counts["updated"] += 1
+                else:
+                    self._docs[doc] = prop  # line / reason changed: nothing to reindex
+                    self._pos[doc] = pos
+            for key in [k for k in self._ids if k not in seen]:
+                self._remove(key)
+                counts["removed"] += 1
+            docs = sorted(self._pos)
+            self._ordered = all(self._pos[a] < self._pos[b] for a, b in zip(docs, docs[1:]))
+            self._fingerprint = fingerprint
+        return counts
+
+    def _add(self, key, prop, pos):
+        doc = self._free.pop() if self._free else len(self._docs)
+        bit = 1 << doc
+        self._docs[doc], self._pos[doc], self._ids[key] = prop, pos, doc
+        self._all |= bit
+        for field in FIELDS:
+            for tok in set(_tokens(prop.get(field))):
+                postings = self._postings[field]
+                postings[tok] = postings.get(tok, 0) | bit
+                self._ref(tok, 1)
+        for facet, attr in FACETS.items():
+            values = self._facets[facet]
+            values[prop.get(attr)] = values.get(prop.get(attr), 0) | bit
+
+    def _remove(self, key):
+        doc = self._ids.pop(key)
+        prop = self._docs.pop(doc)
+        del self._pos[doc]
+        keep = ~(1 << doc)
+        self._all &= keep
+        for field in FIELDS:
+            postings = self._postings[field]
+            for tok in set(_tokens(prop.get(field))):
+                postings[tok] &= keep
+                if not postings[tok]:
+                    del postings[tok]
+                self._ref(tok, -1)
+        for facet, attr in FACETS.items():
+            values = self._facets[facet]
+            values[prop.get(attr)] &= keep
+            if not values[prop.get(attr)]:
+                del values[prop.get(attr)]
+        self._free.append(doc)
+
+    def _ref(self, tok, delta):
+        self._refs[tok] += delta
+        if delta > 0 and self._refs[tok] == 1:
+            insort(self._vocab, tok)
+            grams = trigrams(tok)
+            self._sizes[tok] = len(grams)
+            for g in grams:
+                self._grams[g].add(tok)
+        elif self._refs[tok] == 0:
+            del self._refs[tok], self._sizes[tok]
+            del self._vocab[bisect_left(self._vocab, tok)]
+            for g in trigrams(tok):
+                self._grams[g].discard(tok)
+                if not self._grams[g]:
+                    del self._grams[g]
+
+    # --- Lookup ---
+    def expand(self, word):
+        """{token: similarity} for every vocabulary token a query word could mean."""
+        found = {}
+        i = bisect_left(self._vocab, word)
+        while i < len(self._vocab) and self._vocab[i].startswith(word):
+            found[self._vocab[i]] = 1.0 if self._vocab[i] == word else PREFIX_SCORE
+            i += 1
+        if len(word) >= 3:
+            grams = trigrams(word)
+            shared = Counter(chain.from_iterable(self._grams.get(g, ()) for g in grams))
+            sizes = self._sizes
+            for tok, n in shared.items():
+                score = 2 * n / (len(grams) + sizes[tok])
+                if score >= FUZZY_MIN and score > found.get(tok, 0.0):
+                    found[tok] = score
+        return found
+
+    def facet_counts(self, facet, mask=None):
+        """{value: props} for a facet, optionally within a result bitmap."""
+        with self._lock:
+            return {v: (bm & mask if mask is not None else bm).bit_count()
+                    for v, bm in self._facets[facet].items()}
+
+    def search(self, query="", limit=None, **filters):
+        """Props matching every word of `query` (fuzzily) and every facet filter, best first.
+
+        filters are facet=value (sport="NBA", grade="A"); None or "All" means no filter.
+        With no query the board order is kept; ties in score also fall back to it.
+        """
+        with self._lock:
+            mask = self._all
+            for facet, value in filters.items():
+                if value not in (None, "All"):
+                    mask &= self._facets[facet].get(value, 0)
+            words = _tokens(query)
+            if not words:
+                return [self._docs[d] for d in islice(self._in_order(mask), limit)]
+            # Per word: [(bitmap, score)] with the docs each match score reaches, best score first.
+            matches = []
+            for word in words:
+                by_score = defaultdict(int)
+                for tok, sim in self.expand(word).items():
+                    for field, weight in FIELDS.items():
+                        bm = self._postings[field].get(tok)
+                        if bm:
+                            by_score[round(sim * weight, 4)] |= bm
+                tiers = sorted(((bm, score) for score, bm in by_score.items()), key=lambda t: t[1], reverse=True)
+                union = 0
+                for bm, _ in tiers:
+                    union |= bm
+                mask &= union
+                matches.append(tiers)
+                if not mask:
+                    return []
+            if len(matches) == 1:
+                # One word: walk the score tiers and stop once `limit` props are out.
+                out, left = [], mask
+                for bm, _ in matches[0]:
+                    hit = bm & left
+                    if hit:
+                        left &= ~hit
+                        out.extend(islice(self._in_order(hit), None if limit is None else limit - len(out)))
+                        if limit is not None and len(out) >= limit:
+                            break
+                return [self._docs[d] for d in out]
+            scores = defaultdict(float)
+            for tiers in matches:
+                left = mask
+                for bm, score in tiers:
+                    hit = bm & left
+                    if hit:
+                        for doc in _bits(hit):
+                            scores[doc] += score
+                        left &= ~hit
+            docs = sorted(_bits(mask), key=lambda d: (-scores[d], self._pos[d]))
+            return [self._docs[d] for d in docs[:limit]]
+
+    def _in_order(self, mask):
+        """Doc ids of a bitmap in board order."""
+        return _bits(mask) if self._ordered else iter(sorted(_bits(mask), key=self._pos.__getitem__))
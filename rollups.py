@@ -0,0 +1,93 @@
+"""
+Edge Finder v4 -- P/L rollups
+Daily, weekly and monthly P/L, running balance and rolling ROI for one profile, computed from
+the ledger's daily_totals table (one row per betting day, kept current by triggers on every
+log/settle) instead of hand-entered weekly numbers.
+
+Everything here is a vectorized pandas group-by over those day rows, so the cost follows the
+number of days bet, not the number of bets. Long histories are thinned with downsample()
+before they reach the chart.
+"""
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOWS = (7, 30)   # days, for rolling ROI
+MAX_BARS = 52               # weekly bars beyond this switch the chart to monthly
+MAX_POINTS = 500            # balance-line points handed to Plotly
+
+_RULES = {"D": "D", "W": "W-SUN", "M": "MS"}
+
+
+def daily_pl(daily, starting=0.0):
+    """
+    Ledger.daily() rows -> one row per calendar day with net, running balance and rolling ROI.
+
+    Days without bets are filled with zeros so rolling windows are in calendar days. `balance`
+    is starting + cumulative settled net; roi_7d / roi_30d are rolling net over rolling settled
+    risk, in percent (NaN until something in the window has settled).
+    """
+    cols = ["bets", "wins", "losses", "pending", "risk", "settled_risk", "settled_payout"]
+    if daily.empty:
+        out = pd.DataFrame(columns=cols + ["net", "balance"], index=pd.DatetimeIndex([], name="date"))
+        for w in ROLLING_WINDOWS:
+            out[f"roi_{w}d"] = []
+        return out
+    df = daily.set_index("date")[cols].asfreq("D", fill_value=0)
+    df["net"] = df["settled_payout"] - df["settled_risk"]
+    df["balance"] = starting + df["net"].cumsum()
+    for w in ROLLING_WINDOWS:
+        risk = df["settled_risk"].rolling(w, min_periods=1).sum()
+        df[f"roi_{w}d"] = (df["net"].rolling(w, min_periods=1).sum() / risk.where(risk > 0)) * 100
+    return df
+
+
+def rollup(days, period="W"):
+    """
+    daily_pl() rows -> one row per day ("D"), week ("W", Monday-Sunday) or month ("M").
+
+    Columns: label, bets, record, risk, settled_risk, net, roi, starting, ending.
+    Periods with no bets are dropped.
+    """
+    if days.empty:
+        return pd.DataFrame(columns=["label", "bets", "record", "risk", "settled_risk", "net", "roi", "starting", "ending"])
+    g = days.resample(_RULES[period], label="left" if period == "M" else "right")
+    out = g[["bets", "wins", "losses", "risk", "settled_risk", "net"]].sum()
+    out["ending"] = g["balance"].last()
+    out["starting"] = out["ending"] - out["net"]
+    out = out[out["bets"] > 0]
+    out["roi"] = (out["net"] / out["settled_risk"].where(out["settled_risk"] > 0)) * 100
+    out["record"] = out["wins"].astype(int).astype(str) + "-" + out["losses"].astype(int).astype(str)
+    if period == "W":
+        starts = out.index - pd.Timedelta(days=6)
+        out["label"] = [s.strftime("%b %d") for s in starts]
+    elif period == "M":
+        out["label"] = out.index.strftime("%b %Y")
+    else:
+        out["label"] = out.index.strftime("%Y-%m-%d")
+    return out[["label", "bets", "record", "risk", "settled_risk", "net", "roi", "starting", "ending"]]
+
+
+def chart_period(days, max_bars=MAX_BARS):
+    """Weekly bars unless that would draw more than max_bars, then monthly."""
+    if days.empty:
+        return "W"
+    weeks = (days.index[-1] - days.index[0]).days // 7 + 1
+    return "W" if weeks <= max_bars else "M"
+
+
+def downsample(series, max_points=MAX_POINTS):
+    """
+    Thin a time series to about max_points, keeping each bucket's low and high so swings and
+    drawdowns still show. Short series are returned as is.
+    """
+    n = len(series)
+    if n <= max_points:
+        return series
+    size = -(-n // max(max_points // 2, 1))             # points per bucket
+    values = np.full(-(-n // size) * size, np.nan)
+    values[:n] = series.to_numpy(dtype=float)
+    values = values.reshape(-1, size)
+    base = np.arange(len(values)) * size
+    keep = np.concatenate((base + np.nanargmin(values, axis=1), base + np.nanargmax(values, axis=1), [0, n - 1]))
+    return series.iloc[np.unique(keep)]
@@ -1,8 +1,57 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+"""
+Edge Finder v4 -- Demo web server
+Serves the wizard page and a versioned JSON API over the shared slate snapshot.
+API bodies are encoded once per snapshot (orjson when installed) and kept precompressed
+(gzip, brotli when installed) with a strong ETag, so a client polling an unchanged slate
+gets a 304 and a changed one costs a dict lookup.
+
+Static files come from the precompressed build (static_build.py), held in memory and
+revalidated by ETag, so a reload of an unchanged page is a 304.
+
+/metrics is Prometheus text (per-route latency / size histograms, in-flight requests, slate
+age and hot-path timers); /ready fails once the odds feed stops confirming the slate.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from demo_data import DEMO_PROPS
+from feeds import SPORTS, SlateStore, game_id, start_feed
+from grading import regrade_props
+from linemoves import LineStore, move_label
+from metrics import CONTENT_TYPE as METRICS_TYPE, REGISTRY, MetricsMiddleware
+from static_build import OUT as STATIC_DIST, load_or_build
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:  # optional -- stdlib json is ~5x slower on the slate
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+try:
+    import brotli
+except ImportError:  # optional -- gzip only
+    brotli = None
+
+API_VERSION = 1
+MIN_COMPRESS = 512  # bytes; smaller bodies go out as-is
+SLATE_CACHE = "public, max-age=5, stale-while-revalidate=30"
+PROPS_CACHE = "public, max-age=60, stale-while-revalidate=300"
+REVALIDATE = "no-cache"
+READY_MAX_AGE = float(os.getenv("EDGE_READY_MAX_AGE", "60"))  # seconds without a good odds poll
+
 app = FastAPI(title="Edge Finder Demo")
 
 app.add_middleware(
@@ -11,14 +60,225 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(MetricsMiddleware)
+
+# --- Shared snapshot ---
+slate = SlateStore()
+lines = LineStore()
+lines.record(slate.current())
+slate.subscribe(lines.record)
+PROPS = regrade_props(DEMO_PROPS)
+started_at = time.time()
+
+ingestor = None
+if os.getenv("EDGE_ODDS_FEED"):
+    ingestor = start_feed(slate, os.environ["EDGE_ODDS_FEED"], interval=float(os.getenv("EDGE_ODDS_INTERVAL", "3")))
+
+
+def slate_age():
+    """Seconds since the slate was last confirmed: the last good odds poll, or the last swap without a feed."""
+    if ingestor is None:
+        return time.time() - slate.current().fetched_at
+    return time.time() - (ingestor.stats["last_ok_at"] or started_at)
+
+
+REGISTRY.gauge("edge_slate_age_seconds", "Seconds since the slate was last confirmed current.").set_function(slate_age)
+REGISTRY.gauge("edge_slate_version", "Version of the slate snapshot being served.").set_function(
+    lambda: slate.current().version)
+
+
+# --- Payloads ---
+def _bullets(text):
+    return [s.strip().rstrip(".") for s in str(text).split(". ") if s.strip()]
+
+
+def game_summary(game):
+    return {"id": game_id(game), "sport": game.get("sport"), "away": game["away"], "home": game["home"],
+            "time": game.get("time"), "spread": game.get("spread"), "total": game.get("total"),
+            "ml_away": game.get("ml_away"), "ml_home": game.get("ml_home"), "grade": game.get("edge"),
+            "score": game.get("edge_score"), "flags": game.get("edge_flags", [])}
+
+
+def slate_payload(snap, sport):
+    return {"api": API_VERSION, "sport": sport, "snapshot": {"version": snap.version, "fetched_at": snap.fetched_at},
+            "games": [game_summary(g) for g in snap.games(sport)]}
+
+
+def analysis_payload(game, movement):
+    grade = game.get("edge", "D")
+    return dict(game_summary(game), **{
+        "api": API_VERSION,
+        "line_movement": movement and dict(movement, label=move_label(game, movement)),
+        "why_wrong": _bullets(game.get("why_wrong", "")),
+        "why_right": _bullets(game.get("why_right", "")),
+        "reason": game.get("edge_reason", ""),
+        "gut_data": game.get("gut_data", "neutral"),
+        "bet": grade not in ("D", "F"),
+    })
+
+
+def props_payload(props):
+    return {"api": API_VERSION, "props": [
+        {"player": p["player"], "sport": p.get("sport"), "team": p.get("team"), "prop": p["prop"], "line": p["line"],
+         "grade": p.get("edge"), "score": p.get("edge_score"), "reason": p.get("reason"),
+         "recommendation": p.get("recommendation"), "matchup": p.get("matchup")}
+        for p in props]}
+
+
+# --- Encoded bodies ---
+class Encoded:
+    """One JSON body with its strong ETag and precompressed variants."""
+
+    __slots__ = ("etag", "bodies")
+
+    def __init__(self, payload):
+        raw = _dumps(payload)
+        self.etag = hashlib.sha1(raw).hexdigest()[:20]
+        self.bodies = {"identity": raw}
+        if len(raw) >= MIN_COMPRESS:
+            self.bodies["gzip"] = gzip.compress(raw, compresslevel=6, mtime=0)
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(raw, quality=5)
+
+
+def pick(bodies, accept_encoding):
+    """Best precompressed variant the client accepts: br, then gzip, then identity."""
+    accepted = {t.split(";")[0].strip() for t in accept_encoding.lower().split(",")}
+    for coding in ("br", "gzip"):
+        if coding in bodies and coding in accepted:
+            return coding, bodies[coding]
+    return "identity", bodies["identity"]
+
+
+class BodyCache:
+    """(path, snapshot digest) -> Encoded, LRU-bounded. A slate swap changes the digest, so entries never go stale."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                self._entries.move_to_end(key)
+                return hit
+        enc = Encoded(build())
+        with self._lock:
+            self._entries[key] = enc
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return enc
+
+
+bodies = BodyCache()
+
+
+def _not_modified(request, etag):
+    # If-None-Match uses weak comparison, so any encoding's tag for this body counts.
+    tags = {t.strip().removeprefix("W/").strip('"').split("-")[0] for t in request.headers.get("if-none-match", "").split(",")}
+    return etag in tags or "*" in tags
+
+
+def respond(request, etag, variants, media_type, cache_control):
+    """304 or the negotiated precompressed body, with ETag / Cache-Control / Vary set."""
+    coding, body = pick(variants, request.headers.get("accept-encoding", ""))
+    headers = {"ETag": f'"{etag}"' if coding == "identity" else f'"{etag}-{coding}"',
+               "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def cached_json(request, key, build, cache_control):
+    enc = bodies.get(key, build)
+    return respond(request, enc.etag, enc.bodies, "application/json", cache_control)
+
+
+# --- API ---
+api = APIRouter()
+
+
+def _sport(sport):
+    key = sport.upper()
+    if key not in SPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown sport {sport!r}. Try one of {', '.join(SPORTS)}.")
+    return key
+
+
+@api.get("/slate/{sport}")
+def get_slate(sport: str, request: Request):
+    key, snap = _sport(sport), slate.current()
+    return cached_json(request, ("slate", key, snap.digest), lambda: slate_payload(snap, key), SLATE_CACHE)
+
+
+@api.get("/props")
+def get_props(request: Request):
+    return cached_json(request, ("props",), lambda: props_payload(PROPS), PROPS_CACHE)
+
+
+@api.get("/analysis/{gid}")
+def get_analysis(gid: str, request: Request):
+    snap = slate.current()
+    game = next((g for g in snap.all_games() if game_id(g) == gid), None)
+    if game is None:
+        raise HTTPException(status_code=404, detail=f"No game {gid!r} on the current slate.")
+    movement = lines.summary(gid)
+    return cached_json(request, ("analysis", gid, snap.digest, movement and movement["ticks"]),
+                       lambda: analysis_payload(game, movement), SLATE_CACHE)
+
+
+app.include_router(api, prefix=f"/api/v{API_VERSION}")
+app.include_router(api, prefix="/api", include_in_schema=False)  # unversioned alias for the current version
+
+
+# --- Static assets ---
+def load_assets(dist=STATIC_DIST):
+    """url name -> (etag, variants, media type, cache-control). Every asset revalidates by its content hash."""
+    table = {}
+    for name, info in load_or_build(out=dist)["files"].items():
+        path = os.path.join(dist, name)
+        variants = {}
+        for coding, suffix in [("identity", ""), *((c, ".gz" if c == "gzip" else ".br") for c in info["encodings"])]:
+            with open(path + suffix, "rb") as fh:
+                variants[coding] = fh.read()
+        table[name] = (info["etag"], variants, info["type"], REVALIDATE)
+    return table
+
+
+ASSETS = load_assets()
+
+
+@app.api_route("/static/{name:path}", methods=["GET", "HEAD"])
+def static_asset(name: str, request: Request):
+    asset = ASSETS.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404)
+    return respond(request, *asset)
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
+@app.get("/ready")
+def ready():
+    """503 until / unless the odds feed has confirmed the slate within READY_MAX_AGE. Demo slate is always ready."""
+    age = slate_age()
+    is_ready = ingestor is None or age <= READY_MAX_AGE
+    body = {"status": "ready" if is_ready else "stale", "slate_version": slate.current().version,
+            "slate_age_s": round(age, 1), "max_age_s": READY_MAX_AGE, "feed": ingestor is not None}
+    return Response(content=_dumps(body), status_code=200 if is_ready else 503, media_type="application/json")
+
+@app.get("/metrics")
+def metrics():
+    return Response(content=REGISTRY.render(), media_type=METRICS_TYPE)
+
 @app.get("/")
-async def root():
-    return FileResponse("static/index.html")
+def root(request: Request):
+    return respond(request, *ASSETS["index.html"])
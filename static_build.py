@@ -0,0 +1,110 @@
+"""
+Edge Finder v4 -- Static asset build
+Copies static/ into dist/static/, writes .gz / .br siblings for text assets and records each
+file's content hash (its ETag), encodings and type in manifest.json. The server loads the
+manifest and never compresses at request time.
+
+Names are not fingerprinted: the wizard page is a single self-contained document, so there is
+nothing for it to reference by hash. Browsers revalidate it by ETag and get a 304 until it changes.
+
+    python static_build.py [--src static] [--out dist/static]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+try:
+    import brotli
+except ImportError:  # optional -- gzip only
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(ROOT, "static")
+OUT = os.path.join(ROOT, "dist", "static")
+MANIFEST = "manifest.json"
+FORMAT = 2  # bump when the manifest layout changes, so an old dist/ is rebuilt
+
+TEXT_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS = 512  # bytes; PNG / JPEG / fonts are already compressed and go out as-is
+
+
+def _sources(src):
+    for dirpath, _, files in os.walk(src):
+        for f in sorted(files):
+            path = os.path.join(dirpath, f)
+            yield os.path.relpath(path, src).replace(os.sep, "/"), path
+
+
+def _is_text(name):
+    ctype = mimetypes.guess_type(name)[0] or ""
+    return ctype.startswith(TEXT_TYPES)
+
+
+def build(src=SRC, out=OUT):
+    """Build dist/static from static/. Returns the manifest dict."""
+    manifest = {"format": FORMAT, "files": {}, "source_digest": source_digest(src)}
+    for name, path in _sources(src):
+        with open(path, "rb") as fh:
+            data = fh.read()
+        dest = os.path.join(out, name)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, "wb") as fh:
+            fh.write(data)
+        encodings = []
+        if _is_text(name) and len(data) >= MIN_COMPRESS:
+            variants = {"gzip": (".gz", gzip.compress(data, compresslevel=9, mtime=0))}
+            if brotli is not None:
+                variants["br"] = (".br", brotli.compress(data, quality=11))
+            for coding, (suffix, body) in variants.items():
+                if len(body) < len(data):
+                    with open(dest + suffix, "wb") as fh:
+                        fh.write(body)
+                    encodings.append(coding)
+        manifest["files"][name] = {"etag": hashlib.sha256(data).hexdigest()[:16], "encodings": encodings,
+                                   "size": len(data), "type": mimetypes.guess_type(name)[0] or "application/octet-stream"}
+
+    with open(os.path.join(out, MANIFEST), "w") as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+    return manifest
+
+
+def source_digest(src=SRC):
+    """Hash of every source file's name and bytes -- changes whenever a rebuild is needed."""
+    h = hashlib.sha256()
+    for name, path in _sources(src):
+        h.update(name.encode())
+        with open(path, "rb") as fh:
+            h.update(hashlib.sha256(fh.read()).digest())
+    return h.hexdigest()
+
+
+def load_or_build(src=SRC, out=OUT):
+    """The current manifest, rebuilding first if static/ changed since the last build."""
+    try:
+        with open(os.path.join(out, MANIFEST)) as fh:
+            manifest = json.load(fh)
+        if manifest.get("format") == FORMAT and manifest.get("source_digest") == source_digest(src):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return build(src, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--src", default=SRC)
+    parser.add_argument("--out", default=OUT)
+    args = parser.parse_args()
+    manifest = build(args.src, args.out)
+    for name, info in sorted(manifest["files"].items()):
+        sizes = [f"{info['size']} B"] + [f"{c} {os.path.getsize(os.path.join(args.out, name) + ('.gz' if c == 'gzip' else '.br'))} B"
+                                         for c in info["encodings"]]
+        print(f"{name} [{info['etag']}]  ({', '.join(sizes)})")
+
+
+if __name__ == "__main__":
+    main()
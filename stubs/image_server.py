@@ -0,0 +1,153 @@
+"""
+Local Azure OpenAI image generation stub.
+Answers /openai/deployments/{name}/images/generations (and /v1/images/generations) with a URL
+the stub itself serves, so a generator run exercises the same two hops as DALL-E: generate,
+then download. Generation latency, a server-side rate limit (429 + Retry-After), random 500s
+and image size are all configurable.
+
+    python stubs/image_server.py --port 8012 --rpm 60 --gen-ms 800 --fail-rate 0.05
+    DALLE_ENDPOINT=http://127.0.0.1:8012 DALLE_API_KEY=stub python generate_icons.py
+"""
+
+import argparse
+import json
+import math
+import random
+import struct
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def png(width, height, seed=0):
+    """A valid, mostly incompressible RGB PNG, so downloads are realistically sized."""
+    rng = random.Random(seed)
+    row = width * 3
+    raw = b"".join(b"\x00" + rng.randbytes(row) for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+
+class StubConfig:
+    def __init__(self, gen_ms=800.0, rpm=60.0, fail_rate=0.0, image_px=256, seed=7):
+        self.gen_ms = gen_ms
+        self.rpm = rpm                # generations per minute before 429s (0 = unlimited)
+        self.fail_rate = fail_rate    # share of generations answered with a 500
+        self.image_px = image_px      # served images are image_px x image_px, whatever size was asked for
+        self.requests = 0
+        self.throttled = 0
+        self.failed = 0
+        self.downloads = 0
+        self._rng = random.Random(seed)
+        self._files = {}
+        self._lock = threading.Lock()
+        self._next_slot = 0.0         # earliest time the next generation is allowed
+
+    def admit(self):
+        """Server-side rate limit: None if the request may run, else seconds until it may."""
+        if not self.rpm:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_slot:
+                self.throttled += 1
+                return self._next_slot - now
+            self._next_slot = max(self._next_slot, now) + 60.0 / self.rpm
+            return None
+
+
+def make_handler(cfg):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            if not self.path.split("?")[0].endswith("/images/generations"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            cfg.requests += 1
+            wait = cfg.admit()
+            if wait is not None:
+                self._json(429, {"error": {"code": "429", "message": "Rate limit exceeded"}},
+                           {"Retry-After": str(max(math.ceil(wait), 1)), "retry-after-ms": str(int(wait * 1000))})
+                return
+            time.sleep(cfg.gen_ms / 1000)
+            with cfg._lock:
+                fail = cfg._rng.random() < cfg.fail_rate
+            if fail:
+                cfg.failed += 1
+                self._json(500, {"error": {"code": "InternalServerError", "message": "Stub failure"}})
+                return
+            file_id = uuid.uuid4().hex
+            with cfg._lock:
+                cfg._files[file_id] = png(cfg.image_px, cfg.image_px, seed=int(file_id[:8], 16))
+            host, port = self.server.server_address[:2]
+            self._json(200, {"created": int(time.time()), "data": [{
+                "url": f"http://{host}:{port}/files/{file_id}.png",
+                "revised_prompt": body.get("prompt", ""),
+            }]})
+
+        def do_GET(self):
+            file_id = self.path.split("?")[0].rsplit("/", 1)[-1].removesuffix(".png")
+            with cfg._lock:
+                data = cfg._files.pop(file_id, None)
+            if data is None:
+                self.send_error(404)
+                return
+            cfg.downloads += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            for i in range(0, len(data), 64 * 1024):
+                self.wfile.write(data[i:i + 64 * 1024])
+
+        def _json(self, status, obj, headers=None):
+            payload = json.dumps(obj).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def serve(port=8012, cfg=None, host="127.0.0.1"):
+    """Start the stub on a daemon thread. Returns (server, config); server.shutdown() stops it."""
+    cfg = cfg or StubConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(cfg))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="image-stub", daemon=True).start()
+    return server, cfg
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Azure OpenAI image generation stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--gen-ms", type=float, default=800.0, help="time to 'generate' one image")
+    parser.add_argument("--rpm", type=float, default=60.0, help="generations per minute before 429 (0 = no limit)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of generations that return 500")
+    parser.add_argument("--image-px", type=int, default=256, help="side of the served PNG")
+    args = parser.parse_args()
+    cfg = StubConfig(args.gen_ms, args.rpm, args.fail_rate, args.image_px)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cfg))
+    print(f"Image stub on http://{args.host}:{args.port} ({args.gen_ms} ms/image, {args.rpm} rpm, "
+          f"{args.fail_rate:.0%} failures)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
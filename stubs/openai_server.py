@@ -0,0 +1,131 @@
+"""
+Local OpenAI-compatible chat completions stub.
+Answers both Azure-style (/openai/deployments/{name}/chat/completions) and /v1/chat/completions,
+streaming SSE chunks when "stream": true. Latency is simulated so time-to-first-token and
+total time can be measured without the real service.
+
+    python stubs/openai_server.py --port 8011 --ttft-ms 400 --token-ms 15
+    # .streamlit/secrets.toml: AZURE_OPENAI_ENDPOINT = "http://127.0.0.1:8011", AZURE_OPENAI_KEY = "stub"
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "**QUICK TAKE**\n\nKnicks -5.5 vs Pacers\nEdge: Yes\nGrade: A\n"
+    "Why: Pacers missing Haliburton + Turner and the line hasn't adjusted.\n"
+    "Risk: Full unit, 5% of bankroll max.\n\nEverything else on the slate is a pass. No edge = no bet."
+)
+
+
+def tokenize(text):
+    """Split into word-ish chunks that keep their whitespace, roughly like model tokens."""
+    out, cur = [], ""
+    for ch in text:
+        cur += ch
+        if ch in " \n":
+            out.append(cur)
+            cur = ""
+    if cur:
+        out.append(cur)
+    return out
+
+
+class StubConfig:
+    def __init__(self, ttft_ms=400.0, token_ms=15.0, reply=DEFAULT_REPLY):
+        self.ttft_ms = ttft_ms
+        self.token_ms = token_ms
+        self.reply = reply
+        self.requests = 0
+
+
+def make_handler(cfg):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            if not self.path.split("?")[0].endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            cfg.requests += 1
+            model = body.get("model") or self.path.split("/deployments/")[-1].split("/")[0]
+            tokens = tokenize(cfg.reply)
+            cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            time.sleep(cfg.ttft_ms / 1000)
+            if body.get("stream"):
+                self._stream(cid, model, tokens)
+            else:
+                time.sleep(cfg.token_ms * len(tokens) / 1000)
+                self._json(cid, model, cfg.reply, len(tokens))
+
+        def _json(self, cid, model, text, n_tokens):
+            payload = json.dumps({
+                "id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": n_tokens, "total_tokens": n_tokens},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _stream(self, cid, model, tokens):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            base = {"id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            self._event(dict(base, choices=[{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]))
+            for i, tok in enumerate(tokens):
+                if i:
+                    time.sleep(cfg.token_ms / 1000)
+                self._event(dict(base, choices=[{"index": 0, "delta": {"content": tok}, "finish_reason": None}]))
+            self._event(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+            # [DONE] and the terminating chunk go out in one write, as a real server's final flush would.
+            done = b"data: [DONE]\n\n"
+            self.wfile.write(f"{len(done):x}\r\n".encode() + done + b"\r\n0\r\n\r\n")
+            self.wfile.flush()
+
+        def _event(self, obj):
+            self._chunk(b"data: " + json.dumps(obj).encode() + b"\n\n")
+
+        def _chunk(self, data):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def serve(port=8011, cfg=None, host="127.0.0.1"):
+    """Start the stub on a daemon thread. Returns (server, config); server.shutdown() stops it."""
+    cfg = cfg or StubConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(cfg))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="openai-stub", daemon=True).start()
+    return server, cfg
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible chat completions stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--ttft-ms", type=float, default=400.0, help="delay before the first token")
+    parser.add_argument("--token-ms", type=float, default=15.0, help="delay between tokens")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubConfig(args.ttft_ms, args.token_ms)))
+    print(f"OpenAI stub on http://{args.host}:{args.port} (ttft {args.ttft_ms} ms, {args.token_ms} ms/token)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
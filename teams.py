@@ -0,0 +1,91 @@
+"""
+Edge Finder v4 -- Team codes
+Books quote a spread against the favourite's code ("DEN -2.5"), while games carry nicknames
+("Nuggets" @ "Suns"). These tables map one to the other so a spread can be read as the home
+team's line -- the only form in which an opener and a later line (possibly with the favourite
+flipped) can be subtracted.
+
+    python -m doctest teams.py
+"""
+
+from pricing import parse_line
+
+_NBA = {
+    "Hawks": "ATL", "Celtics": "BOS", "Nets": "BKN BRK", "Hornets": "CHA", "Bulls": "CHI", "Cavaliers": "CLE",
+    "Mavericks": "DAL", "Nuggets": "DEN", "Pistons": "DET", "Warriors": "GSW GS", "Rockets": "HOU",
+    "Pacers": "IND", "Clippers": "LAC", "Lakers": "LAL", "Grizzlies": "MEM", "Heat": "MIA", "Bucks": "MIL",
+    "Timberwolves": "MIN", "Pelicans": "NOP NO", "Knicks": "NYK NY", "Thunder": "OKC", "Magic": "ORL",
+    "76ers": "PHI", "Suns": "PHX PHO", "Trail Blazers": "POR", "Kings": "SAC", "Spurs": "SAS SA",
+    "Raptors": "TOR", "Jazz": "UTA UTAH", "Wizards": "WAS WSH",
+}
+_NHL = {
+    "Ducks": "ANA", "Bruins": "BOS", "Sabres": "BUF", "Flames": "CGY", "Hurricanes": "CAR", "Blackhawks": "CHI",
+    "Avalanche": "COL", "Blue Jackets": "CBJ", "Stars": "DAL", "Red Wings": "DET", "Oilers": "EDM",
+    "Panthers": "FLA", "Kings": "LAK LA", "Wild": "MIN", "Canadiens": "MTL", "Predators": "NSH",
+    "Devils": "NJD NJ", "Islanders": "NYI", "Rangers": "NYR", "Senators": "OTT", "Flyers": "PHI",
+    "Penguins": "PIT", "Sharks": "SJS SJ", "Kraken": "SEA", "Blues": "STL", "Lightning": "TBL TB",
+    "Maple Leafs": "TOR", "Mammoth": "UTA", "Canucks": "VAN", "Golden Knights": "VGK VEG", "Capitals": "WSH",
+    "Jets": "WPG",
+}
+_NFL = {
+    "Cardinals": "ARI", "Falcons": "ATL", "Ravens": "BAL", "Bills": "BUF", "Panthers": "CAR", "Bears": "CHI",
+    "Bengals": "CIN", "Browns": "CLE", "Cowboys": "DAL", "Broncos": "DEN", "Lions": "DET", "Packers": "GB GNB",
+    "Texans": "HOU", "Colts": "IND", "Jaguars": "JAX JAC", "Chiefs": "KC KAN", "Raiders": "LV LVR",
+    "Chargers": "LAC", "Rams": "LAR LA", "Dolphins": "MIA", "Vikings": "MIN", "Patriots": "NE NWE",
+    "Saints": "NO NOR", "Giants": "NYG", "Jets": "NYJ", "Eagles": "PHI", "Steelers": "PIT", "49ers": "SF SFO",
+    "Seahawks": "SEA", "Buccaneers": "TB TAM", "Titans": "TEN", "Commanders": "WAS WSH",
+}
+_CFB = {"Ohio State": "OSU", "Michigan": "MICH", "Michigan State": "MSU", "Penn State": "PSU", "Alabama": "BAMA ALA",
+        "Georgia": "UGA", "Texas": "TEX", "Notre Dame": "ND", "LSU": "LSU", "USC": "USC"}
+
+TEAM_CODES = {sport: {team: tuple(codes.split()) for team, codes in table.items()}
+              for sport, table in (("NBA", _NBA), ("NHL", _NHL), ("NFL", _NFL), ("CFB", _CFB))}
+
+
+def _matches(code, sport, team):
+    codes = TEAM_CODES.get(sport, {}).get(team)
+    if codes is not None:
+        return code in codes
+    # Unlisted teams: the code is the start of the name ("IOWA" / "Iowa State") or the name itself.
+    name = team.upper().replace(" ", "")
+    return name == code or (len(code) >= 3 and name.startswith(code))
+
+
+def spread_side(spread, sport, away, home):
+    """'home' / 'away' for the team a spread string names, None when it names neither (or both)."""
+    parts = str(spread or "").split()
+    if len(parts) < 2:
+        return None
+    code = " ".join(parts[:-1]).upper()
+    is_home, is_away = _matches(code, sport, home), _matches(code, sport, away)
+    if is_home == is_away:
+        return None
+    return "home" if is_home else "away"
+
+
+def home_line(spread, sport, away, home):
+    """
+    A spread string as the home team's line; NaN when the line or the team can't be read.
+
+    >>> home_line("BOS -6.5", "NBA", "Lakers", "Celtics")       # home favourite
+    -6.5
+    >>> home_line("DEN -2.5", "NBA", "Nuggets", "Suns")         # away favourite
+    2.5
+    >>> home_line("DEN -3.5", "NBA", "Nuggets", "Suns") - home_line("DEN -2.5", "NBA", "Nuggets", "Suns")
+    1.0
+    >>> home_line("PHX -1", "NBA", "Nuggets", "Suns") - home_line("DEN -1.5", "NBA", "Nuggets", "Suns")
+    -2.5
+    >>> home_line("BOS -1.5", "NHL", "Rangers", "Bruins"), home_line("MICH -3", "CFB", "Ohio State", "Michigan")
+    (-1.5, -3.0)
+    >>> home_line("XYZ -3", "NBA", "Nuggets", "Suns"), home_line("PK", "NBA", "Nuggets", "Suns")
+    (nan, 0.0)
+    >>> home_line("MSU +7", "CFB", "Michigan State", "Michigan")
+    -7.0
+    """
+    if str(spread or "").upper().split()[-1:] in (["PK"], ["PICK"], ["EVEN"]):
+        return 0.0
+    line = parse_line(spread)
+    side = spread_side(spread, sport, away, home)
+    if side is None or line != line:
+        return float("nan")
+    return line if side == "home" else -line